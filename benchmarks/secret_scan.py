@@ -0,0 +1,84 @@
+"""
+Secret-engine throughput check: SecretDetector.scan() vs the per-signature re.finditer loop.
+
+Builds ~2 MB of source-like text (this repo's own .py files, repeated, with secrets
+sprinkled in) and times both over the built-in signatures and over an extended set of
+EXTRA_SIGNATURES (36 in total). The loop's cost grows with every signature; the detector's
+anchor prefilter should stay well ahead of it at both sizes. It also checks both find the
+same hits.
+
+Usage: python3 benchmarks/secret_scan.py [runs]
+"""
+import glob
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from modules.secret_detector import SECRET_SIGNATURES, SecretDetector
+
+TEXT_CHARS = 2_000_000
+SPEEDUP_TARGET = 1.0  # detector must at least match the loop
+
+# Token formats of common providers (30 more anchored signatures)
+EXTRA_SIGNATURES = {f"Provider {i}": (rf"{prefix}[0-9A-Za-z]{{{length}}}", False) for i, (prefix, length) in enumerate([
+    ("ghp_", 36), ("gho_", 36), ("ghu_", 36), ("ghs_", 36), ("ghr_", 36), ("github_pat_", 60), ("glpat-", 20),
+    ("sk_live_", 24), ("rk_live_", 24), ("pk_live_", 24), ("sk-ant-", 40), ("sk-proj-", 40), ("SG\\.", 22),
+    ("key-", 32), ("sq0atp-", 22), ("sq0csp-", 43), ("npm_", 36), ("pypi-", 50), ("dop_v1_", 64), ("doo_v1_", 64),
+    ("shpat_", 32), ("shpss_", 32), ("EAACEdEose0cBA", 20), ("ya29\\.", 30), ("AGPA", 16), ("AIDA", 16),
+    ("AROA", 16), ("ASIA", 16), ("hf_", 34), ("xapp-", 30),
+])}
+
+def build_text():
+    sources = sorted(glob.glob(os.path.join(REPO_ROOT, "**", "*.py"), recursive=True))
+    source = "".join(open(p, encoding="utf-8", errors="ignore").read() for p in sources)
+    secrets = '\npassword = "hunter2hunter2"\nkey = "AKIA1234567890ABCDEF"\ntoken = "ghp_' + "a" * 36 + '"\n'
+    text = ""
+    while len(text) < TEXT_CHARS:
+        text += source[:50_000] + secrets
+        source = source[50_000:] + source[:50_000]
+    return text[:TEXT_CHARS]
+
+def best_of(runs, fn):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def loop_scan(signatures, text):
+    compiled = [(name, re.compile(pattern, re.IGNORECASE if ignore_case else 0)) for name, (pattern, ignore_case) in signatures.items()]
+    return {(name, m.start(), m.end()) for name, pattern in compiled for m in pattern.finditer(text)}
+
+def main(runs=3):
+    text = build_text()
+    failed = False
+    for label, signatures in (("built-in", SECRET_SIGNATURES), ("extended", {**SECRET_SIGNATURES, **EXTRA_SIGNATURES})):
+        detector = SecretDetector(signatures)
+        loop_time, expected = best_of(runs, lambda: loop_scan(signatures, text))
+        engine_time, matches = best_of(runs, lambda: detector.scan(text))
+        found = {(m.signature, m.start, m.end) for m in matches}
+        speedup = loop_time / engine_time
+        print(f"{label:9s} {len(signatures):2d} signatures, {len(text) / 1e6:.1f}M chars: "
+              f"finditer loop {loop_time:.3f}s, detector {engine_time:.3f}s ({speedup:.1f}x)")
+        if detector.unanchored:
+            print(f"FAIL: no literal anchor for {', '.join(detector.unanchored)}")
+            failed = True
+        if not expected <= found:
+            print(f"FAIL: detector missed {len(expected - found)} hits the loop found")
+            failed = True
+        if speedup < SPEEDUP_TARGET:
+            print("FAIL: detector slower than the per-signature loop")
+            failed = True
+    if failed:
+        return 1
+    print("PASS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3))
@@ -0,0 +1,60 @@
+"""
+Startup-time check for the username-only path (python3 main.py -u <user>).
+
+Spawns fresh interpreters that import main.py, parse `-u octocat`, build the engine and
+load the CodeMiner / ReverseOSINT pillars - everything a username scan does before its
+first network request - and compares the median wall time against STARTUP_TARGET_SECONDS.
+It also fails if any heavy OCR/NLP module was imported along the way.
+
+Usage: python3 benchmarks/startup_time.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_TARGET_SECONDS = 0.5
+HEAVY_MODULES = ["easyocr", "torch", "spacy", "textblob", "exifread", "pillow_heif", "pyfiglet"]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = f"""
+import sys
+import main
+args = main.build_parser().parse_args(["-u", "octocat"])
+engine = main.ShadowScanEngine(args)
+main.load_pillar("code_miner", "CodeMiner")
+main.load_pillar("reverse_osint", "ReverseOSINT")
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+def measure_once():
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return elapsed, [m for m in result.stdout.strip().split(",") if m]
+
+def main(runs=5):
+    timings = []
+    heavy = set()
+    for _ in range(runs):
+        elapsed, loaded = measure_once()
+        timings.append(elapsed)
+        heavy.update(loaded)
+
+    median = statistics.median(timings)
+    print(f"Username-only startup: median {median:.3f}s, best {min(timings):.3f}s over {runs} runs (target < {STARTUP_TARGET_SECONDS:.2f}s)")
+    if heavy:
+        print(f"FAIL: heavy modules imported on the username path: {', '.join(sorted(heavy))}")
+        return 1
+    if median > STARTUP_TARGET_SECONDS:
+        print("FAIL: startup target missed")
+        return 1
+    print("PASS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
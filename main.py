@@ -1,30 +1,60 @@
 import argparse
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
 import sys
-import time
-import pyfiglet
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from rich.console import Console
 from rich.panel import Panel
 from rich.tree import Tree
 from rich.table import Table
 from rich.text import Text
+from rich.progress import Progress
 
 # --- MODULES ---
+# Only the lightweight core is imported up front. Pillar modules (and their heavy
+# dependencies: easyocr/torch, spaCy, exifread, requests) load on first use via
+# load_pillar(), so --help and a plain -u scan never pay for OCR/NLP start-up.
 try:
-    from modules.code_miner import CodeMiner
-    from modules.repo_scanner import RepoScanner
-    from modules.visual_intel import VisualIntel
-    from modules.social_analyzer import SocialPostAnalyzer
-    from modules.reverse_osint import ReverseOSINT
     from modules.risk_assessment import RiskScorer, EthicsPolicy
+    from modules.findings import FindingStore, as_dict
 except ImportError as e:
     print(f"CRITICAL ERROR: Missing module files. {e}")
     sys.exit(1)
 
+def load_pillar(module_name, *names):
+    """Imports `modules.<module_name>` on demand and returns the requested attributes."""
+    try:
+        module = importlib.import_module(f"modules.{module_name}")
+    except ImportError as e:
+        print(f"CRITICAL ERROR: Missing module files. {e}")
+        sys.exit(1)
+    attrs = tuple(getattr(module, name) for name in names)
+    return attrs[0] if len(attrs) == 1 else attrs
+
+def write_ndjson(stream, record):
+    """One JSON object per line, flushed at once so downstream stages see it immediately."""
+    stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    stream.flush()
+
+# Status-line label for each pillar while it runs
+PILLAR_STATUS = {
+    "code": "Code Mining",
+    "repo": "Deep Repo Scan",
+    "social": "Multi-Modal Social Analysis",
+    "visual": "EXIF Extraction",
+    "reverse_osint": "Reverse OSINT",
+}
+
 # Initialize Rich Console
 console = Console()
 
 def get_banner_text():
     """Generates the ASCII Art and Info Panel content."""
+    import pyfiglet
     f = pyfiglet.Figlet(font='doom')
     ascii_art = f.renderText('SHADOW SCAN')
     
@@ -51,8 +81,38 @@ class ShadowScanEngine:
         self.image = args.image
         self.caption = args.caption
         self.repo = args.repo
-        self.token = args.token
-        self.findings = []  # Central storage for all intelligence
+        self.tokens = args.token or []
+        self.archive = args.archive
+        # RepoScanner content-fetch budget (shared by single and batch mode)
+        self.repo_options = {"max_fetches": args.fetch_budget, "fetch_time_budget": args.fetch_time,
+                             "incremental": not args.full_rescan, "max_file_bytes": args.max_file_kb * 1024,
+                             "max_scan_bytes": args.scan_budget_mb * 1024 * 1024}
+        self.user_list = args.user_list
+        self.repo_list = args.repo_list
+        self.workers = args.workers
+        self.output_dir = args.output_dir
+        self.use_daemon = not args.no_daemon
+        self.use_image_cache = not args.no_image_cache
+        self.caption_file = args.caption_file
+        self.image_list = args.image_list
+        self.resume = not args.fresh
+        # OCR preprocessing knobs (working resolution, text-presence gate, near-duplicate radius)
+        self.ocr_options = {"working_resolution": args.ocr_resolution, "text_gate": not args.no_text_gate,
+                            "dedup_distance": args.dedup_distance if args.dedup_distance >= 0 else None}
+        self.ocr_timings = args.ocr_timings
+        # Headless NDJSON output; consent can be pre-signed by flag or environment
+        self.ndjson = args.ndjson
+        self.accept_terms = args.accept_terms or os.environ.get("SHADOWSCAN_ACCEPT_TERMS", "").lower() in ("1", "yes", "true")
+        self.findings = FindingStore()  # Central (columnar) storage for all intelligence
+        HttpClient = load_pillar("http_client", "HttpClient")
+        HttpCache = load_pillar("http_cache", "HttpCache")
+        RateLimitScheduler = load_pillar("rate_limiter", "RateLimitScheduler")
+
+        # Shared HTTP pool for the network pillars (+ on-disk ETag cache unless disabled)
+        self.http_cache = None if args.no_http_cache else HttpCache()
+        # One scheduler paces every API call and rotates across the --token pool
+        self.scheduler = RateLimitScheduler(self.tokens)
+        self.client = HttpClient(cache=self.http_cache, scheduler=self.scheduler)
 
     def display_banner(self):
         """Displays the banner in the main execution flow."""
@@ -64,12 +124,15 @@ class ShadowScanEngine:
                             border_style="bold yellow"))
 
     def run(self):
+        if self.ndjson:
+            return self.run_headless()
+
         # --- PHASE 1: INITIALIZATION ---
         self.display_banner()
         
         # Ethics Check (Pillar 5)
         policy = EthicsPolicy()
-        policy.check_consent()
+        policy.check_consent(presigned=self.accept_terms)
 
         # Initialize the Intelligence Graph (Tree)
         target_label = self.target if self.target else "Unknown Target"
@@ -77,50 +140,34 @@ class ShadowScanEngine:
         
         with console.status("[bold green]Engaging Autonomous Agents...[/bold green]") as status:
             
-            # --- PHASE 2: EXECUTION (The 5 Pillars) ---
-            
-            # PILLAR 1 & 3: CODE MINING
-            if self.target:
-                status.update(f"[bold yellow]Scanning Code Repositories for {self.target}...[/bold yellow]")
-                miner = CodeMiner(self.target)
-                code_data = miner.scan()
-                self._update_graph(root, "Code Intelligence", code_data)
-                time.sleep(0.5) 
-
-            # PILLAR 1 (Deep Scan): REPO ANALYSIS
-            if self.repo:
-                status.update(f"[bold yellow]Deep Scanning Repository: {self.repo}...[/bold yellow]")
-                scanner = RepoScanner(self.repo, github_token=self.token) 
-                repo_data = scanner.scan_repo()
-                self._update_graph(root, "Deep Repo Analysis", repo_data)
-
-            # PILLAR 2 & 1: VISUAL & SOCIAL FUSION
-            if self.image or self.caption:
-                status.update(f"[bold yellow]Running Multi-Modal Social Analysis...[/bold yellow]")
-                analyzer = SocialPostAnalyzer()
-                social_data = analyzer.analyze_post(self.image, self.caption)
-                
-                # If image exists, add EXIF data to social findings
-                if self.image:
-                    status.update(f"[bold yellow]Extracting Visual Metadata (EXIF)...[/bold yellow]")
-                    visual = VisualIntel(self.image)
-                    meta_data = visual.extract_metadata()
-                    social_data.extend(meta_data)
-
-                self._update_graph(root, "Visual & Social Intel", social_data)
-
-            # PILLAR 4: REVERSE OSINT
-            if self.target:
-                status.update(f"[bold yellow]Checking for Surveillance (Reverse OSINT)...[/bold yellow]")
-                rev = ReverseOSINT(self.target)
-                # Combine distinct checks
-                rev_data = rev.check_breach_exposure() + rev.generate_honeytoken()
-                # If your ReverseOSINT class has detect_trackers, add it here too
-                try: 
-                    rev_data += rev.detect_trackers() 
-                except: pass
-                
-                self._update_graph(root, "Reverse OSINT & Counter-Intel", rev_data)
+            # --- PHASE 2: EXECUTION (The 5 Pillars, concurrently) ---
+            running = {}
+            status_lock = threading.Lock()
+            code_seen = [0]
+
+            def show(pillar, text):
+                with status_lock:
+                    if text:
+                        running[pillar] = text
+                    else:
+                        running.pop(pillar, None)
+                    label = " | ".join(running.values()) if running else "Correlating intelligence..."
+                    status.update(f"[bold yellow]{label}[/bold yellow]")
+
+            # Code findings stream in page by page; keep the operator posted while later pages download
+            def on_finding(pillar, finding):
+                if pillar == "code":
+                    with status_lock:
+                        code_seen[0] += 1
+                    show("code", f"Code Mining ({code_seen[0]} findings)")
+
+            results, ocr_report = self._run_pillars(on_finding=on_finding, on_status=show)
+
+        # Merge in fixed pillar order, whatever order they finished in
+        for title, data in results:
+            self._update_graph(root, title, data)
+        if self.ocr_timings and ocr_report:
+            console.print(f"[dim]{ocr_report}[/dim]")
 
         # --- PHASE 3: REPORTING & RISK SCORE ---
         console.print("\n")
@@ -131,6 +178,334 @@ class ShadowScanEngine:
         score, severity = scorer.calculate_score(self.findings)
         
         self._display_risk_panel(score, severity)
+        self._display_cache_stats(self.client)
+
+    def run_batch(self):
+        """Batch Mode: scans every target from the list files with one banner, one consent and one worker pool."""
+        self._consent()
+
+        BatchScanner, load_targets = load_pillar("batch_scanner", "BatchScanner", "load_targets")
+        usernames = load_targets(self.user_list) if self.user_list else []
+        repos = load_targets(self.repo_list) if self.repo_list else []
+        batch = BatchScanner(usernames, repos, workers=self.workers or 4, output_dir=self.output_dir, archive=self.archive,
+                             repo_options=self.repo_options, http_cache=self.http_cache, scheduler=self.scheduler)
+
+        if self.ndjson:
+            with self._headless_stdout() as out:
+                batch.run(on_result=lambda r: self._write_record(out, r, kind=r["kind"], target=r["target"]))
+            return
+
+        table = Table(title="Batch Scan Results", border_style="blue")
+        table.add_column("Type", justify="center")
+        table.add_column("Target")
+        table.add_column("Score", justify="center")
+        table.add_column("Severity", justify="center")
+        table.add_column("Findings", justify="center")
+
+        with Progress(console=console) as progress:
+            task = progress.add_task(f"[bold green]Scanning {len(batch.jobs())} targets ({batch.workers} workers)...[/bold green]", total=len(batch.jobs()))
+            results = batch.run(on_result=lambda r: progress.advance(task))
+
+        for r in sorted(results, key=lambda r: r["score"], reverse=True):
+            table.add_row(r["kind"], r["target"], str(r["score"]), r["severity"], str(len(r["findings"])))
+
+        console.print(table)
+        console.print(f"[green]Per-target results written to: {self.output_dir}/[/green]")
+        self._display_cache_stats(batch.client)
+
+    def run_bulk(self):
+        """Bulk Social Mode: analyzes a captions file and/or image list with batched OCR/NLP."""
+        self._consent()
+
+        load_posts = load_pillar("batch_scanner", "load_posts")
+        posts = load_posts(self.caption_file, self.image_list)
+        analyzer = self._social_analyzer()
+        scorer = RiskScorer()
+        chunk_size = 256  # Posts per analyze_posts() call (bounds memory, drives the progress bar)
+
+        if self.ndjson:
+            with self._headless_stdout() as out:
+                for start in range(0, len(posts), chunk_size):
+                    chunk = posts[start:start + chunk_size]
+                    for offset, findings in enumerate(analyzer.analyze_posts(chunk)):
+                        image, caption = chunk[offset]
+                        score, severity, counts, _ = scorer.score_findings(findings)
+                        self._write_record(out, {"score": score, "severity": severity, "risk_counts": counts, "findings": findings},
+                                           post=start + offset + 1, image=image, caption=caption)
+            return
+
+        results = []
+        with Progress(console=console) as progress:
+            task = progress.add_task(f"[bold green]Analyzing {len(posts)} posts...[/bold green]", total=len(posts))
+            for start in range(0, len(posts), chunk_size):
+                chunk = posts[start:start + chunk_size]
+                for offset, findings in enumerate(analyzer.analyze_posts(chunk)):
+                    image, caption = chunk[offset]
+                    score, severity, _, _ = scorer.score_findings(findings)
+                    results.append({"post": start + offset + 1, "image": image, "caption": caption,
+                                    "score": score, "severity": severity, "findings": findings})
+                progress.advance(task, len(chunk))
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        out_path = os.path.join(self.output_dir, "bulk_posts.json")
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+        table = Table(title="Bulk Social Analysis (Top 20 by Risk)", border_style="blue")
+        table.add_column("#", justify="center")
+        table.add_column("Post")
+        table.add_column("Score", justify="center")
+        table.add_column("Severity", justify="center")
+        for r in sorted(results, key=lambda r: r["score"], reverse=True)[:20]:
+            label = r["caption"] or r["image"] or ""
+            table.add_row(str(r["post"]), label[:60], str(r["score"]), r["severity"])
+
+        console.print(table)
+        console.print(f"[green]Per-post findings written to: {out_path}[/green]")
+        self._display_ocr_timings(analyzer)
+
+    def run_folder(self):
+        """Folder Mode: EXIF + OCR over a whole folder/glob of images on a process pool (resumable)."""
+        self._consent()
+
+        FolderScanner = load_pillar("folder_scanner", "FolderScanner")
+        scanner = FolderScanner(self.image, workers=self.workers, output_dir=self.output_dir,
+                                use_cache=self.use_image_cache, resume=self.resume, ocr_options=self.ocr_options)
+        if self.ndjson:
+            with self._headless_stdout() as out:
+                # Images finished by an interrupted earlier run first, so the stream is complete
+                for record in scanner.results():
+                    self._write_record(out, record, image=record["image"])
+                scanner.run(on_result=lambda r: self._write_record(out, r, image=r["image"]))
+            return
+
+        pending = scanner.pending()
+        done = len(scanner.images) - len(pending)
+        if done:
+            console.print(f"[yellow][*] Resuming: {done}/{len(scanner.images)} images already scanned.[/yellow]")
+
+        try:
+            with Progress(console=console) as progress:
+                task = progress.add_task(f"[bold green]Scanning {len(scanner.images)} images ({scanner.workers} processes)...[/bold green]",
+                                         total=len(scanner.images), completed=done)
+                results = scanner.run(on_result=lambda r: progress.advance(task))
+        except KeyboardInterrupt:
+            console.print(f"\n[red][!] Interrupted. {len(scanner.completed)}/{len(scanner.images)} images saved - re-run the same command to resume.[/red]")
+            return
+
+        table = Table(title="Image Folder Scan (Top 20 by Risk)", border_style="blue")
+        table.add_column("Image")
+        table.add_column("Score", justify="center")
+        table.add_column("Severity", justify="center")
+        table.add_column("Findings", justify="center")
+        for r in sorted(results, key=lambda r: r["score"], reverse=True)[:20]:
+            table.add_row(r["image"][-60:], str(r["score"]), r["severity"], str(len(r["findings"])))
+
+        console.print(table)
+        if scanner.failed:
+            console.print(f"[yellow][!] {len(scanner.failed)} image(s) failed to scan (e.g. {scanner.failed[0]['findings'][0]['data']}). Re-run to retry them.[/yellow]")
+        console.print(f"[green]Per-image findings written to: {scanner.journal_path}[/green]")
+
+    def run_headless(self):
+        """
+        Headless Mode (--ndjson): no banner, no prompt, no Rich output. Each finding is
+        written to stdout as one JSON line the moment its pillar produces it, then one
+        summary line. The score is kept incrementally, so nothing accumulates in memory.
+        """
+        self._consent()
+        tally = RiskScorer().tally()
+
+        with self._headless_stdout() as out:
+            write_lock = threading.Lock()
+
+            def emit(pillar, finding):
+                with write_lock:
+                    tally.add(finding)
+                    write_ndjson(out, {"event": "finding", "pillar": pillar, **as_dict(finding)})
+
+            # Code/Repo findings stream as they're found; everything else (including the
+            # Error finding of a pillar that crashed) is emitted when the pillar finishes
+            def on_complete(pillar, findings, streamed):
+                if not streamed:
+                    for finding in findings:
+                        emit(pillar, finding)
+
+            _, ocr_report = self._run_pillars(on_finding=emit, on_complete=on_complete, collect=False)
+            if self.ocr_timings and ocr_report:
+                print(ocr_report, file=sys.stderr)
+
+            # PILLAR 5: RISK ASSESSMENT
+            score, severity, counts, _ = tally.result()
+            write_ndjson(out, {"event": "summary", "target": self.target, "repo": self.repo, "image": self.image,
+                               "score": score, "severity": severity, "risk_counts": counts, "findings": tally.count})
+
+    def _run_pillars(self, on_finding=None, on_complete=None, on_status=None, collect=True):
+        """
+        Runs every requested pillar at once: the network pillars (CodeMiner, RepoScanner,
+        ReverseOSINT) and EXIF on threads, OCR/NLP in a worker process (or on the warm
+        daemon). Wall time is the slowest pillar, not the sum.
+        Callbacks: on_finding(pillar, finding) as Code/Repo findings stream in,
+        on_complete(pillar, findings, streamed) as each pillar ends (`streamed`: every finding
+        already went through on_finding), on_status(pillar, text or None).
+        Returns ([(branch title, findings)] in fixed report order, OCR stage report or None).
+        With collect=False, Code findings are only streamed, not kept.
+        """
+        on_finding = on_finding or (lambda pillar, finding: None)
+        on_status = on_status or (lambda pillar, text: None)
+        jobs = {}  # future -> pillar
+        processes = None
+        results = {}
+        ocr_report = None
+
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            try:
+                if self.target:
+                    jobs[threads.submit(self._pillar_code, on_finding, collect)] = "code"
+                if self.repo:
+                    jobs[threads.submit(self._pillar_repo, on_finding)] = "repo"
+                if self.image or self.caption:
+                    daemon = self._warm_daemon()
+                    if daemon:
+                        jobs[threads.submit(daemon.analyze_post, self.image, self.caption)] = "social"
+                    else:
+                        analyze_post_job = load_pillar("social_analyzer", "analyze_post_job")
+                        # Spawn, not fork: the pillar threads already running may hold locks (stdout,
+                        # urllib3, SQLite) that a forked child would inherit mid-operation
+                        processes = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+                        jobs[processes.submit(analyze_post_job, self.image, self.caption,
+                                              self.use_image_cache, self.ocr_options)] = "social"
+                    if self.image:
+                        jobs[threads.submit(self._pillar_visual)] = "visual"
+                if self.target:
+                    jobs[threads.submit(self._pillar_reverse)] = "reverse_osint"
+
+                for pillar in jobs.values():
+                    on_status(pillar, PILLAR_STATUS[pillar])
+
+                for future in as_completed(jobs):
+                    pillar = jobs[future]
+                    streamed = pillar in ("code", "repo")
+                    try:
+                        findings = future.result()
+                    except Exception as e:
+                        findings = [{"type": "Error", "data": f"{PILLAR_STATUS[pillar]} failed: {e}", "risk_level": "Low"}]
+                        streamed = False
+                    if isinstance(findings, tuple):  # analyze_post_job: (findings, OCR report)
+                        findings, ocr_report = findings
+                    results[pillar] = findings
+                    on_status(pillar, None)
+                    if on_complete:
+                        on_complete(pillar, findings, streamed)
+            finally:
+                if processes:
+                    processes.shutdown(cancel_futures=True)
+
+        merged = [
+            ("Code Intelligence", results.get("code", [])),
+            ("Deep Repo Analysis", results.get("repo", [])),
+            ("Visual & Social Intel", results.get("social", []) + results.get("visual", [])),
+            ("Reverse OSINT & Counter-Intel", results.get("reverse_osint", [])),
+        ]
+        return merged, ocr_report
+
+    def _pillar_code(self, on_finding, collect=True):
+        """PILLAR 1 & 3: CODE MINING (findings stream page by page)."""
+        CodeMiner = load_pillar("code_miner", "CodeMiner")
+        findings = []
+        for finding in CodeMiner(self.target, client=self.client).iter_findings():
+            on_finding("code", finding)
+            if collect:
+                findings.append(finding)
+        return findings
+
+    def _pillar_repo(self, on_finding):
+        """PILLAR 1 (Deep Scan): REPO ANALYSIS (findings stream as each file is scanned)."""
+        RepoScanner = load_pillar("repo_scanner", "RepoScanner")
+        scanner = RepoScanner(self.repo, client=self.client, **self.repo_options)
+        on_repo_finding = lambda finding: on_finding("repo", finding)
+        if scanner.local_path:
+            return scanner.scan_local(on_finding=on_repo_finding)
+        if self.archive:
+            return scanner.scan_archive(on_finding=on_repo_finding)
+        return scanner.scan_repo(on_finding=on_repo_finding)
+
+    def _pillar_visual(self):
+        """PILLAR 2: VISUAL METADATA (EXIF)."""
+        VisualIntel = load_pillar("visual_intel", "VisualIntel")
+        return VisualIntel(self.image, use_cache=self.use_image_cache).extract_metadata()
+
+    def _pillar_reverse(self):
+        """PILLAR 4: REVERSE OSINT."""
+        ReverseOSINT = load_pillar("reverse_osint", "ReverseOSINT")
+        rev = ReverseOSINT(self.target)
+        # Combine distinct checks
+        rev_data = rev.check_breach_exposure() + rev.generate_honeytoken()
+        try:
+            rev_data += rev.detect_trackers()
+        except: pass
+        return rev_data
+
+    def _warm_daemon(self):
+        """DaemonClient if a warm analyzer daemon is running (and allowed), else None."""
+        if not self.use_daemon or self.ocr_timings:
+            return None
+        DaemonClient = load_pillar("analyzer_daemon", "DaemonClient")
+        client = DaemonClient(use_cache=self.use_image_cache, ocr_options=self.ocr_options)
+        if client.is_running():
+            print("[*] Using warm analyzer daemon (models already loaded).")
+            return client
+        return None
+
+    def _consent(self):
+        """Banner + consent prompt, or in headless mode the pre-signed agreement only."""
+        if self.ndjson:
+            if not self.accept_terms:
+                print("[!] Headless mode cannot prompt for consent. Pass --accept-terms or set SHADOWSCAN_ACCEPT_TERMS=1.", file=sys.stderr)
+                sys.exit(2)
+        else:
+            self.display_banner()
+
+        policy = EthicsPolicy()
+        policy.check_consent(presigned=self.accept_terms)
+
+    @contextlib.contextmanager
+    def _headless_stdout(self):
+        """
+        Yields the real stdout for NDJSON while every other print ([DEBUG], [*] ...) goes to
+        stderr. A closed pipe (e.g. `| head`) ends the run quietly.
+        """
+        out = sys.stdout
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                yield out
+        except BrokenPipeError:
+            # Point stdout at devnull so the interpreter's final flush doesn't raise again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+            sys.exit(1)
+
+    def _write_record(self, out, result, **context):
+        """NDJSON for one scored record (batch target, post, image): its findings, then its summary."""
+        for finding in result["findings"]:
+            write_ndjson(out, {"event": "finding", **context, **as_dict(finding)})
+        write_ndjson(out, {"event": "summary", **context, "score": result["score"], "severity": result["severity"],
+                           "risk_counts": result["risk_counts"], "findings": len(result["findings"])})
+
+    def _social_analyzer(self):
+        """Warm daemon if one is running, otherwise OCR/NLP in-process (always in-process with --ocr-timings)."""
+        get_social_analyzer = load_pillar("analyzer_daemon", "get_social_analyzer")
+        return get_social_analyzer(use_daemon=self.use_daemon and not self.ocr_timings,
+                                   use_cache=self.use_image_cache, ocr_options=self.ocr_options)
+
+    def _display_ocr_timings(self, analyzer):
+        """Prints per-stage OCR preprocessing timings (--ocr-timings)."""
+        if self.ocr_timings and hasattr(analyzer, "ocr_report"):
+            console.print(f"[dim]{analyzer.ocr_report()}[/dim]")
+
+    def _display_cache_stats(self, client):
+        """Prints the HTTP cache hit/miss counters (304 revalidations don't cost API quota)."""
+        stats = client.cache_stats()
+        if stats and (stats["hits"] or stats["misses"]):
+            console.print(f"[dim]HTTP Cache: {stats['hits']} hits (304 revalidated) / {stats['misses']} misses[/dim]")
 
     def _update_graph(self, root_tree, branch_name, data_list):
         """Adds a branch to the tree with color-coded risk levels."""
@@ -182,6 +557,7 @@ class RichHelpFormatter(argparse.RawTextHelpFormatter):
 
 def print_guide():
     """Prints a detailed 'How-To' guide for the user."""
+    import pyfiglet
     f = pyfiglet.Figlet(font='doom')
     console.print(f.renderText('SHADOW SCAN'), style="bold magenta")
     
@@ -198,6 +574,8 @@ This tool aggregates 5 Pillars of OSINT into a single Offensive scan.
    [green]Command:[/green] python3 main.py -r <github_link>
    [dim]Example: python3 main.py -r https://github.com/facebook/react[/dim]
    [i]Scans specific repo files for leaked API keys, passwords, and bad dependencies.[/i]
+   [i]Add [bold]--archive[/bold] to stream the whole repo from a single tarball download (no file cap).[/i]
+   [i]Pass a local checkout path instead of a link to scan it from disk (honors .gitignore).[/i]
 
 [bold yellow]3. VISUAL GEOLOCATION SCAN [/bold yellow]
    [green]Command:[/green] python3 main.py -i <path_to_image>
@@ -211,22 +589,74 @@ This tool aggregates 5 Pillars of OSINT into a single Offensive scan.
 
 [bold yellow]5. FULL OFFENSIVE MODE (All Pillars)[/bold yellow]
    [green]Command:[/green] python3 main.py -u <user> -r <repo> -i <image> -c <caption>
+   [i]Tip: start [bold]python3 main.py --daemon[/bold] in another terminal to keep OCR/NLP models loaded between runs.[/i]
+
+[bold yellow]6. BATCH MODE (Many Targets)[/bold yellow]
+   [green]Command:[/green] python3 main.py --user-list <file> --repo-list <file> -w <workers>
+   [dim]Example: python3 main.py --user-list assets/test_user.txt --repo-list assets/test_repo.txt -w 8[/dim]
+   [i]Scans every target concurrently and writes one JSON report per target to the output directory.[/i]
+
+[bold yellow]7. BULK SOCIAL MODE (Thousands of Posts)[/bold yellow]
+   [green]Command:[/green] python3 main.py --caption-file <file> --image-list <file>
+   [dim]Example: python3 main.py --caption-file assets/test_caption.txt[/dim]
+   [i]Batches OCR, sentiment and NLP across all posts and writes per-post findings as JSON.[/i]
+
+[bold yellow]8. IMAGE FOLDER MODE (Evidence Dumps)[/bold yellow]
+   [green]Command:[/green] python3 main.py -i <folder or "glob">
+   [dim]Example: python3 main.py -i "evidence/**/*.jpg" -w 8[/dim]
+   [i]Runs EXIF + OCR on every image across all CPU cores. Interrupted? Re-run the same command to resume.[/i]
+
+[bold yellow]9. HEADLESS / PIPELINE MODE (NDJSON)[/bold yellow]
+   [green]Command:[/green] python3 main.py -u <user> --ndjson --accept-terms
+   [dim]Example: SHADOWSCAN_ACCEPT_TERMS=1 python3 main.py -r <github_link> --ndjson | jq .[/dim]
+   [i]No banner or prompt; each finding is one JSON line on stdout as soon as it's found, then a summary line.[/i]
     """
     console.print(Panel(guide, title="[bold magenta]Operational Manual[/bold magenta]", border_style="blue"))
 
-# --- ENTRY POINT ---
-if __name__ == "__main__":
+# --- CLI ---
+def build_parser():
+    """Builds the argument parser (also used by benchmarks/startup_time.py)."""
     parser = argparse.ArgumentParser(
         description="SHADOW SCAN: Offensive Multi-Model OSINT Framework",
         formatter_class=RichHelpFormatter
     )
     
     parser.add_argument("-u", "--username", help="Target Username (e.g., github_user)")
-    parser.add_argument("-r", "--repo", help="GitHub Repository URL for deep scanning")
-    parser.add_argument("--token", help="GitHub API Token (Optional)")
-    parser.add_argument("-i", "--image", help="Path to local image file")
+    parser.add_argument("-r", "--repo", help="GitHub Repository URL, or path to a local checkout, for deep scanning")
+    parser.add_argument("--token", action="append", help="GitHub API Token (Optional, repeat to rotate across a pool of tokens)")
+    parser.add_argument("--archive", action="store_true", help="Deep-scan repos from one tarball download instead of per-file fetches")
+    parser.add_argument("--fetch-budget", type=int, default=50, help="Max raw file fetches per repo, highest-risk files first (0 = unlimited)")
+    parser.add_argument("--fetch-time", type=float, default=None, help="Stop fetching repo file contents after this many seconds")
+    parser.add_argument("--max-file-kb", type=int, default=1024, help="Stop reading a repo file after this many KB (0 = read whole files)")
+    parser.add_argument("--scan-budget-mb", type=int, default=256, help="Max MB of repo content streamed per scan (0 = unlimited)")
+    parser.add_argument("--full-rescan", action="store_true", help="Re-fetch every repo file instead of reusing results for unchanged trees/blobs from the last scan")
+    parser.add_argument("--compact-cache", action="store_true", help="Drop blob-index entries from older detector versions and reclaim disk space, then exit")
+    parser.add_argument("--no-http-cache", action="store_true", help="Disable the on-disk GitHub API response cache")
+    parser.add_argument("-i", "--image", help="Path to local image file, or a folder / glob pattern of images (Folder Mode)")
     parser.add_argument("-c", "--caption", help="Social media caption text")
+    parser.add_argument("--caption-file", help="File with one caption per line (Bulk Social Mode)")
+    parser.add_argument("--image-list", help="File with one image path per line (Bulk Social Mode, paired with --caption-file by line)")
+    parser.add_argument("--fresh", action="store_true", help="Folder Mode: ignore an interrupted scan's saved progress and start over")
+    parser.add_argument("--no-image-cache", action="store_true", help="Bypass the OCR/EXIF result cache (always re-analyze images)")
+    parser.add_argument("--ocr-resolution", type=int, default=1024, help="Downscale images so the short side is this many pixels before OCR (0 = full resolution)")
+    parser.add_argument("--no-text-gate", action="store_true", help="OCR every image, even ones the quick text-presence check says have no text")
+    parser.add_argument("--dedup-distance", type=int, default=12, help="OCR near-duplicate images (re-posts, recompressions) once if their perceptual hashes differ by at most this many bits and their block signatures agree (-1 = off)")
+    parser.add_argument("--ocr-timings", action="store_true", help="Print per-stage OCR timings (runs in-process; combine with --no-image-cache to time every image)")
+    parser.add_argument("--ndjson", action="store_true", help="Headless mode: stream every finding to stdout as one JSON line (no banner, no prompt)")
+    parser.add_argument("--accept-terms", action="store_true", help="Pre-sign the authorization/ethics agreement (or set SHADOWSCAN_ACCEPT_TERMS=1); required with --ndjson")
     parser.add_argument("-g", "--guide", action="store_true", help="Show the detailed user manual")
+    parser.add_argument("--daemon", action="store_true", help="Run the warm OCR/NLP analyzer daemon (keeps models loaded between runs)")
+    parser.add_argument("--stop-daemon", action="store_true", help="Stop a running analyzer daemon")
+    parser.add_argument("--no-daemon", action="store_true", help="Always analyze in-process, even if a daemon is running")
+    parser.add_argument("--user-list", help="File with one username per line (Batch Mode)")
+    parser.add_argument("--repo-list", help="File with one GitHub repository URL per line (Batch Mode)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Concurrent workers (Batch Mode default: 4, Folder Mode default: CPU cores)")
+    parser.add_argument("-o", "--output-dir", default="shadowscan_results", help="Directory for per-target Batch Mode results")
+    return parser
+
+# --- ENTRY POINT ---
+if __name__ == "__main__":
+    parser = build_parser()
 
     if len(sys.argv) == 1:
         parser.print_help()
@@ -238,10 +668,47 @@ if __name__ == "__main__":
         print_guide()
         sys.exit(0)
 
+    if args.compact_cache:
+        BlobIndex = load_pillar("blob_index", "BlobIndex")
+        default_detector = load_pillar("secret_detector", "default_detector")
+        index = BlobIndex(default_detector.version)
+        before = index.store.total_bytes
+        index.compact()
+        console.print(f"[green]Blob index compacted: {len(index.store)} entries, {before // 1024} KB -> {index.store.total_bytes // 1024} KB[/green]")
+        sys.exit(0)
+
+    if args.daemon or args.stop_daemon:
+        AnalyzerDaemon, DaemonClient = load_pillar("analyzer_daemon", "AnalyzerDaemon", "DaemonClient")
+        try:
+            if args.stop_daemon:
+                DaemonClient().shutdown()
+                console.print("[green]Analyzer daemon stopped.[/green]")
+            else:
+                AnalyzerDaemon().serve_forever()
+        except KeyboardInterrupt:
+            console.print("\n[red][!] Analyzer daemon stopped by user.[/red]")
+        except ConnectionError as e:
+            console.print(f"[yellow]{e}[/yellow]")
+        sys.exit(0)
+
     try:
         engine = ShadowScanEngine(args)
-        engine.run()
+        if args.user_list or args.repo_list:
+            engine.run_batch()
+        elif args.caption_file or args.image_list:
+            engine.run_bulk()
+        elif args.image and load_pillar("folder_scanner", "is_image_collection")(args.image):
+            engine.run_folder()
+        else:
+            engine.run()
     except KeyboardInterrupt:
+        if args.ndjson:
+            print("[!] Operation aborted by user.", file=sys.stderr)
+            sys.exit(130)
         console.print("\n[red][!] Operation aborted by user.[/red]")
     except Exception as e:
+        if args.ndjson:
+            # Keep stdout pure NDJSON for the next pipeline stage
+            print(f"[!] Critical System Error: {e}", file=sys.stderr)
+            sys.exit(1)
         console.print(f"\n[bold red][!] Critical System Error: {e}[/bold red]")
\ No newline at end of file
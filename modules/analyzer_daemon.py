@@ -0,0 +1,173 @@
+import os
+import secrets
+import threading
+from multiprocessing.connection import Listener, Client
+from modules.cache_store import default_cache_dir
+
+DAEMON_ADDRESS = ("127.0.0.1", 47615)
+
+def _key_path():
+    return os.path.join(default_cache_dir(), "analyzer_daemon.key")
+
+def _read_key():
+    try:
+        with open(_key_path(), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+class AnalyzerDaemon:
+    """
+    Warm Analyzer Daemon
+    Long-running local worker that keeps the OCR reader and spaCy pipeline resident, so
+    CLI runs and batch jobs skip the multi-second model load. Jobs arrive over an
+    authenticated localhost socket (the key lives in the user's cache dir, mode 0600).
+    """
+    def __init__(self, address=DAEMON_ADDRESS):
+        self.address = address
+        self.authkey = secrets.token_bytes(32)
+        self._analyzer = None
+        self._ocr_options = {}
+        self._lock = threading.Lock()  # OCR/NLP models are not re-entrant
+        self._running = True
+
+    def serve_forever(self):
+        from modules.social_analyzer import SocialPostAnalyzer, get_nlp
+
+        # Load everything up front - this is the cost the daemon exists to pay once
+        self._analyzer = SocialPostAnalyzer()
+        get_nlp()
+
+        listener = Listener(self.address, authkey=self.authkey)
+        key_path = _key_path()
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.authkey)
+
+        print(f"[*] Analyzer daemon ready on {self.address[0]}:{self.address[1]} (Ctrl+C to stop)")
+        try:
+            while self._running:
+                try:
+                    conn = listener.accept()
+                except Exception:
+                    continue # Failed handshake (wrong key) - keep serving
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+            if os.path.exists(key_path):
+                os.remove(key_path)
+
+    def _apply_options(self, request):
+        """Per-client settings: image cache on/off and OCR preprocessing (caller holds the lock)."""
+        self._analyzer.use_cache = request.get("use_cache", True)
+        ocr_options = request.get("ocr_options") or {}
+        if ocr_options != self._ocr_options:
+            self._analyzer.configure_ocr(**ocr_options)
+            self._ocr_options = ocr_options
+
+    def _handle(self, conn):
+        """Serves one client connection: one request dict in, one response dict out."""
+        try:
+            request = conn.recv()
+            op = request.get("op")
+
+            if op == "ping":
+                conn.send({"ok": True})
+            elif op == "analyze_post":
+                with self._lock:
+                    self._apply_options(request)
+                    findings = self._analyzer.analyze_post(request.get("image"), request.get("caption"))
+                conn.send({"ok": True, "findings": findings})
+            elif op == "analyze_posts":
+                with self._lock:
+                    self._apply_options(request)
+                    results = self._analyzer.analyze_posts(request.get("posts", []))
+                conn.send({"ok": True, "results": results})
+            elif op == "shutdown":
+                self._running = False
+                conn.send({"ok": True})
+                # Unblock accept() so the serve loop notices the flag
+                try:
+                    Client(self.address, authkey=self.authkey).close()
+                except Exception:
+                    pass
+            else:
+                conn.send({"ok": False, "error": f"Unknown op: {op}"})
+        except Exception as e:
+            try:
+                conn.send({"ok": False, "error": str(e)})
+            except Exception:
+                pass
+        finally:
+            conn.close()
+
+class DaemonClient:
+    """Thin client for AnalyzerDaemon. Raises ConnectionError when no daemon is reachable."""
+    def __init__(self, address=DAEMON_ADDRESS, use_cache=True, ocr_options=None):
+        self.address = address
+        self.use_cache = use_cache
+        self.ocr_options = ocr_options or {}
+
+    def _call(self, request):
+        authkey = _read_key()
+        if authkey is None:
+            raise ConnectionError("Analyzer daemon is not running.")
+        try:
+            conn = Client(self.address, authkey=authkey)
+        except (OSError, EOFError) as e:
+            raise ConnectionError(f"Analyzer daemon unreachable: {e}")
+        try:
+            conn.send(request)
+            response = conn.recv()
+        except (OSError, EOFError) as e:
+            raise ConnectionError(f"Analyzer daemon dropped the connection: {e}")
+        finally:
+            conn.close()
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "Analyzer daemon error"))
+        return response
+
+    def is_running(self):
+        try:
+            self._call({"op": "ping"})
+            return True
+        except (ConnectionError, RuntimeError):
+            return False
+
+    def analyze_post(self, image_path, caption_text):
+        # The daemon may run from another working directory
+        image = os.path.abspath(image_path) if image_path else None
+        try:
+            return self._call({"op": "analyze_post", "image": image, "caption": caption_text,
+                               "use_cache": self.use_cache, "ocr_options": self.ocr_options})["findings"]
+        except ConnectionError:
+            print("[!] Analyzer daemon went away. Falling back to in-process analysis.")
+            from modules.social_analyzer import SocialPostAnalyzer
+            return SocialPostAnalyzer(use_cache=self.use_cache, ocr_options=self.ocr_options).analyze_post(image_path, caption_text)
+
+    def analyze_posts(self, posts):
+        posts = [(os.path.abspath(image) if image else None, caption) for image, caption in posts]
+        try:
+            return self._call({"op": "analyze_posts", "posts": posts, "use_cache": self.use_cache,
+                               "ocr_options": self.ocr_options})["results"]
+        except ConnectionError:
+            print("[!] Analyzer daemon went away. Falling back to in-process analysis.")
+            from modules.social_analyzer import SocialPostAnalyzer
+            return SocialPostAnalyzer(use_cache=self.use_cache, ocr_options=self.ocr_options).analyze_posts(posts)
+
+    def shutdown(self):
+        self._call({"op": "shutdown"})
+
+def get_social_analyzer(use_daemon=True, use_cache=True, ocr_options=None):
+    """
+    Returns an object with analyze_post()/analyze_posts(): the warm daemon if one is running,
+    otherwise an in-process SocialPostAnalyzer (which loads the models itself).
+    """
+    if use_daemon:
+        client = DaemonClient(use_cache=use_cache, ocr_options=ocr_options)
+        if client.is_running():
+            print("[*] Using warm analyzer daemon (models already loaded).")
+            return client
+
+    from modules.social_analyzer import SocialPostAnalyzer
+    return SocialPostAnalyzer(use_cache=use_cache, ocr_options=ocr_options)
@@ -0,0 +1,126 @@
+import json
+import os
+import re
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules.code_miner import CodeMiner
+from modules.repo_scanner import RepoScanner
+from modules.reverse_osint import ReverseOSINT
+from modules.risk_assessment import RiskScorer
+from modules.http_client import HttpClient
+from modules.findings import FindingStore
+
+def load_targets(list_path):
+    """Reads one target per line, skipping blanks and '#' comments."""
+    targets = []
+    with open(list_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                targets.append(line)
+    return targets
+
+def load_posts(caption_file=None, image_list=None):
+    """
+    Builds (image_path, caption) posts for bulk social analysis.
+    When both files are given, line N of each is paired into one post.
+    """
+    captions = [c.strip('"') for c in load_targets(caption_file)] if caption_file else []
+    images = load_targets(image_list) if image_list else []
+    return list(zip_longest(images, captions))
+
+class BatchScanner:
+    """
+    Batch Mode: Concurrent Multi-Target Sweeps
+    Scans whole lists of usernames / repositories in one process with a worker pool.
+    All workers share one HTTP connection pool (and its rate-limit scheduler) and one
+    RiskScorer, and every target gets its own JSON result file.
+    """
+    def __init__(self, usernames=None, repos=None, workers=4, output_dir="shadowscan_results", archive=False,
+                 repo_options=None, http_cache=None, scheduler=None):
+        self.usernames = usernames or []
+        self.repos = repos or []
+        self.workers = max(1, workers)
+        self.output_dir = output_dir
+        self.archive = archive
+        self.repo_options = repo_options or {}
+
+        # Shared resources (loaded once for the whole sweep). Every worker fans out into its own
+        # fetch threads (RepoScanner) or page threads (CodeMiner), so the pool must hold a
+        # connection per thread or urllib3 discards the overflow and reconnects every request.
+        self.client = HttpClient(pool_size=self.pool_size(), cache=http_cache, scheduler=scheduler)
+        self.scorer = RiskScorer()
+
+    def pool_size(self):
+        """Peak number of concurrent requests: `workers` targets, each at its widest fan-out."""
+        fetch_workers = self.repo_options.get("fetch_workers", RepoScanner.FETCH_WORKERS) if self.repos else 1
+        page_workers = CodeMiner.PAGE_WORKERS if self.usernames else 1
+        return self.workers * max(1, fetch_workers, page_workers)
+
+    def jobs(self):
+        """Returns the full job list as (kind, target) pairs."""
+        return [("user", u) for u in self.usernames] + [("repo", r) for r in self.repos]
+
+    def run(self, on_result=None):
+        """
+        Runs every job on the worker pool.
+        `on_result` is called with each target's summary as soon as it completes.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._scan_target, kind, target): (kind, target) for kind, target in self.jobs()}
+
+            for future in as_completed(futures):
+                kind, target = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = self._build_result(kind, target, [{"type": "Error", "data": str(e), "risk_level": "Low"}])
+
+                result["output_file"] = self._write_result(result)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        self.client.close()
+        return results
+
+    def _scan_target(self, kind, target):
+        """Runs the pillars that apply to one target and returns its result record."""
+        findings = []
+
+        if kind == "user":
+            findings += CodeMiner(target, client=self.client).scan()
+            rev = ReverseOSINT(target)
+            findings += rev.check_breach_exposure() + rev.detect_trackers() + rev.generate_honeytoken()
+        else:
+            scanner = RepoScanner(target, client=self.client, **self.repo_options)
+            if scanner.local_path:
+                findings += scanner.scan_local()
+            else:
+                findings += scanner.scan_archive() if self.archive else scanner.scan_repo()
+
+        return self._build_result(kind, target, findings)
+
+    def _build_result(self, kind, target, findings):
+        store = FindingStore(findings)
+        score, severity, counts, _ = self.scorer.score_findings(store)
+        return {
+            "kind": kind,
+            "target": target,
+            "score": score,
+            "severity": severity,
+            "risk_counts": counts,
+            "findings": store.to_dicts()
+        }
+
+    def _write_result(self, result):
+        """Writes one target's result as JSON and returns the file path."""
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", result["target"]).strip("_")
+        path = os.path.join(self.output_dir, f"{result['kind']}_{safe_name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        return path
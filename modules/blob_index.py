@@ -0,0 +1,60 @@
+import json
+import threading
+from modules.cache_store import DiskLRUStore
+
+class BlobIndex:
+    """
+    Global Blob Result Index
+    Git names file contents by blob SHA, so an identical file (vendored library, boilerplate
+    config, a fork's untouched copy) has the same SHA in every repo. This index records, per
+    blob SHA and detector version, the secret hits the content produced - path-independent
+    (signature, line, masked value) triples, rebuilt into findings for whichever path the
+    blob shows up under. A blob seen in any repo skips both the fetch and the scan.
+    Each entry also records how far the content was read (None = whole file, "binary", or
+    the per-file byte cap it was cut at), so a capped result is reused under the same cap.
+    Size-capped LRU on disk; compact() drops entries from older detector versions.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, detector_version, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.detector_version = detector_version
+        self.store = DiskLRUStore("blob_index", max_bytes=max_bytes, cache_dir=cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls, detector_version):
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared.detector_version != detector_version:
+                cls._shared = cls(detector_version)
+            return cls._shared
+
+    def get(self, blob_sha):
+        """([(signature, line, masked value)], cap) recorded for this blob, or None if never scanned."""
+        try:
+            raw = self.store.get(f"{self.detector_version}:{blob_sha}")
+        except OSError:
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = json.loads(raw)
+        if isinstance(entry, list):
+            entry = {"hits": entry, "cap": None} # Written before caps were recorded: whole reads only
+        return [tuple(hit) for hit in entry["hits"]], entry["cap"]
+
+    def put(self, blob_sha, hits, cap=None):
+        try:
+            self.store.put(f"{self.detector_version}:{blob_sha}", json.dumps({"hits": hits, "cap": cap}).encode())
+        except OSError:
+            pass
+
+    def compact(self):
+        """Drops entries recorded by other detector versions and reclaims their disk space."""
+        self.store.retain(f"{self.detector_version}:")
+        self.store.compact()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.store), "bytes": self.store.total_bytes}
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+import time
+
+def default_cache_dir():
+    """Cache root: $SHADOWSCAN_CACHE_DIR, else ~/.cache/shadowscan."""
+    path = os.environ.get("SHADOWSCAN_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "shadowscan")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+class DiskLRUStore:
+    """
+    Persistent Key/Value Store with Size-Bounded LRU Eviction
+    A single SQLite file holding opaque byte values. Reads refresh an entry's access time,
+    and writes evict least-recently-used entries until the total size fits `max_bytes`.
+    Safe to share between threads of one process; separate processes (Folder Mode workers)
+    each open their own connection and wait on SQLite's file lock.
+    """
+    def __init__(self, name, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.path = os.path.join(cache_dir or default_cache_dir(), f"{name}.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries (last_access)")
+        self._db.commit()
+
+        # Running total so eviction never needs a full-table SUM()
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        """Returns the stored bytes for `key` (refreshing its LRU position), or None."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return row[0]
+
+    def put(self, key, value):
+        """Stores `value` under `key`, then evicts LRU entries until under the size cap."""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), size, time.time())
+            )
+            self._total += size - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def delete(self, key):
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total -= old[0]
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._total = 0
+            self._db.commit()
+
+    def retain(self, prefix):
+        """Deletes every entry whose key does NOT start with `prefix` (e.g. stale versions)."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE substr(key, 1, ?) != ?", (len(prefix), prefix))
+            self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            self._db.commit()
+
+    def compact(self):
+        """Reclaims the disk space freed by evictions (SQLite VACUUM)."""
+        with self._lock:
+            self._db.execute("VACUUM")
+
+    def items(self, prefix=""):
+        """All (key, value) pairs whose key starts with `prefix` (does not touch LRU order)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        return [(key, bytes(value)) for key, value in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    def _evict(self):
+        """Drops least-recently-used entries until the store fits (caller holds the lock)."""
+        if self._total <= self.max_bytes:
+            return
+        excess = self._total - self.max_bytes
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            victims.append((key,))
+            excess -= size
+            self._total -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
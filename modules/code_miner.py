@@ -1,103 +1,150 @@
-import requests
-import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qs
+from modules.http_client import HttpClient
+from modules.secret_detector import default_detector
+from modules.findings import Finding, Severity
 
 class CodeMiner:
-    def __init__(self, target_user):
+    # GitHub only exposes the most recent 300 public events (3 pages of 100)
+    EVENT_WINDOW = 300
+    PER_PAGE = 100
+    # Concurrent page requests per miner (batch mode sizes its shared pool from this)
+    PAGE_WORKERS = 3
+
+    def __init__(self, target_user, client=None, page_workers=PAGE_WORKERS):
         self.target = target_user
         self.api_url = f"https://api.github.com/users/{target_user}/events/public"
         self.headers = {'User-Agent': 'Shadow_Scan-OSINT-Scanner'}
+        # Shared connection pool (batch mode passes one client to every miner)
+        self.client = client or HttpClient()
+        # Shared anchored secret engine (same signatures as RepoScanner)
+        self.detector = default_detector
+        self.page_workers = max(1, page_workers)
 
-    def scan(self):
+    def scan(self, on_finding=None):
         """
-        Deep behavioral scan of user activity. 
+        Deep behavioral scan of user activity.
         Extracts: Emails, Leaked Secrets in Commits/Comments, and 'Oops' history.
+        `on_finding` (optional) is called with each finding the moment it is produced.
         """
         findings = []
+        for finding in self.iter_findings():
+            findings.append(finding)
+            if on_finding:
+                on_finding(finding)
+        return findings
+
+    def iter_findings(self):
+        """
+        Streaming scan over the full public event window.
+        Page 1 is fetched first; the remaining pages (from its Link header) are fetched
+        concurrently and each page's events are processed as soon as that page arrives.
+        """
+        found_emails = set()
+        event_count = 0
+        produced = 0
+
         try:
-            response = requests.get(self.api_url, headers=self.headers)
-            
+            response = self._get_page(1)
+
             # Error Handling
             if response.status_code == 404:
-                return [{"type": "Error", "data": "User not found on GitHub.", "risk_level": "Low"}]
+                yield {"type": "Error", "data": "User not found on GitHub.", "risk_level": "Low"}
+                return
             if response.status_code == 403:
-                return [{"type": "Error", "data": "GitHub API Rate Limit Exceeded (Try later or use Token).", "risk_level": "Low"}]
+                yield {"type": "Error", "data": "GitHub API Rate Limit Exceeded (Try later or use Token).", "risk_level": "Low"}
+                return
             if response.status_code != 200:
-                return [{"type": "Error", "data": f"API Error: {response.status_code}", "risk_level": "Low"}]
+                yield {"type": "Error", "data": f"API Error: {response.status_code}", "risk_level": "Low"}
+                return
 
+            # 1. First page: process immediately
             events = response.json()
-            found_emails = set()
-            
-            # --- SIGNATURES (Behavioral & Secrets) ---
-            secret_patterns = {
-                "AWS Key": r"AKIA[0-9A-Z]{16}",
-                "Private Key": r"-----BEGIN [A-Z]+ PRIVATE KEY-----",
-                "Google API": r"AIza[0-9A-Za-z-_]{35}",
-                "Generic Token": r"(?:api|access)[_-]?key\s*[:=]\s*['\"][a-zA-Z0-9_\-]{10,}['\"]",
-                "Password": r"password\s*[:=]\s*['\"][^'\"]{6,}['\"]"
-            }
-
-            for event in events:
-                # 1. PUSH EVENTS (Commits)
-                if event['type'] == 'PushEvent':
-                    repo_name = event['repo']['name']
-                    commits = event['payload'].get('commits', [])
-                    
-                    for commit in commits:
-                        message = commit.get('message', '')
-                        author_email = commit.get('author', {}).get('email', '')
-                        
-                        # A. Extract Author Email (Identity Leak)
-                        if author_email and "noreply" not in author_email:
-                            if author_email not in found_emails:
-                                found_emails.add(author_email)
-                                findings.append({
-                                    "type": "Identity Leak",
-                                    "data": f"Personal/Work Email found in commit: {author_email}",
-                                    "risk_level": "Medium"
-                                })
-
-                        # B. Scan Commit Message for Secrets
-                        for sig_name, pattern in secret_patterns.items():
-                            if re.search(pattern, message, re.IGNORECASE):
-                                findings.append({
-                                    "type": "Commit Leak", 
-                                    "data": f"Found '{sig_name}' in commit msg: {message[:40]}...",
-                                    "risk_level": "High"
-                                })
-                        
-                        # C. Detect 'Oops' Commits (History Risk)
-                        # If they say "removed key", the key is likely in the PREVIOUS commit history
-                        suspicious_words = ["remove key", "delete secret", "hide token", "fix creds", "revoked"]
-                        if any(s in message.lower() for s in suspicious_words):
-                             findings.append({
-                                    "type": "History Risk", 
-                                    "data": f"Suspicious cleanup detected: '{message}'. Check previous commit diffs!",
-                                    "risk_level": "High"
-                                })
-
-                # 2. ISSUE & PR COMMENTS (Context Leaks)
-                # Developers often paste logs/configs in comments
-                elif event['type'] in ['IssueCommentEvent', 'PullRequestReviewCommentEvent']:
-                    body = event['payload'].get('comment', {}).get('body', '')
-                    repo_name = event['repo']['name']
-                    
-                    for sig_name, pattern in secret_patterns.items():
-                        if re.search(pattern, body, re.IGNORECASE):
-                            findings.append({
-                                "type": "Comment Leak",
-                                "data": f"Found '{sig_name}' in Issue/PR discussion on {repo_name}",
-                                "risk_level": "CRITICAL"
-                            })
+            event_count += len(events)
+            for finding in self._process_events(events, found_emails):
+                produced += 1
+                yield finding
+
+            # 2. Remaining pages: fetched in parallel, processed in arrival order
+            last_page = min(self._last_page(response), self.EVENT_WINDOW // self.PER_PAGE)
+            if last_page > 1:
+                with ThreadPoolExecutor(max_workers=self.page_workers) as pool:
+                    futures = [pool.submit(self._get_page, page) for page in range(2, last_page + 1)]
+                    for future in as_completed(futures):
+                        try:
+                            page_response = future.result()
+                        except Exception:
+                            continue # A lost page shouldn't discard the pages we already have
+                        if page_response.status_code != 200:
+                            continue
+
+                        events = page_response.json()
+                        event_count += len(events)
+                        for finding in self._process_events(events, found_emails):
+                            produced += 1
+                            yield finding
 
             # 3. SUMMARY
-            if not findings:
-                findings.append({"type": "Info", "data": f"Scanned {len(events)} recent events. Behavior appears clean.", "risk_level": "Low"})
+            if not produced:
+                yield {"type": "Info", "data": f"Scanned {event_count} recent events. Behavior appears clean.", "risk_level": "Low"}
             else:
                 # Add a summary item
-                findings.append({"type": "Summary", "data": f"Activity Scan: {len(found_emails)} unique emails found.", "risk_level": "Medium"})
-                
+                yield {"type": "Summary", "data": f"Activity Scan: {event_count} events, {len(found_emails)} unique emails found.", "risk_level": "Medium"}
+
         except Exception as e:
-            findings.append({"type": "Error", "data": str(e), "risk_level": "Low"})
-            
-        return findings
\ No newline at end of file
+            yield {"type": "Error", "data": str(e), "risk_level": "Low"}
+
+    def _get_page(self, page):
+        return self.client.get(self.api_url, headers=self.headers, params={"per_page": self.PER_PAGE, "page": page}, cached=True)
+
+    def _last_page(self, response):
+        """Reads the page number of rel="last" from the Link header (1 if there is only one page)."""
+        last = response.links.get("last", {}).get("url")
+        if not last:
+            return 1
+        try:
+            return int(parse_qs(urlparse(last).query).get("page", ["1"])[0])
+        except ValueError:
+            return 1
+
+    def _process_events(self, events, found_emails):
+        """Yields findings for one page of events (`found_emails` is shared across pages)."""
+        for event in events:
+            # 1. PUSH EVENTS (Commits)
+            if event['type'] == 'PushEvent':
+                repo_name = event['repo']['name']
+                commits = event['payload'].get('commits', [])
+
+                for commit in commits:
+                    message = commit.get('message', '')
+                    author_email = commit.get('author', {}).get('email', '')
+
+                    # A. Extract Author Email (Identity Leak)
+                    if author_email and "noreply" not in author_email:
+                        if author_email not in found_emails:
+                            found_emails.add(author_email)
+                            yield Finding("Identity Leak", f"Personal/Work Email found in commit: {author_email}", Severity.MEDIUM,
+                                          source="code_miner", location=repo_name)
+
+                    # B. Scan Commit Message for Secrets
+                    for sig_name in self.detector.first_hits(message):
+                        yield Finding("Commit Leak", f"Found '{sig_name}' in commit msg: {message[:40]}...", Severity.HIGH,
+                                      source="code_miner", location=f"{repo_name}@{(commit.get('sha') or '')[:7]}", signature=sig_name)
+
+                    # C. Detect 'Oops' Commits (History Risk)
+                    # If they say "removed key", the key is likely in the PREVIOUS commit history
+                    suspicious_words = ["remove key", "delete secret", "hide token", "fix creds", "revoked"]
+                    if any(s in message.lower() for s in suspicious_words):
+                         yield Finding("History Risk", f"Suspicious cleanup detected: '{message}'. Check previous commit diffs!", Severity.HIGH,
+                                       source="code_miner", location=f"{repo_name}@{(commit.get('sha') or '')[:7]}")
+
+            # 2. ISSUE & PR COMMENTS (Context Leaks)
+            # Developers often paste logs/configs in comments
+            elif event['type'] in ['IssueCommentEvent', 'PullRequestReviewCommentEvent']:
+                body = event['payload'].get('comment', {}).get('body', '')
+                repo_name = event['repo']['name']
+
+                for sig_name in self.detector.first_hits(body):
+                    yield Finding("Comment Leak", f"Found '{sig_name}' in Issue/PR discussion on {repo_name}", Severity.CRITICAL,
+                                  source="code_miner", location=repo_name, signature=sig_name)
@@ -0,0 +1,212 @@
+from array import array
+from collections import Counter
+from enum import IntEnum
+
+class Severity(IntEnum):
+    """Finding severity, ordered so `>=` comparisons work (INFO < LOW < ... < CRITICAL)."""
+    INFO = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+    @property
+    def label(self):
+        """The legacy `risk_level` string ("CRITICAL", "High", "Medium", "Low", "Info")."""
+        return "CRITICAL" if self is Severity.CRITICAL else self.name.capitalize()
+
+    @classmethod
+    def coerce(cls, value):
+        """Severity from a Severity, an int code, or a risk_level string (unknown -> INFO)."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, int):
+            return cls(value)
+        return cls.__members__.get(str(value or "").upper(), cls.INFO)
+
+FIELDS = ("type", "data", "severity", "source", "location", "signature", "masked_value")
+
+class Finding:
+    """
+    One intelligence finding: the human-readable `data` line plus structured fields to
+    filter on (which module found it, where, which signature matched, the masked value).
+    Reads like the legacy {"type", "data", "risk_level"} dict, so existing consumers
+    (`item['data']`, `item.get('risk_level')`) keep working.
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, type, data, severity, source=None, location=None, signature=None, masked_value=None):
+        self.type = type
+        self.data = data
+        self.severity = Severity.coerce(severity)
+        self.source = source
+        self.location = location
+        self.signature = signature
+        self.masked_value = masked_value
+
+    @property
+    def risk_level(self):
+        return self.severity.label
+
+    @classmethod
+    def from_dict(cls, item):
+        if isinstance(item, Finding):
+            return item
+        return cls(item.get("type"), item.get("data"), item.get("severity", item.get("risk_level")),
+                   item.get("source"), item.get("location"), item.get("signature"), item.get("masked_value"))
+
+    def to_dict(self):
+        """Legacy dict (JSON output): type/data/risk_level plus any structured fields that are set."""
+        result = {"type": self.type, "data": self.data, "risk_level": self.risk_level}
+        for field in ("source", "location", "signature", "masked_value"):
+            value = getattr(self, field)
+            if value is not None:
+                result[field] = value
+        return result
+
+    # --- dict compatibility ---
+    def __getitem__(self, key):
+        if key == "risk_level":
+            return self.risk_level
+        if key in FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __eq__(self, other):
+        if isinstance(other, (Finding, dict)):
+            return self.to_dict() == as_dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Finding({self.type!r}, {self.data!r}, {self.severity.name})"
+
+def as_dict(finding):
+    """JSON-ready dict for a Finding or a legacy finding dict."""
+    return finding.to_dict() if isinstance(finding, Finding) else finding
+
+class FindingStore:
+    """
+    Columnar Findings Container
+    Keeps large result sets column by column instead of one dict per finding: severity
+    codes in a byte array, type/source as ids into one shared string table, and the text
+    columns as plain lists. Counting, grouping and filtering by severity/type/source run
+    on the integer columns; Finding objects are only built when iterated.
+    Accepts Finding objects and legacy finding dicts alike.
+    """
+    def __init__(self, findings=None):
+        self._severity = array("b")
+        self._type = array("I")
+        self._source = array("I")
+        self._data = []
+        self._location = []
+        self._signature = []
+        self._masked = []
+        self._strings = [None]      # id -> string (id 0 is None)
+        self._string_ids = {None: 0}
+        if findings:
+            self.extend(findings)
+
+    def append(self, finding):
+        finding = Finding.from_dict(finding)
+        self._severity.append(finding.severity)
+        self._type.append(self._intern(finding.type))
+        self._source.append(self._intern(finding.source))
+        self._data.append(finding.data)
+        self._location.append(finding.location)
+        self._signature.append(finding.signature)
+        self._masked.append(finding.masked_value)
+
+    def extend(self, findings):
+        for finding in findings:
+            self.append(finding)
+
+    def __len__(self):
+        return len(self._severity)
+
+    def __getitem__(self, index):
+        strings = self._strings
+        return Finding(strings[self._type[index]], self._data[index], self._severity[index],
+                       strings[self._source[index]], self._location[index], self._signature[index], self._masked[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    # --- counting & grouping (integer columns only) ---
+    def counts_by_severity(self):
+        """{Severity: count} for every severity present."""
+        return {Severity(code): n for code, n in Counter(self._severity).items()}
+
+    def counts_by_type(self):
+        return {self._strings[type_id]: n for type_id, n in Counter(self._type).items()}
+
+    def count(self, severity=None, min_severity=None, type=None, source=None):
+        return len(self._matching(severity, min_severity, type, source))
+
+    def filter(self, severity=None, min_severity=None, type=None, source=None):
+        """New store holding only the findings that match every given criterion."""
+        return self._take(self._matching(severity, min_severity, type, source))
+
+    def group_by(self, column):
+        """{key: FindingStore} split on "severity", "type" or "source"."""
+        if column == "severity":
+            codes, key = self._severity, Severity
+        elif column in ("type", "source"):
+            codes, key = (self._type if column == "type" else self._source), self._strings.__getitem__
+        else:
+            raise ValueError(f"Cannot group findings by {column!r}")
+        rows = {}
+        for index, code in enumerate(codes):
+            rows.setdefault(code, []).append(index)
+        return {key(code): self._take(indexes) for code, indexes in rows.items()}
+
+    def to_dicts(self):
+        return [finding.to_dict() for finding in self]
+
+    def _intern(self, value):
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _matching(self, severity, min_severity, type, source):
+        """Row indexes matching all criteria (strings resolved to ids once, then integer compares)."""
+        checks = []
+        if severity is not None:
+            code = Severity.coerce(severity)
+            checks.append(lambda i: self._severity[i] == code)
+        if min_severity is not None:
+            floor = Severity.coerce(min_severity)
+            checks.append(lambda i: self._severity[i] >= floor)
+        for column, wanted in ((self._type, type), (self._source, source)):
+            if wanted is not None:
+                wanted_id = self._string_ids.get(wanted, -1)
+                checks.append(lambda i, column=column, wanted_id=wanted_id: column[i] == wanted_id)
+        return [i for i in range(len(self)) if all(check(i) for check in checks)]
+
+    def _take(self, indexes):
+        store = FindingStore()
+        # Share the string table: ids stay valid, so rows copy column-by-column
+        store._strings = self._strings
+        store._string_ids = self._string_ids
+        for i in indexes:
+            store._severity.append(self._severity[i])
+            store._type.append(self._type[i])
+            store._source.append(self._source[i])
+            store._data.append(self._data[i])
+            store._location.append(self._location[i])
+            store._signature.append(self._signature[i])
+            store._masked.append(self._masked[i])
+        return store
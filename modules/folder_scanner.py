@@ -0,0 +1,171 @@
+import contextlib
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from modules.risk_assessment import RiskScorer
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".heic", ".heif", ".tif", ".tiff", ".webp", ".bmp", ".gif"}
+
+def is_image_collection(source):
+    """True if `-i` points at a folder or a glob pattern rather than a single image."""
+    return os.path.isdir(source) or glob.has_magic(source)
+
+def iter_images(source):
+    """Yields image paths under a folder (recursively) or matching a glob, in a stable sorted order."""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                    yield os.path.join(root, name)
+    else:
+        for path in sorted(glob.iglob(source, recursive=True)):
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                yield path
+
+# --- Worker process state (one OCR/NLP analyzer per process, loaded once) ---
+_worker_analyzer = None
+_worker_use_cache = True
+
+def _init_worker(use_cache, ocr_options):
+    global _worker_analyzer, _worker_use_cache
+    # Every process already owns a core: keep torch from spawning a thread per core on top
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+    from modules.social_analyzer import SocialPostAnalyzer
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        _worker_analyzer = SocialPostAnalyzer(use_cache=use_cache, ocr_options=ocr_options)
+    _worker_use_cache = use_cache
+
+def _scan_chunk(paths):
+    """EXIF + OCR findings for a few images (OCR runs as one batch). Returns [(path, findings)]."""
+    from modules.visual_intel import VisualIntel
+
+    ocr_results = _worker_analyzer.analyze_posts([(path, None) for path in paths])
+    results = []
+    for path, ocr_findings in zip(paths, ocr_results):
+        findings = VisualIntel(path, use_cache=_worker_use_cache).extract_metadata()
+        results.append((path, findings + ocr_findings))
+    return results
+
+class FolderScanner:
+    """
+    Folder Mode: Parallel Image Collection Scan
+    Walks a folder (or glob) of images and spreads EXIF + OCR analysis over a process pool
+    sized to the machine's cores. Results stream back as each chunk of images completes and
+    are appended to a JSON-lines journal, so an interrupted scan resumes where it stopped.
+    """
+    def __init__(self, source, workers=None, output_dir="shadowscan_results", use_cache=True, resume=True, chunk_size=4,
+                 ocr_options=None):
+        self.source = source
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.output_dir = output_dir
+        self.use_cache = use_cache
+        self.ocr_options = ocr_options or {}
+        self.chunk_size = max(1, chunk_size)
+        self.scorer = RiskScorer()
+        self.failed = []  # Records of images whose worker crashed this run (retried on resume)
+
+        # One journal per source folder/pattern
+        digest = hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:10]
+        self.journal_path = os.path.join(output_dir, f"images_{digest}.jsonl")
+
+        self.images = list(iter_images(source))
+        self.completed = {} if not resume else self._load_journal()
+        if not resume and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def pending(self):
+        """Images not yet recorded in the journal."""
+        return [path for path in self.images if path not in self.completed]
+
+    def results(self):
+        """Every journaled result (previous runs + this one)."""
+        return list(self.completed.values())
+
+    def run(self, on_result=None):
+        """
+        Scans every pending image. `on_result` is called with each image's record as it lands.
+        At most two chunks per worker are in flight, so huge folders don't pile up in memory.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        pending = self.pending()
+        chunks = iter([pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)])
+
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.use_cache, self.ocr_options))
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as journal:
+                in_flight = {}
+                for chunk in chunks:
+                    in_flight[pool.submit(_scan_chunk, chunk)] = chunk
+                    if len(in_flight) >= self.workers * 2:
+                        break
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk = in_flight.pop(future)
+                        try:
+                            scanned = future.result()
+                            failed = False
+                        except Exception as e:
+                            scanned = [(path, [{"type": "Error", "data": f"Image scan failed: {e}", "risk_level": "Low"}]) for path in chunk]
+                            failed = True
+
+                        for path, findings in scanned:
+                            record = self._build_result(path, findings)
+                            # Failed chunks are reported but not journaled, so a resumed run retries them
+                            if failed:
+                                self.failed.append(record)
+                            else:
+                                journal.write(json.dumps(record) + "\n")
+                                self.completed[path] = record
+                            if on_result:
+                                on_result(record)
+                        journal.flush()
+
+                        # Keep the pool fed
+                        nxt = next(chunks, None)
+                        if nxt:
+                            in_flight[pool.submit(_scan_chunk, nxt)] = nxt
+        finally:
+            # On Ctrl+C don't wait for queued chunks - they'll be picked up on resume
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return self.results()
+
+    def _build_result(self, path, findings):
+        score, severity, counts, _ = self.scorer.score_findings(findings)
+        return {
+            "image": path,
+            "score": score,
+            "severity": severity,
+            "risk_counts": counts,
+            "findings": findings
+        }
+
+    def _load_journal(self):
+        """Reads the results of an earlier (interrupted) run of this same scan."""
+        completed = {}
+        if not os.path.exists(self.journal_path):
+            return completed
+        line = ""
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Half-written last line from an interrupted run
+                completed[record["image"]] = record
+        # Terminate a torn last line so new records start on a fresh line
+        if line and not line.endswith("\n"):
+            with open(self.journal_path, "a", encoding="utf-8") as journal:
+                journal.write("\n")
+        return completed
@@ -0,0 +1,80 @@
+import math
+from collections import Counter, defaultdict
+from thefuzz import fuzz
+
+def _bigrams(text):
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
+
+class FuzzyKeywordIndex:
+    """
+    Indexed Approximate Keyword Matcher (typo detection)
+    Finds keywords whose fuzz.ratio against a word lies strictly between `low` and `high`,
+    without comparing the word against every keyword:
+
+    1. Length buckets - fuzz.ratio is 100 * (1 - d / (len_a + len_b)) with d the indel
+       distance, and d >= |len_a - len_b|, so only keywords of nearby length can qualify.
+    2. Bigram count filter - d edits destroy at most 2*d bigrams, so a qualifying keyword
+       must share at least max(len) - 1 - 2*d_max bigrams with the word.
+    3. Survivors are verified with the real fuzz.ratio, so results are identical to the
+       full pairwise loop. Per-word results are memoized across posts.
+    """
+    def __init__(self, keywords, low=85, high=100, memo_size=50000):
+        self.keywords = list(keywords)
+        self.low = low
+        self.high = high
+        self.memo_size = memo_size
+        self._memo = {}
+
+        # Largest indel distance that can still round to a ratio above `low`
+        self._max_fraction = (100 - (low + 0.5)) / 100
+
+        self._by_length = defaultdict(list)
+        self._postings = defaultdict(list)
+        for index, keyword in enumerate(self.keywords):
+            self._by_length[len(keyword)].append(index)
+            for gram, count in _bigrams(keyword).items():
+                self._postings[gram].append((index, count))
+
+    def matches(self, word):
+        """Keywords (in original list order) with low < fuzz.ratio(word, keyword) < high."""
+        cached = self._memo.get(word)
+        if cached is not None:
+            return cached
+
+        result = [self.keywords[i] for i in sorted(self._candidates(word))
+                  if self.low < fuzz.ratio(word, self.keywords[i]) < self.high]
+
+        if len(self._memo) >= self.memo_size:
+            self._memo.clear()
+        self._memo[word] = result
+        return result
+
+    def _d_max(self, len_a, len_b):
+        return math.floor((len_a + len_b) * self._max_fraction + 1e-9)
+
+    def _candidates(self, word):
+        """Keyword indexes that pass the length and bigram filters."""
+        length = len(word)
+
+        # 1. Length window: |L - K| <= d_max(L, K)  <=>  K in [L*(1-f)/(1+f), L*(1+f)/(1-f)]
+        f = self._max_fraction
+        lo = math.floor(length * (1 - f) / (1 + f))
+        hi = math.ceil(length * (1 + f) / (1 - f))
+        in_range = [i for k in range(max(0, lo), hi + 1) for i in self._by_length.get(k, ())
+                    if abs(length - k) <= self._d_max(length, k)]
+        if not in_range:
+            return []
+
+        # 2. Shared-bigram counts via the inverted index
+        shared = defaultdict(int)
+        for gram, count in _bigrams(word).items():
+            for index, kw_count in self._postings.get(gram, ()):
+                shared[index] += min(count, kw_count)
+
+        candidates = []
+        for index in in_range:
+            k = len(self.keywords[index])
+            needed = max(length, k) - 1 - 2 * self._d_max(length, k)
+            if shared.get(index, 0) >= needed:
+                candidates.append(index)
+        return candidates
@@ -0,0 +1,102 @@
+import os
+import re
+
+class GitIgnore:
+    """
+    .gitignore Matcher
+    Applies the ignore rules of a working tree the way git does: every directory's
+    .gitignore (plus .git/info/exclude at the root), patterns relative to the file that
+    defines them, `!` re-includes, trailing `/` for directories only, `*`/`?`/`[...]`
+    within one path segment and `**` across segments. The last matching rule wins,
+    deeper files override shallower ones.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._rules = {}  # directory (repo-relative, "" = root) -> [(regex, negate, dir_only)]
+        self.load("")
+        self._rules[""] = self._parse(os.path.join(root, ".git", "info", "exclude")) + self._rules[""]
+
+    def load(self, directory):
+        """Reads `directory`/.gitignore (call once per directory, parents first)."""
+        self._rules[directory] = self._parse(os.path.join(self.root, directory, ".gitignore"))
+
+    def ignored(self, path, is_dir=False):
+        """True if the repo-relative `path` is ignored by the rules of its ancestor directories."""
+        result = False
+        parts = path.split("/")
+        for depth in range(len(parts)):
+            base = "/".join(parts[:depth])
+            rules = self._rules.get(base)
+            if not rules:
+                continue
+            relative = "/".join(parts[depth:])
+            for regex, negate, dir_only in rules:
+                if dir_only and not is_dir:
+                    continue
+                if regex.fullmatch(relative):
+                    result = not negate
+        return result
+
+    def _parse(self, path):
+        rules = []
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return rules
+
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            # A slash anywhere but the end anchors the pattern to this directory
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            prefix = "" if anchored else "(?:.*/)?"
+            rules.append((re.compile(prefix + _translate(line), re.DOTALL), negate, dir_only))
+        return rules
+
+def _translate(pattern):
+    """Glob (gitignore flavour) -> regex source."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j == -1:
+                out.append("\\[")
+            else:
+                chars = pattern[i + 1:j].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                out.append(f"[{chars}]")
+                i = j + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
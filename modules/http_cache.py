@@ -0,0 +1,80 @@
+import hashlib
+import json
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+from modules.cache_store import DiskLRUStore
+
+class HttpCache:
+    """
+    Conditional-Request Response Cache
+    Keeps the last 200 response per URL (+ auth identity) on disk together with its
+    ETag / Last-Modified validators. Repeat requests are revalidated with If-None-Match /
+    If-Modified-Since; a 304 is answered from disk (and GitHub does not bill 304s).
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.store = DiskLRUStore("http_cache", max_bytes=max_bytes, cache_dir=cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key_for(self, url, headers):
+        """Cache key: URL + a hash of the credentials (private views must not leak across tokens)."""
+        auth = (headers or {}).get("Authorization", "")
+        return url + "#" + hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+    def lookup(self, key):
+        """Returns (meta, body) for a cached response, or None."""
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        meta, _, body = raw.partition(b"\n")
+        return json.loads(meta), body
+
+    def validators(self, entry):
+        """Conditional headers to revalidate a cached entry."""
+        meta, _ = entry
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def save(self, key, response):
+        """Stores a 200 response if it carries a validator (otherwise it can't be revalidated)."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        meta = {
+            "url": response.url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": response.encoding,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "link", "etag", "last-modified")}
+        }
+        self.store.put(key, json.dumps(meta).encode() + b"\n" + response.content)
+
+    def rebuild(self, entry, not_modified):
+        """Turns a cached entry back into a 200 requests.Response (keeping the 304's live headers)."""
+        meta, body = entry
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = meta["url"]
+        response.encoding = meta.get("encoding") or "utf-8"
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.headers.update({k: v for k, v in not_modified.headers.items() if k.lower().startswith("x-ratelimit")})
+        response.from_cache = True
+        return response
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
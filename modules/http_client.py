@@ -0,0 +1,86 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+class HttpClient:
+    """
+    Shared HTTP Layer
+    One pooled requests.Session reused by every network pillar (CodeMiner, RepoScanner),
+    so batch sweeps keep connections alive instead of re-handshaking per target.
+    Optionally backed by an on-disk conditional-request cache (see HttpCache) and a
+    rate-limit scheduler that paces and rotates API credentials (see RateLimitScheduler).
+    """
+    def __init__(self, pool_size=10, cache=None, scheduler=None):
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Shadow_Scan-OSINT-Scanner'})
+        self.cache = cache
+        self.scheduler = scheduler
+
+        # Size the connection pool to the number of concurrent workers
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url, cached=False, **kwargs):
+        """
+        Performs a GET request through the shared connection pool.
+        With `cached=True` (and a cache configured) the request is revalidated against the
+        stored ETag/Last-Modified and a 304 is served from disk.
+        """
+        if not (cached and self.cache):
+            return self._send(url, **kwargs)
+
+        # Query params are part of the resource identity (e.g. ?page=2)
+        full_url = requests.Request("GET", url, params=kwargs.pop("params", None)).prepare().url
+        cached_entry = {}
+
+        def revalidate(send_headers):
+            # Keyed on the credential actually sent (the scheduler attaches / rotates it per attempt)
+            key = self.cache.key_for(full_url, send_headers)
+            entry = self.cache.lookup(key)
+            cached_entry.update(key=key, entry=entry)
+            return self.cache.validators(entry) if entry else {}
+
+        response = self._send(full_url, on_send=revalidate, **kwargs)
+        key, entry = cached_entry["key"], cached_entry["entry"]
+
+        if entry and response.status_code == 304:
+            self.cache.record(hit=True)
+            return self.cache.rebuild(entry, response)
+
+        self.cache.record(hit=False)
+        self.cache.save(key, response)
+        return response
+
+    def _send(self, url, on_send=None, **kwargs):
+        """
+        Sends one GET. Metered API calls go through the scheduler: a credential is acquired
+        (waiting if the whole pool is out of quota), its Authorization header is attached,
+        and rate-limited responses are retried on the next available credential.
+        `on_send(headers)` sees each attempt's final headers and returns extra ones to add.
+        """
+        base_headers = dict(kwargs.pop("headers", None) or {})
+        if not (self.scheduler and self.scheduler.applies_to(url)):
+            if on_send:
+                base_headers.update(on_send(base_headers))
+            return self.session.get(url, headers=base_headers, **kwargs)
+
+        for attempt in range(self.scheduler.max_retries + 1):
+            state = self.scheduler.acquire()
+            headers = dict(base_headers)
+            headers.update(state.auth_header())
+            if on_send:
+                headers.update(on_send(headers))
+
+            response = self.session.get(url, headers=headers, **kwargs)
+            backoff = self.scheduler.update(state, response)
+            if backoff is None or attempt == self.scheduler.max_retries:
+                return response
+            # Rate-limited: the credential is now blocked, so acquire() rotates or queues
+        return response
+
+    def cache_stats(self):
+        """Hit/miss counters for the run output (None when caching is off)."""
+        return self.cache.stats() if self.cache else None
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import threading
+from modules.cache_store import DiskLRUStore
+
+class ImageResultCache:
+    """
+    Content-Addressed Image Result Cache
+    Stores expensive per-image results (OCR text, EXIF findings) keyed by the SHA-256 of
+    the image bytes plus a version string, so re-posts, renamed copies and batch reruns
+    skip OCR/EXIF entirely. Backed by a size-capped LRU store on disk.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, cache_dir=None):
+        self.store = DiskLRUStore("image_cache", max_bytes=max_bytes, cache_dir=cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}  # (path, size, mtime) -> sha256, so OCR and EXIF hash a file once
+
+    @classmethod
+    def shared(cls):
+        """Process-wide instance (SocialPostAnalyzer and VisualIntel share one store)."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def content_hash(self, path):
+        """SHA-256 of the file contents (memoized per path/size/mtime)."""
+        stat = os.stat(path)
+        ident = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._hashes.get(ident)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._hashes[ident] = digest
+        return digest
+
+    def key(self, path, kind, version):
+        return f"{kind}:{self.content_hash(path)}:{version}"
+
+    def get(self, path, kind, version):
+        """Cached JSON value for this image/kind/version, or None."""
+        try:
+            digest = self.content_hash(path)
+        except OSError:
+            return None
+        return self.get_digest(digest, kind, version)
+
+    def get_digest(self, digest, kind, version):
+        """Same as get(), for an image known only by its content hash (see PerceptualIndex)."""
+        try:
+            raw = self.store.get(f"{kind}:{digest}:{version}")
+        except OSError:
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def put(self, path, kind, version, value):
+        try:
+            self.store.put(self.key(path, kind, version), json.dumps(value).encode())
+        except OSError:
+            pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,166 @@
+import threading
+from PIL import Image, ImageChops, ImageOps
+from modules.cache_store import DiskLRUStore
+
+# Block grid for the confirmation signature, and the largest per-block brightness change
+# (of 255) still treated as the same picture. Recompressing / resizing moves blocks by < 10;
+# one changed character in a line of screenshot text moves its block by ~20 or more.
+BLOCK_GRID = 64
+BLOCK_TOLERANCE = 12
+
+def dhash(image_path, hash_size=16):
+    """
+    Difference hash: grayscale, shrink to (hash_size+1) x hash_size, one bit per
+    left/right brightness comparison. Survives recompression, resizing and small edits.
+    """
+    return fingerprint(image_path, hash_size)[0]
+
+def fingerprint(image_path, hash_size=16, grid=BLOCK_GRID):
+    """
+    (dHash, block signature) from one decode. The dHash finds candidates; the block
+    signature - mean brightness of every cell of a `grid` x `grid` raster, as bytes -
+    confirms them. Two screenshots with the same layout but different text can sit a few
+    dHash bits apart, yet the blocks over their text lines differ clearly.
+    """
+    with Image.open(image_path) as img:
+        img.draft("L", (grid * 4, grid * 4))  # JPEG: decode at a small scale
+        img = ImageOps.exif_transpose(img).convert("L")
+        signature = img.resize((grid, grid), Image.BOX).tobytes()
+        pixels = list(img.resize((hash_size + 1, hash_size), Image.BILINEAR).getdata())
+
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits, signature
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+def same_picture(signature_a, signature_b, tolerance=BLOCK_TOLERANCE):
+    """True if no block of the two signatures differs by more than `tolerance` brightness levels."""
+    if not signature_a or not signature_b or len(signature_a) != len(signature_b):
+        return False
+    grid = int(len(signature_a) ** 0.5)
+    a = Image.frombytes("L", (grid, grid), signature_a)
+    b = Image.frombytes("L", (grid, grid), signature_b)
+    return ImageChops.difference(a, b).getextrema()[1] <= tolerance
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance: radius queries without a full scan."""
+    def __init__(self):
+        self.root = None  # [fingerprint, value, {distance: child}]
+        self.size = 0
+
+    def add(self, fingerprint, value):
+        self.size += 1
+        if self.root is None:
+            self.root = [fingerprint, value, {}]
+            return
+        node = self.root
+        while True:
+            d = hamming(fingerprint, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [fingerprint, value, {}]
+                return
+            node = child
+
+    def within(self, fingerprint, max_distance):
+        """Every (distance, value) within `max_distance`, closest first."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            d = hamming(fingerprint, node[0])
+            if d <= max_distance:
+                found.append((d, node[1]))
+            for child_d, child in node[2].items():
+                if d - max_distance <= child_d <= d + max_distance:
+                    stack.append(child)
+        return sorted(found, key=lambda match: match[0])
+
+    def nearest(self, fingerprint, max_distance):
+        """(distance, value) of the closest entry within `max_distance`, or None."""
+        if self.root is None:
+            return None
+        best = None
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            d = hamming(fingerprint, node[0])
+            if d <= max_distance and (best is None or d < best[0]):
+                best = (d, node[1])
+                if d == 0:
+                    break
+            # Triangle inequality: only children at distance d +/- radius can hold matches
+            radius = best[0] if best is not None else max_distance
+            for child_d, child in node[2].items():
+                if d - radius <= child_d <= d + radius:
+                    stack.append(child)
+        return best
+
+class PerceptualIndex:
+    """
+    Cross-Run Near-Duplicate Image Index
+    Maps dHash fingerprints to the content hash of an image whose OCR result is cached,
+    so re-posts, recompressions and resized copies seen in earlier runs reuse that OCR.
+    Each entry keeps the image's block signature too: a dHash match only counts once the
+    signatures agree (see same_picture).
+    Fingerprints persist in a size-capped LRU store and load into a BK-tree on first use.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, hash_size=16, max_bytes=32 * 1024 * 1024, cache_dir=None):
+        self.hash_size = hash_size
+        self.store = DiskLRUStore("phash_index", max_bytes=max_bytes, cache_dir=cache_dir)
+        self._prefix = f"d{hash_size}b{BLOCK_GRID}:"
+        self._tree = None
+        self._signatures = {}  # content hash -> block signature
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def nearest(self, fingerprint, max_distance, signature):
+        """Content hash of the closest known image within `max_distance` bits whose block signature matches, or None."""
+        with self._lock:
+            candidates = self._load().within(fingerprint, max_distance)
+            digest = next((value for _, value in candidates if same_picture(signature, self._signatures.get(value))), None)
+        if digest is None:
+            return None
+        try:
+            self.store.get(self._prefix + digest)  # Refresh its LRU position
+        except OSError:
+            pass
+        return digest
+
+    def add(self, fingerprint, digest, signature):
+        value = fingerprint.to_bytes(self._hash_bytes(), "big") + signature
+        with self._lock:
+            self._load().add(fingerprint, digest)
+            self._signatures[digest] = signature
+        try:
+            self.store.put(self._prefix + digest, value)
+        except OSError:
+            pass
+
+    def _hash_bytes(self):
+        return self.hash_size * self.hash_size // 8
+
+    def _load(self):
+        """Builds the BK-tree from the persisted fingerprints (caller holds the lock)."""
+        if self._tree is None:
+            self._tree = BKTree()
+            size = self._hash_bytes()
+            for key, value in self.store.items(self._prefix):
+                digest = key[len(self._prefix):]
+                self._tree.add(int.from_bytes(value[:size], "big"), digest)
+                self._signatures[digest] = value[size:]
+        return self._tree
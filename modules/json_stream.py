@@ -0,0 +1,114 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+def iter_array_items(chunks, key, meta=None):
+    """
+    Yields the elements of the array stored under `key` in a top-level JSON object,
+    decoding one element at a time as the bytes arrive (`chunks`: any iterable of bytes,
+    e.g. response.iter_content()). Only the current element is ever held in memory.
+    The object's other members are stored in `meta` (available once the stream is consumed).
+    Raises ValueError on malformed or truncated JSON.
+    """
+    reader = _StreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.next_char()
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.separator("]"):
+                        break
+        else:
+            value = reader.value()
+            if meta is not None:
+                meta[name] = value
+        if reader.separator("}"):
+            return
+
+class _StreamReader:
+    """Text buffer over a byte stream that only keeps the unconsumed tail."""
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Appends the next chunk (dropping consumed text). False once the stream is exhausted."""
+        if self.eof:
+            return False
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buf += self._utf8.decode(chunk)
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def peek(self):
+        self._skip_whitespace()
+        if self.pos >= len(self.buf):
+            raise ValueError("Unexpected end of JSON stream")
+        return self.buf[self.pos]
+
+    def next_char(self):
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, char):
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+
+    def separator(self, close):
+        """Consumes ',' (False) or the `close` bracket (True); anything else is malformed."""
+        found = self.next_char()
+        if found not in (",", close):
+            raise ValueError(f"Expected ',' or {close!r} in JSON stream, found {found!r}")
+        return found == close
+
+    def _number_may_continue(self, end):
+        """True if the number token starting at self.pos runs into the buffer edge (e.g. '0.', '1e', '-')."""
+        tail = end
+        while tail < len(self.buf) and self.buf[tail] in _NUMBER_CHARS:
+            tail += 1
+        return tail == len(self.buf)
+
+    def value(self):
+        """Decodes the next complete JSON value, pulling more chunks until it is whole."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number whose token reaches the buffer edge may continue in the next chunk
+                # ('[0.' + '5]' must decode 0.5, not 0): hold it back until more data or EOF
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if self.eof or not (is_number and self._number_may_continue(end)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise ValueError("Truncated or malformed JSON stream")
+            self._fill()
@@ -0,0 +1,130 @@
+from collections import deque
+
+class KeywordHit:
+    """One keyword occurrence: the keyword, its category, and [start, end) offsets in the text."""
+    __slots__ = ("keyword", "category", "start", "end")
+
+    def __init__(self, keyword, category, start, end):
+        self.keyword = keyword
+        self.category = category
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"KeywordHit({self.keyword!r}, {self.category!r}, {self.start}, {self.end})"
+
+class KeywordMatcher:
+    """
+    Aho-Corasick Multi-Keyword Automaton
+    Compiles any number of (keyword/phrase, category) pairs into one automaton, then finds
+    every occurrence of every keyword in a single pass over the text - cost grows with the
+    text length (plus the number of hits), not with the size of the keyword list.
+    Matching is case-insensitive, with the same substring semantics as `keyword in text.lower()`;
+    hit offsets index the original text (lowercasing can change a character's length).
+    """
+    def __init__(self, entries=None):
+        # State 0 is the root. Each state: goto edges, failure link, outputs [(keyword, category)]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        # Insertion order of every (keyword, category) pair, for find_keywords
+        self._rank = {}
+        self._max_len = 0
+        self._built = False
+        for keyword, category in (entries or []):
+            self.add(keyword, category)
+
+    def add(self, keyword, category=None):
+        """Adds one keyword (or multi-word phrase) under `category`."""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if (keyword, category) not in self._out[state]:
+            self._out[state].append((keyword, category))
+            self._rank.setdefault((keyword, category), len(self._rank))
+            self._max_len = max(self._max_len, len(keyword))
+        self._built = False
+
+    def add_many(self, keywords, category=None):
+        for keyword in keywords:
+            self.add(keyword, category)
+
+    def build(self):
+        """Computes failure links (BFS) and merges outputs along them."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Suffix keywords end here too (e.g. "prod db" also ends "db")
+                self._out[nxt] = self._out[nxt] + [o for o in self._out[self._fail[nxt]] if o not in self._out[nxt]]
+
+        self._built = True
+
+    def find_all(self, text, categories=None):
+        """Every KeywordHit in `text`, in order of where each hit ends (one pass)."""
+        if not self._built:
+            self.build()
+        if not text:
+            return []
+
+        hits = []
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        # Lowercase one character at a time ("İ" lowers to two characters), remembering which
+        # original character each of the last `_max_len` lowered characters came from
+        origin = deque(maxlen=self._max_len)
+        for index, original in enumerate(text):
+            for ch in original.lower():
+                origin.append(index)
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                for keyword, category in out[state]:
+                    if categories is None or category in categories:
+                        hits.append(KeywordHit(keyword, category, origin[-len(keyword)], index + 1))
+        return hits
+
+    def find_keywords(self, text, categories=None):
+        """
+        First hit of each distinct (keyword, category) pair found in `text`, in the order the
+        keywords were added (callers report findings in their keyword-list order).
+        """
+        seen = {}
+        for hit in self.find_all(text, categories):
+            seen.setdefault((hit.keyword, hit.category), hit)
+        return sorted(seen.values(), key=lambda hit: self._rank[(hit.keyword, hit.category)])
+
+    def contains_any(self, text, categories=None):
+        """True if any keyword (optionally limited to `categories`) occurs in `text`."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in (text or "").lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for _, category in out[state]:
+                if categories is None or category in categories:
+                    return True
+        return False
@@ -0,0 +1,140 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+class TokenState:
+    """Quota bookkeeping for one credential (token=None is the anonymous identity)."""
+    __slots__ = ("token", "remaining", "reset_at", "blocked_until", "level", "last_refill")
+
+    def __init__(self, token, burst):
+        self.token = token
+        self.remaining = None        # Unknown until the first response comes back
+        self.reset_at = 0.0          # Epoch seconds (X-RateLimit-Reset)
+        self.blocked_until = 0.0     # Epoch seconds (Retry-After / exhausted quota)
+        self.level = float(burst)    # Token-bucket fill level
+        self.last_refill = time.time()
+
+    def auth_header(self):
+        return {"Authorization": f"token {self.token}"} if self.token else {}
+
+class RateLimitScheduler:
+    """
+    Rate-Limit-Aware Request Scheduler
+    Every API request first acquires a credential from the pool. A credential with plenty
+    of quota left is used at full speed; only once its remaining quota (X-RateLimit-Remaining)
+    drops to `pace_below` does it become a token bucket whose refill rate spreads what is
+    left over the time until X-RateLimit-Reset, so the last requests of a window last until
+    it resets. Work rotates to the credential with the most quota left, and when every
+    credential is exhausted callers wait (queue) for the earliest reset instead of failing.
+    """
+    def __init__(self, tokens=None, burst=20, max_retries=3, limited_hosts=("api.github.com",), pace_below=100):
+        tokens = [t for t in (tokens or []) if t]
+        self.burst = burst
+        self.pace_below = pace_below
+        self.max_retries = max_retries
+        self.limited_hosts = set(limited_hosts)
+        self.pool = [TokenState(t, burst) for t in tokens] or [TokenState(None, burst)]
+        self.waits = 0
+        self._lock = threading.Lock()
+
+    def applies_to(self, url):
+        """Only the quota-metered API host is scheduled (raw.githubusercontent.com is not)."""
+        return urlparse(url).hostname in self.limited_hosts
+
+    def acquire(self):
+        """Blocks until some credential may send a request, then returns its TokenState."""
+        while True:
+            with self._lock:
+                now = time.time()
+                best, wait = None, None
+                for state in self.pool:
+                    self._refill(state, now)
+                    ready_in = self._ready_in(state, now)
+                    if ready_in <= 0:
+                        if best is None or self._quota(best) < self._quota(state):
+                            best = state
+                    elif wait is None or ready_in < wait:
+                        wait = ready_in
+
+                if best is not None:
+                    best.level -= 1
+                    if best.remaining is not None:
+                        best.remaining -= 1
+                    return best
+                self.waits += 1
+
+            if wait > 5:
+                print(f"[DEBUG] Rate limit: all {len(self.pool)} credential(s) exhausted. Queued for {wait:.0f}s...")
+            time.sleep(min(wait, 60))
+
+    def update(self, state, response):
+        """
+        Feeds a response's rate-limit headers back into the credential's state.
+        Returns the number of seconds to back off before retrying, or None if the
+        response was not rate-limited.
+        """
+        headers = response.headers
+        now = time.time()
+
+        with self._lock:
+            if headers.get("X-RateLimit-Remaining") is not None:
+                try:
+                    state.remaining = int(headers["X-RateLimit-Remaining"])
+                    state.reset_at = float(headers.get("X-RateLimit-Reset", state.reset_at))
+                except ValueError:
+                    pass
+
+            if response.status_code not in (403, 429):
+                return None
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                # Secondary (abuse) limit: the server tells us exactly how long to back off
+                try:
+                    backoff = float(retry_after)
+                except ValueError:
+                    backoff = 60.0
+            elif state.remaining == 0:
+                # Primary limit: this credential is out until its window resets
+                backoff = max(1.0, state.reset_at - now)
+            else:
+                return None # A plain 403 (private repo, forbidden) - not a rate limit
+
+            state.blocked_until = now + backoff
+            return backoff
+
+    def _refill(self, state, now):
+        if state.remaining is not None and state.reset_at and now >= state.reset_at:
+            state.remaining = None # Window rolled over; the next response reports the new quota
+        elapsed = now - state.last_refill
+        state.last_refill = now
+        if not self._paced(state, now):
+            state.level = float(self.burst) # Plenty of quota: the bucket never runs dry
+            return
+        state.level = min(self._capacity(state), state.level + elapsed * self._rate(state, now))
+
+    def _paced(self, state, now):
+        """True once this credential is low on quota for the current window."""
+        return state.remaining is not None and state.reset_at > now and state.remaining <= self.pace_below
+
+    def _rate(self, state, now):
+        """Requests/second a low credential can sustain until its quota window resets."""
+        return max(state.remaining, 0) / max(1.0, state.reset_at - now)
+
+    def _capacity(self, state):
+        return float(max(1, min(self.burst, state.remaining)))
+
+    def _ready_in(self, state, now):
+        """Seconds until this credential may send again (<= 0 means now)."""
+        if state.blocked_until > now:
+            return state.blocked_until - now
+        if state.remaining is not None and state.remaining <= 0 and state.reset_at > now:
+            return state.reset_at - now
+        if not self._paced(state, now) or state.level >= 1:
+            return 0
+        rate = self._rate(state, now)
+        return (1 - state.level) / rate if rate > 0 else max(1.0, state.reset_at - now)
+
+    def _quota(self, state):
+        # Unknown quota sorts first so every credential gets probed early
+        return float("inf") if state.remaining is None else state.remaining
@@ -1,8 +1,57 @@
-import requests
-import re
+import codecs
+import hashlib
+import mmap
+import multiprocessing
+import os
+import tarfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from modules.http_client import HttpClient
+from modules.secret_detector import default_detector
+from modules.findings import Finding, Severity, as_dict
+from modules.repo_state import RepoScanState
+from modules.blob_index import BlobIndex
+from modules.json_stream import iter_array_items
+from modules.gitignore import GitIgnore
+
+def _scan_mapped(file_path, max_file_bytes):
+    """Secret hits [(signature, line, masked value)] for one local file, read via mmap (binaries skipped)."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if b"\x00" in mapped[:8192]:
+                return []
+            endpos = min(len(mapped), max_file_bytes) if max_file_bytes else None
+            return [(match.signature, line, match.masked()) for match, line in default_detector.scan_buffer(mapped, endpos)]
+
+def _scan_local_chunk(root, paths, max_file_bytes):
+    """Process-pool job: [(path, hits)] for a batch of repo-relative paths (unreadable files -> no hits)."""
+    results = []
+    for path in paths:
+        try:
+            hits = _scan_mapped(os.path.join(root, path), max_file_bytes)
+        except (OSError, ValueError):
+            hits = []
+        results.append((path, hits))
+    return results
 
 class RepoScanner:
-    def __init__(self, repo_url, github_token=None):
+    # Concurrent content fetches / subtree listings per scan (batch mode sizes its shared pool from this)
+    FETCH_WORKERS = 8
+
+    def __init__(self, repo_url, github_token=None, client=None, max_fetches=50, fetch_time_budget=None, fetch_workers=FETCH_WORKERS,
+                 incremental=True, max_file_bytes=1024 * 1024, max_scan_bytes=256 * 1024 * 1024, local_workers=None):
+        # Local Checkout Mode: `repo_url` is a directory on this machine (see scan_local)
+        self.local_path = os.path.abspath(repo_url) if os.path.isdir(repo_url) else None
+        self.local_workers = max(1, local_workers or os.cpu_count() or 1)
+        # Worker processes cost ~0.2s each to spawn, so small checkouts are scanned inline: the pool
+        # is only used past `local_pool_bytes` of candidate content, in batches of ~`local_batch_bytes`
+        self.local_pool_bytes = 32 * 1024 * 1024
+        self.local_batch_bytes = 8 * 1024 * 1024
+
         self.repo_url = repo_url.strip("/")
         # Extract Owner and Repo Name safely
         try:
@@ -17,55 +66,40 @@ class RepoScanner:
         self.headers = {"Authorization": f"token {github_token}"} if github_token else {}
         self.token_present = bool(github_token)
 
-        # Content Regex Patterns (The "Deep Scan" Logic)
-        self.secret_patterns = {
-            "AWS Access Key": r"AKIA[0-9A-Z]{16}",
-            "Google API Key": r"AIza[0-9A-Za-z-_]{35}",
-            "Generic Password": r"(password|passwd|pwd|secret)[\s]*[=:]+[\s]*['\"][^\n]+['\"]",
-            "Private Key": r"-----BEGIN [A-Z]+ PRIVATE KEY-----",
-            "Slack Token": r"xox[baprs]-([0-9a-zA-Z]{10,48})"
-        }
+        # Shared connection pool (batch mode passes one client to every scanner)
+        self.client = client or HttpClient()
 
-    def scan_repo(self):
-        findings = []
-        
-        # 1. Validation
-        if not self.owner or not self.repo:
-            return [{"type": "Error", "data": "Invalid GitHub URL format.", "risk_level": "Low"}]
+        # Shared anchored secret engine (same signatures as CodeMiner)
+        self.detector = default_detector
 
-        print(f"[DEBUG] Target Repository: {self.owner}/{self.repo}")
+        # API roots (overridable so a local stand-in can serve trees/archives/raw files)
+        self.api_base = "https://api.github.com"
+        self.raw_base = "https://raw.githubusercontent.com"
 
-        # 2. Branch Detection Strategy
-        files = []
-        branch_used = "main"
-        
-        # Try 'main'
-        api_url = f"https://api.github.com/repos/{self.owner}/{self.repo}/git/trees/main?recursive=1"
-        resp = requests.get(api_url, headers=self.headers)
-        
-        if resp.status_code == 200:
-            files = resp.json().get('tree', [])
-            branch_used = "main"
-        elif resp.status_code == 404:
-            # Fallback to 'master'
-            print("[DEBUG] 'main' branch not found. Trying 'master'...")
-            api_url = f"https://api.github.com/repos/{self.owner}/{self.repo}/git/trees/master?recursive=1"
-            resp = requests.get(api_url, headers=self.headers)
-            if resp.status_code == 200:
-                files = resp.json().get('tree', [])
-                branch_used = "master"
+        # Content-fetch budget: at most `max_fetches` raw requests, `fetch_workers` in
+        # parallel, optionally stopped after `fetch_time_budget` seconds
+        self.max_fetches = max_fetches
+        self.fetch_time_budget = fetch_time_budget
+        self.fetch_workers = max(1, fetch_workers)
 
-        # 3. Handle API Errors
-        if resp.status_code == 403:
-             return [{"type": "API Limit", "data": "GitHub Rate Limit Exceeded. Use a Token!", "risk_level": "Low"}]
-        
-        if not files:
-             return [{"type": "Access Denied", "data": "Could not access file tree. Repo might be Private.", "risk_level": "Low"}]
+        # Incremental rescans: unchanged trees and unchanged blobs reuse the last scan's results
+        self.state = RepoScanState.shared() if incremental else None
+        # Identical blobs across repos (vendored code, forks) are fetched and scanned once
+        self.blob_index = BlobIndex.shared(self.detector.version) if incremental else None
+
+        # Archive mode skips members larger than this (minified bundles, datasets)
+        self.max_archive_member_bytes = 2 * 1024 * 1024
 
-        print(f"[DEBUG] Successfully scanned branch: '{branch_used}' ({len(files)} files found)")
+        # Content is streamed through the detector in chunks: reading stops after
+        # `max_file_bytes` per file, and a whole scan reads at most `max_scan_bytes` (0 = no cap)
+        self.chunk_bytes = 64 * 1024
+        self.max_file_bytes = max_file_bytes
+        self.max_scan_bytes = max_scan_bytes
+        self._scanned_bytes = 0
+        self._budget_lock = threading.Lock()
 
-        # 4. Define Suspicious Filenames
-        suspicious_files = {
+        # Suspicious Filenames
+        self.suspicious_files = {
             ".env": "Environment Config (High Risk)",
             "config.py": "Configuration File",
             "secrets.json": "Secrets File",
@@ -77,76 +111,628 @@ class RepoScanner:
             "ftp": "FTP Configuration folder"
         }
 
-        # 5. SCANNING LOOP
-        count_scanned_content = 0
+        # Fetch-ranking weights (higher = fetched earlier)
+        self.fetch_ext_weights = {
+            ".env": 60, ".pem": 50, ".key": 50, ".json": 20, ".yml": 20, ".yaml": 20,
+            ".php": 15, ".py": 15, ".sh": 15, ".xml": 10, ".js": 5, ".txt": 5
+        }
+        self.fetch_keywords = ["secret", "credential", "cred", "password", "token", "key", "config", "settings", "auth"]
+
+        # Streaming callback for the scan in progress (see scan_repo)
+        self._on_finding = None
+
+    def scan_repo(self, on_finding=None):
+        """
+        Tree scan + prioritized content fetches. `on_finding` (optional) is called with each
+        finding as soon as it is produced (content findings in fetch-completion order);
+        the returned list keeps the deterministic tree/rank order.
+        """
+        self._on_finding = on_finding
+        self._scanned_bytes = 0
+        findings = []
         
-        for file in files:
+        # 1. Validation
+        if not self.owner or not self.repo:
+            return self._report([], [{"type": "Error", "data": "Invalid GitHub URL format.", "risk_level": "Low"}])
+
+        print(f"[DEBUG] Target Repository: {self.owner}/{self.repo}")
+
+        # 2. Branch Resolution (default branch from the repo metadata, commit + tree SHA from its head)
+        branch_used, commit_sha, tree_sha, resp = self._resolve_branch()
+
+        # 3. Handle API Errors
+        if resp.status_code == 403:
+             return self._report([], [{"type": "API Limit", "data": "GitHub Rate Limit Exceeded. Use a Token!", "risk_level": "Low"}])
+        
+        if not branch_used:
+             return self._report([], [{"type": "Access Denied", "data": "Could not access file tree. Repo might be Private.", "risk_level": "Low"}])
+
+        # 4. Incremental Check (same tree as the last complete scan -> no listing, nothing to fetch)
+        state_key = f"{self.api_base}/{self.owner}/{self.repo}@{branch_used}"
+        previous = self.state.load(state_key, self.detector.version) if self.state else None
+        if previous and tree_sha and previous["tree_sha"] == tree_sha:
+            print(f"[DEBUG] Tree {tree_sha[:7]} unchanged since last scan. Reusing {len(previous['findings'])} findings.")
+            return self._report(findings, [Finding.from_dict(item) for item in previous["findings"]])
+
+        # 5. SCANNING LOOP (Metadata pass over every path, as the listing streams in)
+        candidates = []
+        blob_shas = {}
+        blob_sizes = {}
+        seen = set()
+        meta = {}
+        complete = True
+        tree_ref = tree_sha or branch_used
+
+        try:
+            count_files = self._collect(self._list_tree(tree_ref, meta, recursive=True), findings, candidates, blob_shas, blob_sizes, seen)
+        except (ValueError, OSError) as e:
+            count_files = len(seen)
+            complete = False
+            self._report(findings, [{"type": "Error", "data": f"File tree listing interrupted: {e}", "risk_level": "Low"}])
+
+        if meta.get("status") == 403:
+             return self._report([], [{"type": "API Limit", "data": "GitHub Rate Limit Exceeded. Use a Token!", "risk_level": "Low"}])
+        if not count_files:
+             return self._report([], [{"type": "Access Denied", "data": "Could not access file tree. Repo might be Private.", "risk_level": "Low"}])
+        tree_sha = tree_sha or meta.get("sha")
+
+        # E. Truncated listing (huge monorepos): list the directories one level at a time instead
+        if meta.get("truncated"):
+            print(f"[DEBUG] Tree listing truncated at {count_files} entries. Walking subtrees ({self.fetch_workers} in parallel)...")
+            walk = {"failed": 0}
+            try:
+                count_files += self._collect(self._walk_subtrees(tree_ref, walk), findings, candidates, blob_shas, blob_sizes, seen, skip_seen=True)
+            except (ValueError, OSError) as e:
+                walk["failed"] += 1
+                print(f"[DEBUG] Subtree walk stopped: {e}")
+            if walk["failed"]:
+                complete = False
+                self._report(findings, [{"type": "Error", "data": f"{walk['failed']} directories could not be listed; the scan may be incomplete.", "risk_level": "Low"}])
+        seen = None
+
+        print(f"[DEBUG] Successfully scanned branch: '{branch_used}' ({count_files} files found)")
+
+        # D. Blobs whose SHA hasn't moved keep their previous content findings (no fetch), as long
+        #    as they were read as far as this scan would read them (see _covers)
+        reused = {}
+        if previous:
+            for path in candidates:
+                entry = previous["blobs"].get(path)
+                if not entry or not blob_shas[path]:
+                    continue
+                sha, result, cap = (list(entry) + [None])[:3] # entries saved before verdicts were recorded are whole reads
+                if sha == blob_shas[path] and self._covers(cap):
+                    reused[path] = ([Finding.from_dict(item) for item in result], cap)
+
+        # 6. DEEP CONTENT SCAN (highest-risk files first, fetched in parallel; raw files are read at
+        #    the head commit so they match the listed blob SHAs even if the branch moves meanwhile)
+        content_findings, scanned, caps, unverified = self._fetch_prioritized(candidates, commit_sha or branch_used, reused, blob_shas,
+                                                                     blob_sizes, pinned=bool(commit_sha))
+        findings.extend(content_findings)
+
+        if not findings:
+             self._report(findings, [{"type": "Info", "data": f"Scan completed on '{branch_used}'. No obvious secrets found.", "risk_level": "Low"}])
+
+        # 7. Save state for the next rescan (the tree only counts as done if every candidate was
+        #    covered and verified - files cut off by `max_file_bytes` or the binary sniff are stored
+        #    with that verdict and count as covered; content that didn't match its blob is refetched)
+        if self.state:
+            blobs = {path: (blob_shas[path], [as_dict(f) for f in result], caps[path])
+                     for path, result in scanned.items() if blob_shas[path] and path not in unverified}
+            complete = complete and len(scanned) == len(candidates) and not unverified
+            self.state.save(state_key, self.detector.version, tree_sha if complete else None,
+                            [as_dict(f) for f in findings], blobs)
+
+        return findings
+
+    def scan_archive(self, ref=None, on_finding=None):
+        """
+        Archive Mode: downloads the repository tarball ONCE and streams every member
+        straight into the secret detector (nothing is extracted to disk).
+        One transfer covers the whole repo, so there is no per-file cap.
+        `on_finding` works as in scan_repo().
+        """
+        self._on_finding = on_finding
+        self._scanned_bytes = 0
+        findings = []
+
+        # 1. Validation
+        if not self.owner or not self.repo:
+            return self._report([], [{"type": "Error", "data": "Invalid GitHub URL format.", "risk_level": "Low"}])
+
+        print(f"[DEBUG] Target Repository (archive): {self.owner}/{self.repo}")
+
+        # 2. Request the tarball (no ref = default branch)
+        archive_url = f"{self.api_base}/repos/{self.owner}/{self.repo}/tarball"
+        if ref:
+            archive_url += f"/{ref}"
+
+        try:
+            resp = self.client.get(archive_url, headers=self.headers, stream=True, timeout=30)
+        except Exception as e:
+            return self._report([], [{"type": "Error", "data": f"Archive download failed: {e}", "risk_level": "Low"}])
+
+        # 3. Handle API Errors
+        if resp.status_code == 403:
+            return self._report([], [{"type": "API Limit", "data": "GitHub Rate Limit Exceeded. Use a Token!", "risk_level": "Low"}])
+        if resp.status_code != 200:
+            return self._report([], [{"type": "Access Denied", "data": f"Could not download repository archive (HTTP {resp.status_code}).", "risk_level": "Low"}])
+
+        # 4. STREAMING LOOP (members are read in archive order, straight off the socket)
+        count_files = 0
+        count_scanned_content = 0
+        budget_spent = False
+        resp.raw.decode_content = True
+
+        try:
+            with tarfile.open(fileobj=resp.raw, mode="r|*") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+
+                    # Strip the '<owner>-<repo>-<sha>/' prefix GitHub adds to every member
+                    path = member.name.split("/", 1)[-1]
+                    count_files += 1
+
+                    self._report(findings, self._check_path(path))
+
+                    if not budget_spent and self._is_interesting_file(path) and member.size <= self.max_archive_member_bytes:
+                        member_file = archive.extractfile(member)
+                        scanned = self._scan_stream(iter(lambda: member_file.read(self.chunk_bytes), b""))
+                        if scanned is None:
+                            budget_spent = True
+                            self._report(findings, [{"type": "Info", "data": f"Scan byte budget reached after {count_scanned_content} files; remaining content was not scanned.", "risk_level": "Low"}])
+                            continue
+                        self._report(findings, self._secret_findings(path, scanned[0]))
+                        count_scanned_content += 1
+        except (tarfile.TarError, EOFError) as e:
+            self._report(findings, [{"type": "Error", "data": f"Archive stream ended early: {e}", "risk_level": "Low"}])
+        finally:
+            resp.close()
+
+        print(f"[DEBUG] Archive streamed: {count_files} files, {count_scanned_content} scanned for secrets ({self._scanned_bytes // 1024} KB)")
+
+        if not findings:
+             self._report(findings, [{"type": "Info", "data": f"Archive scan completed ({count_files} files). No obvious secrets found.", "risk_level": "Low"}])
+
+        return findings
+
+    def scan_local(self, on_finding=None):
+        """
+        Local Checkout Mode: walks a working tree on disk instead of the GitHub API.
+        Paths ignored by .gitignore (and .git itself) are skipped, every path gets the same
+        sensitive-name/directory checks as a remote scan, and candidate files are memory-mapped
+        into the detector - inline for a typical checkout, across a process pool once there is
+        enough content to pay for the worker start-up. Same findings format as scan_repo().
+        """
+        self._on_finding = on_finding
+        findings = []
+        root = self.local_path
+
+        print(f"[DEBUG] Target Repository (local): {root}")
+
+        # 1. WALK (gitignore-aware, sorted so output is stable)
+        ignore = GitIgnore(root)
+        candidates = []
+        sizes = {}
+        count_files = 0
+        for current, dirs, files in os.walk(root):
+            rel_dir = os.path.relpath(current, root).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir
+            prefix = rel_dir + "/" if rel_dir else ""
+            if rel_dir:
+                ignore.load(rel_dir)
+
+            dirs[:] = sorted(d for d in dirs if d != ".git" and not ignore.ignored(prefix + d, is_dir=True))
+            for d in dirs:
+                self._report(findings, self._check_path(prefix + d))
+
+            for name in sorted(files):
+                path = prefix + name
+                if ignore.ignored(path) or not os.path.isfile(os.path.join(current, name)):
+                    continue
+                count_files += 1
+
+                # A/B. Metadata Scan (Filename + Directory Check)
+                self._report(findings, self._check_path(path))
+
+                # C. Content-scan candidates (same selection as remote scans)
+                if self._is_interesting_file(path) or self._match_suspicious(path):
+                    candidates.append(path)
+                    try:
+                        size = os.path.getsize(os.path.join(current, name))
+                    except OSError:
+                        size = 0
+                    sizes[path] = min(size, self.max_file_bytes) if self.max_file_bytes else size
+
+        # 2. CONTENT SCAN (mmap + bytes regex; batches of ~local_batch_bytes, spread over worker
+        #    processes only when the total is worth the spawn cost)
+        results = {}
+        total_bytes = sum(sizes.values())
+        batches = [[]]
+        batch_bytes = 0
+        for path in candidates:
+            if batches[-1] and batch_bytes + sizes[path] > self.local_batch_bytes:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(path)
+            batch_bytes += sizes[path]
+        workers = min(self.local_workers, len(batches))
+        if total_bytes < self.local_pool_bytes or workers <= 1:
+            scanned = _scan_local_chunk(root, candidates, self.max_file_bytes)
+        else:
+            scanned = []
+            # Spawn, not fork: scan_local often runs on a pillar thread beside other live threads
+            spawn = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as pool:
+                futures = [pool.submit(_scan_local_chunk, root, batch, self.max_file_bytes) for batch in batches]
+                for future in as_completed(futures):
+                    scanned.extend(future.result())
+        for path, hits in scanned:
+            results[path] = self._secret_findings(path, hits)
+            if self._on_finding:
+                for finding in results[path]:
+                    self._on_finding(finding)
+
+        # Merge in walk order so output is deterministic regardless of completion order
+        for path in candidates:
+            findings.extend(results.get(path, []))
+
+        mode = f"{workers} worker processes" if workers > 1 and total_bytes >= self.local_pool_bytes else "inline"
+        print(f"[DEBUG] Local scan: {count_files} files, {len(candidates)} scanned for secrets ({total_bytes // 1024} KB, {mode})")
+
+        if not findings:
+             self._report(findings, [{"type": "Info", "data": f"Local scan completed ({count_files} files). No obvious secrets found.", "risk_level": "Low"}])
+
+        return findings
+
+    def _resolve_branch(self):
+        """
+        Returns (branch, commit SHA, tree SHA, last response). The default branch comes from the
+        repo metadata and its head commit + tree SHA from the branch: two small ETag-revalidated
+        calls that let an unchanged tree skip the listing. Falls back to trying 'main' then 'master'
+        if the metadata can't be read. Branch is None when neither resolves.
+        """
+        repo_url = f"{self.api_base}/repos/{self.owner}/{self.repo}"
+        resp = self.client.get(repo_url, headers=self.headers, cached=True)
+        if resp.status_code in (403, 404):
+            return None, None, None, resp
+
+        default_branch = resp.json().get("default_branch") if resp.status_code == 200 else None
+        for branch in [default_branch] if default_branch else ["main", "master"]:
+            resp = self.client.get(f"{repo_url}/branches/{branch}", headers=self.headers, cached=True)
+            if resp.status_code == 200:
+                commit = resp.json().get("commit") or {}
+                return branch, commit.get("sha"), ((commit.get("commit") or {}).get("tree") or {}).get("sha"), resp
+            if resp.status_code != 404:
+                break
+            print(f"[DEBUG] '{branch}' branch not found.")
+        return None, None, None, resp
+
+    def _list_tree(self, tree_ref, meta, recursive=False):
+        """
+        Yields the entries of a git tree listing, parsed incrementally off the socket so a
+        multi-megabyte response never sits in memory whole. `meta` receives the HTTP status
+        and the listing's other fields ('sha', 'truncated') once the stream is consumed.
+        """
+        api_url = f"{self.api_base}/repos/{self.owner}/{self.repo}/git/trees/{tree_ref}"
+        if recursive:
+            api_url += "?recursive=1"
+        resp = self.client.get(api_url, headers=self.headers, stream=True, timeout=30)
+        meta["status"] = resp.status_code
+        try:
+            if resp.status_code == 200:
+                yield from iter_array_items(resp.iter_content(chunk_size=64 * 1024), "tree", meta)
+        finally:
+            resp.close()
+
+    def _walk_subtrees(self, tree_ref, walk):
+        """
+        Truncation fallback: lists every directory non-recursively, `fetch_workers` listings
+        in flight, and yields the entries (paths made repo-relative) in breadth-first order.
+        Directories that fail to list are counted in walk['failed'].
+        """
+        def list_dir(ref, prefix):
+            meta = {}
+            entries = []
+            for entry in self._list_tree(ref, meta):
+                entry["path"] = prefix + entry["path"]
+                entries.append(entry)
+            return entries if meta["status"] == 200 else None
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            queue = deque([pool.submit(list_dir, tree_ref, "")])
+            while queue:
+                try:
+                    entries = queue.popleft().result()
+                except (ValueError, OSError):
+                    entries = None
+                if entries is None:
+                    walk["failed"] += 1
+                    continue
+                for entry in entries:
+                    if entry.get("type") == "tree":
+                        queue.append(pool.submit(list_dir, entry["sha"], entry["path"] + "/"))
+                    yield entry
+
+    def _collect(self, entries, findings, candidates, blob_shas, blob_sizes, seen, skip_seen=False):
+        """
+        Metadata pass over tree entries: path checks are reported immediately and content
+        candidates are collected (only their paths + blob SHAs and sizes are kept). Returns the count.
+        `seen` records the paths handled (with skip_seen, paths already in it are ignored).
+        """
+        count = 0
+        for file in entries:
             path = file['path']
+            if skip_seen:
+                if path in seen:
+                    continue
+            else:
+                seen.add(path)
+            count += 1
             
-            # A. Metadata Scan (Filename Check)
-            for filename, desc in suspicious_files.items():
-                if path.endswith(filename) or path == filename:
-                    findings.append({
-                        "type": "Vulnerable File", 
-                        "data": f"Found sensitive file: {path} ({desc})", 
-                        "risk_level": "High"
-                    })
-            
-            # B. Specific Directory Check
-            if "ftp/" in path or "backup/" in path:
-                findings.append({
-                        "type": "Exposed Directory", 
-                        "data": f"Sensitive Directory Found: {path}", 
-                        "risk_level": "Medium"
-                    })
-
-            # C. DEEP CONTENT SCAN (New Feature)
-            # We scan the content of specific code files for hardcoded secrets.
-            # We limit this to avoiding checking images/binaries.
-            if self._is_interesting_file(path) and count_scanned_content < 20: 
-                # Limit to 20 files per scan to prevent freezing/rate-limits in demo
-                secret_finding = self._scan_file_content(path, branch_used)
-                if secret_finding:
-                    findings.extend(secret_finding)
-                count_scanned_content += 1
+            # A/B. Metadata Scan (Filename + Directory Check)
+            self._report(findings, self._check_path(path))
 
-        if not findings:
-             findings.append({"type": "Info", "data": f"Scan completed on '{branch_used}'. No obvious secrets found.", "risk_level": "Low"})
+            # C. Collect content-scan candidates (images/binaries are skipped)
+            if file.get('type', 'blob') == 'blob' and (self._is_interesting_file(path) or self._match_suspicious(path)):
+                candidates.append(path)
+                blob_shas[path] = file.get('sha')
+                blob_sizes[path] = file.get('size')
+        return count
+
+    def _check_path(self, path):
+        """Metadata checks that only need the file path (sensitive names, exposed directories)."""
+        findings = []
+
+        # A. Metadata Scan (Filename Check)
+        for filename, desc in self.suspicious_files.items():
+            if path.endswith(filename) or path == filename:
+                findings.append(Finding("Vulnerable File", f"Found sensitive file: {path} ({desc})", Severity.HIGH,
+                                        source="repo_scanner", location=path, signature=filename))
+
+        # B. Specific Directory Check
+        if "ftp/" in path or "backup/" in path:
+            findings.append(Finding("Exposed Directory", f"Sensitive Directory Found: {path}", Severity.MEDIUM,
+                                    source="repo_scanner", location=path))
+
+        return findings
+
+    def _match_suspicious(self, path):
+        """Returns the description of the matching suspicious filename, or None."""
+        for filename, desc in self.suspicious_files.items():
+            if path.endswith(filename) or path == filename:
+                return desc
+        return None
 
+    def _report(self, findings, new):
+        """Adds `new` findings to `findings` and hands each to the streaming callback, if any."""
+        for finding in new:
+            findings.append(finding)
+            if self._on_finding:
+                self._on_finding(finding)
         return findings
 
+    def _fetch_priority(self, path):
+        """
+        Ranks a candidate path by how likely it is to hold secrets.
+        Known sensitive names > risky extensions/keywords, and shallow paths beat deep ones.
+        """
+        score = 0
+        name = path.rsplit("/", 1)[-1].lower()
+        ext = os.path.splitext(name)[1] or name
+
+        # 1. Known sensitive filenames (the suspicious_files table)
+        if self._match_suspicious(path):
+            score += 100
+
+        # 2. Extension weight
+        score += self.fetch_ext_weights.get(ext, 0)
+
+        # 3. Secret-ish words in the file name
+        if any(word in name for word in self.fetch_keywords):
+            score += 30
+
+        # 4. Depth penalty (vendored / generated code tends to be deeply nested)
+        depth = path.count("/")
+        score -= 3 * depth
+
+        # 5. Obvious noise
+        if any(part in path for part in ("test/", "tests/", "docs/", "examples/", "dist/", ".min.")):
+            score -= 25
+
+        return score
+
+    def _fetch_prioritized(self, candidates, ref, reused=None, blob_shas=None, blob_sizes=None, pinned=False):
+        """
+        Bounded-concurrency fetch queue: candidates are ranked by `_fetch_priority`,
+        the top `max_fetches` are fetched `fetch_workers` at a time (best first), and
+        anything still queued when `fetch_time_budget` runs out is dropped.
+        `reused` ({path: (findings, cap)} from an earlier scan) is merged in without fetching, as
+        is any blob (`blob_shas`: path -> sha) already in the global blob index. Paths
+        sharing a blob in this tree are fetched once.
+        Every result carries its read verdict ("cap", see _scan_stream): None for a whole read,
+        the `max_file_bytes` it was cut at, or "binary". A result is only written to the blob
+        index if it is known to belong to that SHA: a whole read hashed to it (`blob_sizes` gives
+        the git object header), or `ref` is the commit the SHAs were listed at (`pinned`) - the
+        only way to vouch for a file that was not read to the end.
+        Returns (findings in rank order, {path: findings} for every covered candidate,
+        {path: cap} for the same paths, set of covered paths whose content could not be verified).
+        """
+        findings = []
+        reused = reused or {}
+        blob_shas = blob_shas or {}
+        blob_sizes = blob_sizes or {}
+        ranked = sorted(candidates, key=lambda p: (-self._fetch_priority(p), p))
+        deadline = time.monotonic() + self.fetch_time_budget if self.fetch_time_budget else None
+
+        # 1. Resolve what needs no fetch: unchanged paths, then blobs known from any repo
+        results = {path: result for path, (result, cap) in reused.items()}
+        caps = {path: cap for path, (result, cap) in reused.items()}
+        sharing = {}  # blob sha -> paths with that content (first one is fetched)
+        to_fetch = []
+        indexed = 0
+        for path in ranked:
+            if path in reused:
+                continue
+            sha = blob_shas.get(path)
+            if sha in sharing:
+                sharing[sha].append(path)
+                continue
+            known = self.blob_index.get(sha) if sha and self.blob_index else None
+            if known is not None and self._covers(known[1]):
+                results[path] = self._secret_findings(path, known[0])
+                caps[path] = known[1]
+                indexed += 1
+                continue
+            if sha:
+                sharing[sha] = [path]
+            to_fetch.append(path)
+        queue = to_fetch[:self.max_fetches] if self.max_fetches else to_fetch
+
+        if self._on_finding:
+            for path in ranked:
+                for finding in results.get(path, []):
+                    self._on_finding(finding)
+
+        fetched = 0
+        unverified = set()
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            # Executor runs jobs FIFO, so submitting in rank order fetches best-first
+            futures = {pool.submit(self._scan_file_content, path, ref, blob_shas.get(path), blob_sizes.get(path)): path
+                       for path in queue}
+            pending = set(futures)
+
+            while pending:
+                timeout = max(0, deadline - time.monotonic()) if deadline else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = futures[future]
+                    scanned = future.result()
+                    if scanned is None:
+                        continue # Fetch failed: not covered, retried on the next scan
+                    hits, cap, verified = scanned
+                    fetched += 1
+                    sha = blob_shas.get(path)
+                    trusted = verified if verified is not None else pinned
+                    if verified is False:
+                        print(f"[DEBUG] '{path}' did not hash to blob {sha[:7] if sha else '?'}; not cached.")
+                    if trusted and sha and self.blob_index:
+                        self.blob_index.put(sha, hits, cap)
+                    for same in sharing.get(sha, [path]):
+                        if not trusted:
+                            unverified.add(same)
+                        results[same] = self._secret_findings(same, hits)
+                        caps[same] = cap
+                        if self._on_finding:
+                            for finding in results[same]:
+                                self._on_finding(finding)
+
+                if deadline and time.monotonic() >= deadline:
+                    for future in pending:
+                        future.cancel()
+                    break
+
+        # Merge in rank order so output is deterministic regardless of completion order
+        for path in ranked:
+            findings.extend(results.get(path, []))
+
+        print(f"[DEBUG] Content scan: {fetched}/{len(to_fetch)} candidate files fetched, "
+              f"{len(reused)} unchanged since last scan, {indexed} known from the blob index, {self._scanned_bytes // 1024} KB streamed "
+              f"(budget: {self.max_fetches or 'unlimited'} requests, {self.fetch_time_budget or 'no'} time limit)")
+        return findings, results, caps, unverified
+
+    def _covers(self, cap):
+        """
+        True if an earlier read with verdict `cap` scanned everything this scanner would:
+        whole reads and binary verdicts always do, a truncated read only at the same `max_file_bytes`.
+        """
+        return cap is None or cap == "binary" or cap == self.max_file_bytes
+
     def _is_interesting_file(self, path):
         """Returns True if we should read the text content of this file."""
         exts = [".py", ".js", ".json", ".env", ".txt", ".php", ".yml", ".xml", ".sh"]
         return any(path.endswith(e) for e in exts) and "node_modules" not in path
 
-    def _scan_file_content(self, file_path, branch):
+    def _scan_file_content(self, file_path, ref, blob_sha=None, blob_size=None):
         """
-        Fetches the raw text of the file and runs Regex for secrets.
-        Uses raw.githubusercontent.com to bypass some API JSON limits.
+        Streams the raw file through the secret detector (see _scan_stream), so scanning
+        starts with the first chunk and memory stays bounded on any file size.
+        Uses raw.githubusercontent.com to bypass some API JSON limits. `ref` is a commit SHA
+        or branch name; with `blob_sha`/`blob_size` the bytes are checked against the blob.
+        Returns (secret hits, read verdict, hashed to blob_sha? (None if unchecked)), or None
+        if the file could not be fetched or the per-scan budget ran out.
         """
-        findings = []
-        # Construct Raw URL (e.g., https://raw.githubusercontent.com/owner/repo/main/file.py)
-        raw_url = f"https://raw.githubusercontent.com/{self.owner}/{self.repo}/{branch}/{file_path}"
+        # Construct Raw URL (e.g., https://raw.githubusercontent.com/owner/repo/<commit>/file.py)
+        raw_url = f"{self.raw_base}/{self.owner}/{self.repo}/{ref}/{file_path}"
         
         try:
             # We use a standard request here (no auth headers needed for public raw files)
-            response = requests.get(raw_url, timeout=3)
-            
-            if response.status_code == 200:
-                content = response.text
-                
-                for secret_name, pattern in self.secret_patterns.items():
-                    matches = re.findall(pattern, content)
-                    for match in matches:
-                        # Mask the secret for display
-                        masked = match[:4] + "..." if len(match) > 5 else "HIDDEN"
-                        findings.append({
-                            "type": "Hardcoded Secret", 
-                            "data": f"{secret_name} found in '{file_path}': {masked}", 
-                            "risk_level": "CRITICAL"
-                        })
+            response = self.client.get(raw_url, timeout=3, stream=True)
+            try:
+                if response.status_code != 200:
+                    return None
+                return self._scan_stream(response.iter_content(chunk_size=self.chunk_bytes), blob_sha, blob_size)
+            finally:
+                response.close()
         except:
-            pass # Fail silently on network errors to keep scan moving
-            
-        return findings
\ No newline at end of file
+            return None # Fail silently on network errors to keep scan moving
+
+    def _scan_stream(self, byte_chunks, blob_sha=None, blob_size=None):
+        """
+        Runs byte chunks through the detector's overlapping-window scan:
+        1. Binary sniff - a NUL byte in the first 8 KB means binary: nothing is scanned.
+        2. Per-file cap - reading stops after `max_file_bytes`.
+        3. Per-scan budget - every chunk is charged to `max_scan_bytes`.
+        4. Blob check - with `blob_sha` and `blob_size`, the bytes are hashed as a git blob
+           object (sha1 of "blob <size>\0" + content) on the way through.
+        Returns (path-independent hits [(signature, line, masked value)], cap, verified), where
+        `cap` is the read verdict - None if the whole content was scanned, "binary" if the sniff
+        skipped it, or the `max_file_bytes` it was cut at - and `verified` says whether a whole
+        read hashed to `blob_sha` (None when not checked); or None if the per-scan budget ran out first.
+        """
+        status = {"spent": False, "cap": None}
+        digest = hashlib.sha1(b"blob %d\0" % blob_size) if blob_sha and blob_size is not None else None
+
+        def text_chunks():
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+            read = 0
+            for chunk in byte_chunks:
+                if not read and b"\x00" in chunk[:8192]:
+                    status["cap"] = "binary"
+                    return
+                if self.max_file_bytes and read + len(chunk) > self.max_file_bytes:
+                    chunk = chunk[:self.max_file_bytes - read]
+                    status["cap"] = self.max_file_bytes
+                if not self._charge(len(chunk)):
+                    status["spent"] = True
+                    return
+                read += len(chunk)
+                if digest:
+                    digest.update(chunk)
+                yield decoder.decode(chunk)
+                if status["cap"] is not None:
+                    break
+            yield decoder.decode(b"", final=True)
+
+        hits = [(match.signature, line, match.masked()) for match, line in self.detector.scan_stream(text_chunks())]
+        if status["spent"]:
+            return None
+        verified = digest.hexdigest() == blob_sha if digest and status["cap"] is None else None
+        return hits, status["cap"], verified
+
+    def _charge(self, size):
+        """Takes `size` bytes from the per-scan budget (shared by the fetch threads). False once exhausted."""
+        with self._budget_lock:
+            if self.max_scan_bytes and self._scanned_bytes + size > self.max_scan_bytes:
+                return False
+            self._scanned_bytes += size
+            return True
+
+    def _secret_findings(self, file_path, hits):
+        findings = []
+        for signature, line, masked in hits:
+            findings.append(Finding("Hardcoded Secret", f"{signature} found in '{file_path}' (line {line}): {masked}", Severity.CRITICAL,
+                                    source="repo_scanner", location=f"{file_path}:{line}", signature=signature, masked_value=masked))
+        return findings
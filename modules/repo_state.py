@@ -0,0 +1,57 @@
+import json
+import threading
+from modules.cache_store import DiskLRUStore
+
+class RepoScanState:
+    """
+    Incremental Rescan State
+    Remembers, per repository and branch, the tree SHA of the last complete scan, the
+    findings it produced, and the content findings of every blob it fetched (keyed by path,
+    tagged with the blob SHA). A rescan of an unchanged tree is answered from here, and a
+    changed tree only fetches the blobs whose SHA moved. Entries are tied to the secret
+    detector's version, so adding a signature invalidates them.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes=128 * 1024 * 1024, cache_dir=None):
+        self.store = DiskLRUStore("repo_state", max_bytes=max_bytes, cache_dir=cache_dir)
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def load(self, repo_key, detector_version):
+        """Previous state for this repo@branch, or None (also when the detector changed)."""
+        try:
+            raw = self.store.get(f"repo:{repo_key}")
+        except OSError:
+            return None
+        if raw is None:
+            return None
+        state = json.loads(raw)
+        if state.get("detector") != detector_version:
+            return None
+        return state
+
+    def save(self, repo_key, detector_version, tree_sha, findings, blobs):
+        """
+        `tree_sha` is None when the scan did not cover every candidate (fetch budget, network
+        errors) - the blob results are still kept, but the next scan won't short-circuit.
+        `blobs` maps path -> (blob sha, findings as dicts, read verdict: None = whole file, "binary",
+        or the per-file byte cap the content was cut at).
+        """
+        state = {"detector": detector_version, "tree_sha": tree_sha, "findings": findings, "blobs": blobs}
+        try:
+            self.store.put(f"repo:{repo_key}", json.dumps(state).encode())
+        except OSError:
+            pass
+
+    def forget(self, repo_key):
+        try:
+            self.store.delete(f"repo:{repo_key}")
+        except OSError:
+            pass
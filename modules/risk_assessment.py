@@ -2,14 +2,20 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Confirm
+from modules.findings import FindingStore
 
 console = Console()
 
 class EthicsPolicy:
-    def check_consent(self):
+    def check_consent(self, presigned=False):
         """
         Enforces ethical usage policy before the tool runs.
+        `presigned` (--accept-terms / SHADOWSCAN_ACCEPT_TERMS) records agreement up front
+        for non-interactive runs, so there is no screen clear and no prompt.
         """
+        if presigned:
+            return True
+
         console.clear()
         warning_text = (
             "[bold red]WARNING: OFFENSIVE OSINT MODE ENGAGED[/bold red]\n\n"
@@ -30,6 +36,7 @@ class EthicsPolicy:
         if not Confirm.ask("[bold yellow]Do you agree to these terms?[/bold yellow]"):
             console.print("[red]Terminating session.[/red]")
             exit()
+        return True
 
 class RiskScorer:
     def __init__(self):
@@ -56,40 +63,36 @@ class RiskScorer:
         """
         Calculates a 0-100 Risk Score and generates a breakdown.
         """
-        total_score = 0
-        risk_counts = {"CRITICAL": 0, "High": 0, "Medium": 0, "Low": 0}
-        unique_recommendations = set()
-
-        for item in findings:
-            level = item.get('risk_level', 'Info')
-            
-            # 1. Add Score
-            points = self.risk_weights.get(level, 0)
-            total_score += points
-            
-            # 2. Count Stats
-            if level in risk_counts:
-                risk_counts[level] += 1
-                
-            # 3. Collect Recommendations based on Type
-            finding_type = item.get('type')
-            if finding_type in self.mitigation_db:
-                unique_recommendations.add(f"[bold cyan]Fix {finding_type}:[/bold cyan] {self.mitigation_db[finding_type]}")
-
-        # Normalize Score (Cap at 100)
-        final_score = min(total_score, 100)
-        
-        # Determine Severity Label
-        if final_score >= 80: severity = "CRITICAL"
-        elif final_score >= 50: severity = "HIGH"
-        elif final_score >= 20: severity = "MEDIUM"
-        else: severity = "LOW"
+        final_score, severity, risk_counts, unique_recommendations = self.score_findings(findings)
 
         # Display the detailed report
         self._print_report(final_score, severity, risk_counts, unique_recommendations)
         
         return final_score, severity
 
+    def score_findings(self, findings):
+        """
+        Computes the score, severity, per-level counts and recommendations without printing.
+        (Used by batch mode, where one report per target would flood the console.)
+        """
+        tally = self.tally()
+
+        if isinstance(findings, FindingStore):
+            # Columnar fast path: per-severity and per-type counts, no per-finding work
+            for severity, count in findings.counts_by_severity().items():
+                tally.add_level(severity.label, count)
+            for finding_type in findings.counts_by_type():
+                tally.add_type(finding_type)
+        else:
+            for item in findings:
+                tally.add(item)
+
+        return tally.result()
+
+    def tally(self):
+        """Running scorer for streamed findings (headless mode keeps no finding list)."""
+        return ScoreTally(self)
+
     def _print_report(self, score, severity, counts, recommendations):
         """
         Visualizes the data in a nice table.
@@ -120,4 +123,45 @@ class RiskScorer:
             rec_panel = "\n".join([f"- {rec}" for rec in recommendations])
             console.print(Panel(rec_panel, title="[bold green]RECOMMENDED MITIGATION PLAN[/bold green]", border_style="green"))
         else:
-            console.print("[green]No specific mitigations required. Maintain OpSec.[/green]")
\ No newline at end of file
+            console.print("[green]No specific mitigations required. Maintain OpSec.[/green]")
+
+class ScoreTally:
+    """Incremental RiskScorer: add findings one at a time, read the score at any point."""
+    def __init__(self, scorer):
+        self.scorer = scorer
+        self.total_score = 0
+        self.count = 0
+        self.risk_counts = {"CRITICAL": 0, "High": 0, "Medium": 0, "Low": 0}
+        self.recommendations = set()
+
+    def add(self, item):
+        self.add_level(item.get('risk_level', 'Info'))
+        self.add_type(item.get('type'))
+
+    def add_level(self, level, count=1):
+        # 1. Add Score
+        self.total_score += self.scorer.risk_weights.get(level, 0) * count
+        self.count += count
+
+        # 2. Count Stats
+        if level in self.risk_counts:
+            self.risk_counts[level] += count
+
+    def add_type(self, finding_type):
+        # 3. Collect Recommendations based on Type
+        mitigation_db = self.scorer.mitigation_db
+        if finding_type in mitigation_db:
+            self.recommendations.add(f"[bold cyan]Fix {finding_type}:[/bold cyan] {mitigation_db[finding_type]}")
+
+    def result(self):
+        """(score, severity, risk_counts, recommendations) - same shape as RiskScorer.score_findings."""
+        # Normalize Score (Cap at 100)
+        final_score = min(self.total_score, 100)
+        
+        # Determine Severity Label
+        if final_score >= 80: severity = "CRITICAL"
+        elif final_score >= 50: severity = "HIGH"
+        elif final_score >= 20: severity = "MEDIUM"
+        else: severity = "LOW"
+
+        return final_score, severity, dict(self.risk_counts), set(self.recommendations)
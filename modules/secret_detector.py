@@ -0,0 +1,312 @@
+import hashlib
+import json
+import re
+from bisect import bisect_left
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# --- SIGNATURES (Shared by CodeMiner & RepoScanner) ---
+# name -> (pattern, case_insensitive)
+# Adding a signature here makes it available to every scanner. Patterns should start with
+# a literal (e.g. "AKIA", "xox[bp]-", "(?:password|secret)"): that literal is the anchor
+# the prefilter searches for, and the regex only runs where an anchor occurs.
+SECRET_SIGNATURES = {
+    "AWS Access Key": (r"AKIA[0-9A-Z]{16}", False),
+    "Google API Key": (r"AIza[0-9A-Za-z\-_]{35}", False),
+    "Private Key": (r"-----BEGIN [A-Z ]*PRIVATE KEY-----", False),
+    "Slack Token": (r"xox[baprs]-[0-9a-zA-Z\-]{10,48}", False),
+    "Generic Token": (r"(?:api|access)[_-]?key\s*[:=]\s*['\"][a-zA-Z0-9_\-]{10,}['\"]", True),
+    "Generic Password": (r"(?:password|passwd|pwd|secret)\s*[=:]+\s*['\"][^'\"\n]{6,}['\"]", True),
+}
+
+# Bumped whenever matching behaviour changes (invalidates stored per-blob results)
+ENGINE_REVISION = 2
+
+# How far past a hit the overlap check looks for a secret that starts inside it
+INNER_LOOKAHEAD = 4096
+
+# Case-insensitive anchors are searched in lowercased blocks of this many chars/bytes
+FOLD_BLOCK = 1024 * 1024
+# Characters that re.IGNORECASE matches to an ASCII letter but str.lower() doesn't map to it
+# ("İ" also lowers to two chars, which would shift offsets)
+_FOLD_EXTRA = (("\u0130", "i"), ("\u0131", "i"), ("\u212a", "k"), ("\u017f", "s"))
+_MIN_ANCHOR = 3
+
+def _literal_prefixes(items):
+    """
+    (set of literal strings that every match of the parsed pattern `items` starts with,
+    whether the whole of `items` was literal). Stops at the first non-literal element.
+    """
+    prefixes = {""}
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            prefixes = {p + chr(av) for p in prefixes}
+        elif op is sre_parse.IN and len(av) <= 8 and all(o is sre_parse.LITERAL for o, _ in av):
+            prefixes = {p + chr(c) for p in prefixes for _, c in av}
+        elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+            inner, whole = _literal_prefixes(av[-1])
+            prefixes = {p + i for p in prefixes for i in inner}
+            if not whole:
+                return prefixes, False
+        elif op is sre_parse.BRANCH:
+            alternatives = [_literal_prefixes(alt) for alt in av[1]]
+            prefixes = {p + i for p in prefixes for inner, _ in alternatives for i in inner}
+            if not all(whole for _, whole in alternatives):
+                return prefixes, False
+        else:
+            return prefixes, False
+        if len(prefixes) > 64:
+            return {""}, False
+    return prefixes, True
+
+def anchors_for(pattern, ignore_case):
+    """Literal prefixes every match of `pattern` starts with (lowercased if case-insensitive), or None."""
+    try:
+        prefixes, _ = _literal_prefixes(sre_parse.parse(pattern))
+    except Exception:
+        return None
+    if any(len(prefix) < _MIN_ANCHOR for prefix in prefixes):
+        return None
+    return sorted({prefix.lower() for prefix in prefixes} if ignore_case else prefixes)
+
+class SecretMatch:
+    """A single signature hit: which signature fired, where, and what it matched."""
+    __slots__ = ("signature", "start", "end", "value")
+
+    def __init__(self, signature, start, end, value):
+        self.signature = signature
+        self.start = start
+        self.end = end
+        self.value = value
+
+    def masked(self):
+        """Masks the secret for display (first 4 chars only)."""
+        return self.value[:4] + "..." if len(self.value) > 5 else "HIDDEN"
+
+    def line_number(self, text):
+        """1-based line of the match inside the scanned text."""
+        return text.count("\n", 0, self.start) + 1
+
+    def __repr__(self):
+        return f"SecretMatch({self.signature!r}, {self.start}, {self.end})"
+
+class SecretDetector:
+    """
+    Anchored Multi-Pattern Secret Engine
+    Python's `re` tries every branch of an alternation at every position, so neither one big
+    alternation nor a loop of finditer() calls scales with the number of signatures. Instead:
+    1. Prefilter - each signature's literal anchors (AKIA, AIza, xox?-, -----BEGIN, password,
+       api, ...) are located with str.find / bytes.find (case-insensitive ones in a lowercased
+       copy, one block at a time). That is a fast C scan per anchor.
+    2. Verify - a signature's regex only runs at its anchor positions, leftmost first and in
+       signature order, so hits are exactly what one alternation of all signatures reports.
+    3. Overlaps - an alternation reports one signature per span, so each hit is re-checked
+       against the other signatures anchored inside that span (e.g. an AWS key quoted in a
+       `password = "..."` line yields both).
+    A signature with no literal anchor (shorter than 3 chars) is located with a lookahead
+    probe instead - one full regex pass for that signature alone (listed in `unanchored`).
+    """
+    def __init__(self, signatures=None):
+        self.signatures = dict(signatures or SECRET_SIGNATURES)
+
+        # Each signature keeps its own scoped flags: (?i:...) or (?:...)
+        sources = []
+        for name, (pattern, ignore_case) in self.signatures.items():
+            flags = "(?i:" if ignore_case else "(?:"
+            sources.append((name, f"{flags}{pattern})"))
+        self._sources = sources
+        # Per-signature patterns (verification + overlap check); bytes twins compiled on first use
+        self._compiled = {str: [(name, re.compile(source)) for name, source in sources]}
+
+        # Prefilter anchors: [(anchor, signature indexes)], exact-case and case-folded
+        exact, folded = {}, {}
+        self._probe_sources = {}  # index -> lookahead source, for unanchored signatures
+        for index, (name, (pattern, ignore_case)) in enumerate(self.signatures.items()):
+            prefixes = anchors_for(pattern, ignore_case)
+            if prefixes is None:
+                self._probe_sources[index] = f"(?={sources[index][1]})"
+                continue
+            for prefix in prefixes:
+                (folded if ignore_case else exact).setdefault(prefix, []).append(index)
+        self.unanchored = [sources[index][0] for index in self._probe_sources]
+        self._anchors = {str: (list(exact.items()), list(folded.items()))}
+        self._anchors[bytes] = ([(a.encode(), ix) for a, ix in exact.items()], [(a.encode(), ix) for a, ix in folded.items()])
+        self._probes = {str: {index: re.compile(source) for index, source in self._probe_sources.items()}}
+        self._fold_overlap = max((len(a.encode()) for a in folded), default=1) - 1
+
+        # Fingerprint of the signature set + engine: stored scan results are only reused under the same one
+        fingerprint = json.dumps([ENGINE_REVISION, self.signatures], sort_keys=True)
+        self.version = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+
+    def scan(self, text):
+        """Returns every SecretMatch in `text`, in order of appearance."""
+        if not text:
+            return []
+        matches = []
+        positions = self._anchor_positions(text, len(text))
+        for name, m in self._primary(text, positions):
+            matches.extend(self._expand(name, m, text, positions))
+        return matches
+
+    def scan_stream(self, chunks, overlap=4096):
+        """
+        Scans text that arrives in pieces (e.g. a streamed download) without joining it.
+        Each window is the tail of the previous one (`overlap` chars) plus the next chunk, so
+        secrets spanning a chunk boundary are still found. Matches reaching into the last
+        `overlap` chars of a window are left for the next one, where more text follows them
+        (a longer secret that isn't complete yet can't be pre-empted by a shorter one inside it).
+        Yields (SecretMatch with absolute offsets, 1-based line number) in order of appearance,
+        the same matches scan() finds on the joined text as long as no secret exceeds `overlap`.
+        """
+        chunks = iter(chunks)
+        window = ""
+        base = 0        # Absolute offset of window[0]
+        base_line = 1   # Line number at window[0]
+        reported = 0    # Absolute end of the last reported match
+        pending = next(chunks, None)
+
+        while pending is not None:
+            following = next(chunks, None)
+            final = following is None
+            window += pending
+
+            hold = len(window)
+            safe_end = len(window) if final else len(window) - overlap
+            line, last = base_line, 0
+            positions = self._anchor_positions(window, len(window))
+            for name, m in self._primary(window, positions):
+                if base + m.start() < reported:
+                    continue # Already reported from the previous window
+                if m.end() > safe_end:
+                    hold = m.start()
+                    break # Not enough lookahead yet: rescanned with the next chunk
+                matches = self._expand(name, m, window, positions)
+                reported = base + m.end()
+                for match in matches:
+                    line += window.count("\n", last, match.start)
+                    last = match.start
+                    yield SecretMatch(match.signature, base + match.start, base + match.end, match.value), line
+
+            # Carry the overlap (and any deferred match) into the next window
+            keep_from = min(hold, max(0, len(window) - overlap))
+            base_line += window.count("\n", 0, keep_from)
+            base += keep_from
+            window = window[keep_from:]
+            pending = following
+
+    def scan_buffer(self, buffer, endpos=None):
+        """
+        Scans raw bytes in place - any buffer, including an mmap - with bytes builds of the
+        same patterns, so file contents are never decoded into a str (only one lowercased
+        block at a time is copied, for the case-insensitive anchors). Scanning stops at
+        `endpos` if given. Yields (SecretMatch, 1-based line number) in order of appearance.
+        """
+        if bytes not in self._compiled:
+            self._compiled[bytes] = [(name, re.compile(source.encode())) for name, source in self._sources]
+            self._probes[bytes] = {index: re.compile(source.encode()) for index, source in self._probe_sources.items()}
+        endpos = len(buffer) if endpos is None else endpos
+        line, last = 1, 0
+        positions = self._anchor_positions(buffer, endpos)
+        for name, m in self._primary(buffer, positions, endpos):
+            for match in self._expand(name, m, buffer, positions, endpos):
+                line += buffer[last:match.start].count(b"\n")
+                last = match.start
+                match.value = match.value.decode("utf-8", errors="ignore")
+                yield match, line
+
+    def first_hits(self, text):
+        """Returns the distinct signature names that fired in `text` (in order of first appearance)."""
+        seen = []
+        for match in self.scan(text):
+            if match.signature not in seen:
+                seen.append(match.signature)
+        return seen
+
+    def _anchor_positions(self, text, endpos):
+        """
+        Prefilter: for each signature, the sorted offsets (< endpos) where one of its anchors
+        starts - the only places its regex can match (for unanchored signatures: where it matches).
+        """
+        kind = str if isinstance(text, str) else bytes
+        exact, folded = self._anchors[kind]
+        found = [set() for _ in self._sources]
+
+        for index, probe in self._probes[kind].items():
+            found[index].update(m.start() for m in probe.finditer(text, 0, endpos))
+
+        for anchor, indexes in exact:
+            pos = text.find(anchor, 0, endpos)
+            while pos != -1:
+                for index in indexes:
+                    found[index].add(pos)
+                pos = text.find(anchor, pos + 1, endpos)
+
+        # Case-folded anchors: lowercase one block at a time (blocks overlap by the longest anchor)
+        if folded:
+            for start in range(0, endpos, FOLD_BLOCK):
+                block = text[start:min(endpos, start + FOLD_BLOCK + self._fold_overlap)]
+                if isinstance(block, str) and not block.isascii():
+                    for char, ascii_char in _FOLD_EXTRA:
+                        block = block.replace(char, ascii_char)
+                block = block.lower()
+                for anchor, indexes in folded:
+                    pos = block.find(anchor)
+                    while pos != -1 and pos < FOLD_BLOCK:
+                        for index in indexes:
+                            found[index].add(start + pos)
+                        pos = block.find(anchor, pos + 1)
+        return [sorted(offsets) for offsets in found]
+
+    def _primary(self, text, positions, endpos=None):
+        """
+        Yields (signature name, match) exactly as one alternation of all signatures would
+        report them: leftmost first, first signature in order wins, scanning resumes after
+        each hit. Only the prefilter's `positions` are tried.
+        """
+        singles = self._compiled[str if isinstance(text, str) else bytes]
+        endpos = len(text) if endpos is None else endpos
+        candidates = {}
+        for index, offsets in enumerate(positions):
+            for pos in offsets:
+                candidates.setdefault(pos, []).append(index)
+        resume = 0
+        for pos in sorted(candidates):
+            if pos < resume:
+                continue
+            for index in sorted(candidates[pos]):
+                name, pattern = singles[index]
+                m = pattern.match(text, pos, endpos)
+                if m is not None:
+                    yield name, m
+                    resume = max(m.end(), pos + 1)
+                    break
+
+    def _expand(self, winner, m, text, positions, endpos=None):
+        """
+        The alternation's hit `m` (signature `winner`) plus every other signature's matches
+        that START inside its span, ordered by position. Those may run past the span, so each
+        match may look up to INNER_LOOKAHEAD chars beyond it.
+        """
+        matches = [SecretMatch(winner, m.start(), m.end(), m.group(0))]
+        limit = min(len(text) if endpos is None else endpos, m.end() + INNER_LOOKAHEAD)
+        for index, (name, pattern) in enumerate(self._compiled[str if isinstance(text, str) else bytes]):
+            if name == winner:
+                continue
+            offsets = positions[index]
+            i = bisect_left(offsets, m.start())
+            after = m.start()  # Next start allowed (inner matches don't overlap each other)
+            while i < len(offsets) and offsets[i] < m.end():
+                if offsets[i] >= after:
+                    inner = pattern.match(text, offsets[i], limit)
+                    if inner is not None:
+                        matches.append(SecretMatch(name, inner.start(), inner.end(), inner.group(0)))
+                        after = max(inner.end(), inner.start() + 1)
+                i += 1
+        matches.sort(key=lambda match: match.start)
+        return matches
+
+# Module-level instance: compiled once per process and shared by all scanners
+default_detector = SecretDetector()
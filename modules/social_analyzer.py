@@ -1,21 +1,48 @@
-import easyocr
-import spacy
 import re
 import pyap
 import os
-import pillow_heif
-from textblob import TextBlob
-from thefuzz import fuzz
+import sys
+import contextlib
+import hashlib
+import json
+from textblob.en.sentiments import PatternAnalyzer
+from modules.fuzzy_index import FuzzyKeywordIndex
+from modules.keyword_matcher import KeywordMatcher
+from modules.image_cache import ImageResultCache
+from modules.ocr_preprocess import OCRPreprocessor
+from modules.image_dedup import PerceptualIndex, BKTree, fingerprint, same_picture
 
-# Register HEIC opener to support iPhone photos
-pillow_heif.register_heif_opener()
+# Bump when OCR output or post-processing changes, to invalidate cached image results
+ANALYZER_VERSION = "4"
 
-# Initialize NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("[!] Spacy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+# Heavy dependencies (easyocr -> torch, spaCy model, pillow_heif) are loaded lazily:
+# importing this module is cheap, and the models only load when analysis actually runs.
+_nlp = None
+_nlp_loaded = False
+
+def get_nlp():
+    """Loads the spaCy pipeline on first use (None if the model isn't installed)."""
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        _nlp_loaded = True
+        try:
+            import spacy
+            _nlp = spacy.load("en_core_web_sm")
+        except OSError:
+            print("[!] Spacy model not found. Run: python -m spacy download en_core_web_sm")
+            _nlp = None
+    return _nlp
+
+def analyze_post_job(image_path, caption_text, use_cache=True, ocr_options=None):
+    """
+    Process-pool entry point (ShadowScanEngine runs OCR/NLP beside the network pillars).
+    Returns the post's findings and the OCR stage report.
+    The spawned worker shares fd 1 with the parent, so its progress prints go to stderr:
+    in headless mode stdout is the NDJSON stream and must carry nothing but events.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        analyzer = SocialPostAnalyzer(use_cache=use_cache, ocr_options=ocr_options)
+        return analyzer.analyze_post(image_path, caption_text), analyzer.ocr_report()
 
 class SocialPostAnalyzer:
     """
@@ -23,10 +50,25 @@ class SocialPostAnalyzer:
     Combines OCR (Computer Vision) and NLP to find risks in text and images simultaneously.
     Features: HEIC Support, PII Regex, Behavioral Triggers, India-Optimized Address Detection, and Corporate Entity Extraction.
     """
-    def __init__(self):
+    def __init__(self, use_cache=True, ocr_options=None):
         print("[*] Initializing Social Intelligence Engine (OCR + NLP)...")
-        # Initialize OCR (set gpu=True if you have NVIDIA CUDA)
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        # OCR reader is created on first image (caption-only runs never load torch)
+        self._reader = None
+
+        # Downscale / text gate / tiling before OCR (see OCRPreprocessor for the knobs),
+        # plus near-duplicate clustering so re-posts are OCRed once
+        self._set_ocr_options(ocr_options or {})
+        self.dedup_count = 0
+
+        # Content-addressed OCR cache (repeat images skip OCR entirely)
+        self.use_cache = use_cache
+
+        # Bulk mode batch sizes (OCR batches run on the CPU, spaCy batches are cheap)
+        self.ocr_batch_size = 8
+        self.nlp_batch_size = 64
+
+        # One sentiment analyzer shared by every caption (same scorer TextBlob uses)
+        self.sentiment_analyzer = PatternAnalyzer()
         
         # 1. VISUAL RISK KEYWORDS (Direct Leaks)
         self.sensitive_keywords = [
@@ -47,6 +89,9 @@ class SocialPostAnalyzer:
         self.edu_keywords = ["university", "college", "school", "academy", "institute", "campus", "class of"]
         self.corp_keywords = ["google", "facebook", "amazon", "microsoft", "openai", "corp", "ltd", "inc", "technologies", "solutions", "private limited"]
 
+        # Keyword automaton over all lists above (built once, one pass per text)
+        self.rebuild_matcher()
+
         # 4. PII REGEX PATTERNS (Data Leaks)
         self.pii_patterns = {
             "Email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
@@ -61,38 +106,288 @@ class SocialPostAnalyzer:
         # Matches: "MG Road", "Gandhi Marg", "5th Avenue" (1-4 words before suffix, no starting number required)
         self.regex_street = r"\b([a-zA-Z0-9\.\-]+\s){1,4}(Street|St|Avenue|Ave|Road|Rd|Lane|Ln|Drive|Dr|Blvd|Way|Marg|Path|Chowk|Nagar|Colony|Salai)\b"
 
+    def rebuild_matcher(self):
+        """
+        Compiles sensitive keywords, context triggers and edu/corp keywords into one
+        Aho-Corasick automaton (plus the typo index over sensitive keywords).
+        Call again after changing any of the keyword lists.
+        """
+        self.matcher = KeywordMatcher()
+        self.matcher.add_many(self.sensitive_keywords, "sensitive")
+        for category, phrases in self.context_triggers.items():
+            self.matcher.add_many(phrases, f"trigger:{category}")
+        self.matcher.add_many(self.edu_keywords, "edu")
+        self.matcher.add_many(self.corp_keywords, "corp")
+        self.matcher.build()
+        self.trigger_categories = {f"trigger:{category}" for category in self.context_triggers}
+        self.fuzzy_index = FuzzyKeywordIndex(self.sensitive_keywords, low=85, high=100)
+
+        self._update_cache_version()
+
+    def configure_ocr(self, **ocr_options):
+        """Replaces the OCR preprocessing settings (the daemon applies each client's options)."""
+        self._set_ocr_options(ocr_options)
+        self._update_cache_version()
+
+    def _set_ocr_options(self, ocr_options):
+        options = dict(ocr_options)
+        # Max dHash distance (of 256 bits) for two images to share one OCR run; None disables.
+        # The dHash alone can't tell same-layout screenshots with different text apart (a few
+        # bits), so every candidate is confirmed on its block signature before text is reused.
+        self.dedup_distance = options.pop("dedup_distance", 12)
+        self.preprocessor = OCRPreprocessor(**options)
+
+    def ocr_report(self):
+        """Preprocessing stage timings plus how much OCR near-duplicate clustering saved."""
+        return f"{self.preprocessor.report()} | {self.dedup_count} near-duplicates reused OCR"
+
+    def _update_cache_version(self):
+        # Analyzer + keyword-set + preprocessing version: part of every image cache key
+        keyword_sets = [self.sensitive_keywords, self.context_triggers, self.edu_keywords, self.corp_keywords]
+        fingerprint = hashlib.sha256(json.dumps(keyword_sets, sort_keys=True).encode()).hexdigest()[:12]
+        self.cache_version = f"{ANALYZER_VERSION}-{fingerprint}-{self.preprocessor.signature()}-dd{self.dedup_distance}"
+
+    @property
+    def reader(self):
+        """easyocr.Reader, built on first use."""
+        if self._reader is None:
+            import easyocr
+            import pillow_heif
+
+            # Register HEIC opener to support iPhone photos
+            pillow_heif.register_heif_opener()
+
+            # Initialize OCR (set gpu=True if you have NVIDIA CUDA)
+            self._reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        return self._reader
+
     def analyze_post(self, image_path, caption_text):
         """
         Analyzes Image + Caption to find leaks, location, sentiment, PII, and entities.
         """
-        findings = []
-        combined_text = ""
-        image_text_full = ""
+        return self.analyze_posts([(image_path, caption_text)])[0]
 
-        # --- PHASE 1: VISUAL ANALYSIS (OCR) ---
-        if image_path:
+    def analyze_posts(self, posts):
+        """
+        Bulk API: analyzes many (image_path, caption_text) posts at once.
+        OCR runs in same-size image batches, sentiment runs over all captions with one
+        analyzer, and spaCy processes every post through nlp.pipe(). Returns one findings
+        list per post, in input order (identical to calling analyze_post on each).
+        """
+        posts = list(posts)
+
+        # --- PHASE 1: VISUAL ANALYSIS (Batched OCR) ---
+        ocr_outputs = self._ocr_many([image for image, _ in posts])
+
+        # --- PHASE 2: CAPTION SENTIMENT (Batched) ---
+        polarities = self._sentiment_many([caption for _, caption in posts])
+
+        # --- PHASE 3: NLP (nlp.pipe over every post's combined text) ---
+        combined_texts = []
+        for (image_path, caption_text), (status, payload) in zip(posts, ocr_outputs):
+            combined_text = ""
+            if status == "ok":
+                combined_text += " " + " ".join(payload)
+            if caption_text:
+                combined_text += " " + caption_text
+            combined_texts.append(combined_text)
+        docs = self._nlp_many(combined_texts)
+
+        results = []
+        for (image_path, caption_text), ocr, polarity, combined_text, doc in zip(posts, ocr_outputs, polarities, combined_texts, docs):
+            results.append(self._compose_findings(image_path, caption_text, ocr, polarity, combined_text, doc))
+        return results
+
+    def _ocr_many(self, image_paths):
+        """
+        Runs OCR for every image. Returns one (status, payload) pair per post:
+        ("ok", text segments), ("none", None), or ("missing"/"error", error finding).
+        """
+        outputs = [("none", None)] * len(image_paths)
+        pending = []
+
+        for index, image_path in enumerate(image_paths):
+            if not image_path:
+                continue
             # 1. Robust File Validation
             if not os.path.exists(image_path):
-                 return [{"type": "Error", "data": f"File not found: {image_path}", "risk_level": "Info"}]
-            
-            # 2. Format Warning (HEIC)
-            if image_path.lower().endswith('.heic'):
-                pass # Supported via pillow_heif
+                outputs[index] = ("missing", {"type": "Error", "data": f"File not found: {image_path}", "risk_level": "Info"})
+                continue
+            # 2. Cache lookup by content hash (re-posts / reruns skip OCR)
+            cached = self._cache_get(image_path)
+            if cached is not None:
+                outputs[index] = ("ok", cached)
+                continue
+            pending.append(index)
+
+        # 3. Near-duplicate clustering: one OCR run per cluster of re-posts / recompressions
+        representatives, members, fingerprints = self._cluster_duplicates(image_paths, pending, outputs)
+
+        # 4. Preprocess a window of images at a time (bounds memory), then OCR all their tiles.
+        #    Same-shape tiles go through readtext_batched together.
+        window = self.ocr_batch_size * 4
+        gated = set()  # images the text gate rejected: no OCR ran, so nothing is cached
+        for start in range(0, len(representatives), window):
+            tiles = {}     # tile shape -> [(image index, tile position, array)]
+            per_tile = {}  # image index -> one (status, payload) per tile
+            for i in representatives[start:start + window]:
+                try:
+                    prepared = self.preprocessor.prepare(image_paths[i])
+                except Exception:
+                    # PIL can't read it - let easyocr try the raw file (and report its error)
+                    with self.preprocessor.timed("ocr"):
+                        outputs[i] = self._ocr_one(image_paths[i])
+                    continue
+                if not prepared:
+                    gated.add(i)
+                per_tile[i] = [None] * len(prepared)
+                for pos, tile in enumerate(prepared):
+                    tiles.setdefault(tile.shape, []).append((i, pos, tile))
+
+            for jobs in tiles.values():
+                for (i, pos, _), result in zip(jobs, self._read_tiles([tile for _, _, tile in jobs])):
+                    per_tile[i][pos] = result
+
+            for i, results in per_tile.items():
+                errors = [payload for status, payload in results if status == "error"]
+                outputs[i] = ("error", errors[0]) if errors else ("ok", self._merge_tiles([payload for _, payload in results]))
+
+        # Every cluster member gets its representative's text
+        for rep, dupes in members.items():
+            for i in dupes:
+                outputs[i] = outputs[rep]
+                if rep in gated:
+                    gated.add(i)
+
+        # Remember fresh OCR results for next time ("no text" verdicts only when OCR itself found none)
+        for i in pending:
+            status, payload = outputs[i]
+            if status == "ok" and i not in gated:
+                self._cache_put(image_paths[i], payload)
+                if self.use_cache and i in fingerprints:
+                    bits, signature = fingerprints[i]
+                    PerceptualIndex.shared().add(bits, ImageResultCache.shared().content_hash(image_paths[i]), signature)
 
+        return outputs
+
+    def _cluster_duplicates(self, image_paths, pending, outputs):
+        """
+        Splits cache misses into representatives (to OCR) and near-duplicates (dHash within
+        `dedup_distance` bits and a matching block signature) of an earlier image in this batch.
+        Near-duplicates of an image OCRed in a previous run take its cached text straight into `outputs`.
+        Returns (representatives, {representative: [members]}, {representative: (dHash, block signature)}).
+        """
+        if self.dedup_distance is None:
+            return pending, {}, {}
+
+        representatives, members, fingerprints = [], {}, {}
+        batch = BKTree()
+        for i in pending:
             try:
-                # 3. Run OCR
-                ocr_results = self.reader.readtext(image_path, detail=0)
+                bits, signature = fingerprint(image_paths[i])
+            except Exception:
+                representatives.append(i)  # Unreadable by PIL - OCR reports the error
+                continue
+
+            # a) Near-duplicate of an image earlier in this batch
+            match = next((rep for _, rep in batch.within(bits, self.dedup_distance)
+                          if same_picture(signature, fingerprints[rep][1])), None)
+            if match is not None:
+                members.setdefault(match, []).append(i)
+                self.dedup_count += 1
+                continue
+
+            # b) Near-duplicate of an image OCRed in an earlier run
+            if self.use_cache:
+                digest = PerceptualIndex.shared().nearest(bits, self.dedup_distance, signature)
+                cached = ImageResultCache.shared().get_digest(digest, "ocr", self.cache_version) if digest else None
+                if cached is not None:
+                    outputs[i] = ("ok", cached)
+                    self.dedup_count += 1
+                    continue
+
+            batch.add(bits, i)
+            representatives.append(i)
+            fingerprints[i] = (bits, signature)
+        return representatives, members, fingerprints
+
+    def _read_tiles(self, tiles):
+        """OCR for same-shape tiles: one batched call, or one-by-one if that fails."""
+        with self.preprocessor.timed("ocr"):
+            if len(tiles) > 1:
+                try:
+                    batch = self.reader.readtext_batched(tiles, detail=0, batch_size=self.ocr_batch_size)
+                    return [("ok", list(segments)) for segments in batch]
+                except Exception:
+                    pass # Fall back to one-by-one so a single bad tile can't sink the batch
+            return [self._ocr_one(tile) for tile in tiles]
+
+    def _merge_tiles(self, tile_segments):
+        """Joins per-tile text, dropping lines repeated in the overlap with the previous tile."""
+        merged = []
+        previous = set()
+        for segments in tile_segments:
+            merged.extend(segment for segment in segments if segment not in previous)
+            previous = set(segments)
+        return merged
+
+    def _cache_get(self, image_path):
+        if not self.use_cache:
+            return None
+        return ImageResultCache.shared().get(image_path, "ocr", self.cache_version)
+
+    def _cache_put(self, image_path, segments):
+        if self.use_cache:
+            ImageResultCache.shared().put(image_path, "ocr", self.cache_version, list(segments))
+
+    def _ocr_one(self, image):
+        """OCR for one file path or preprocessed tile."""
+        try:
+            # 4. Run OCR
+            return ("ok", self.reader.readtext(image, detail=0))
+        except AttributeError:
+            return ("error", {"type": "Error", "data": "Image failed to load. File may be corrupt or unsupported format.", "risk_level": "Low"})
+        except Exception as e:
+            return ("error", {"type": "Error", "data": f"OCR Analysis Failed: {e}", "risk_level": "Low"})
+
+    def _sentiment_many(self, captions):
+        """Polarity per caption (None where there is no caption), using one shared analyzer."""
+        return [self.sentiment_analyzer.analyze(caption).polarity if caption else None for caption in captions]
+
+    def _nlp_many(self, texts):
+        """spaCy docs for every text via nlp.pipe (only the NER-relevant pipes run)."""
+        nlp = get_nlp()
+        if not nlp:
+            return [None] * len(texts)
+        unused = [p for p in ("parser", "lemmatizer", "tagger", "attribute_ruler") if p in nlp.pipe_names]
+        with nlp.select_pipes(disable=unused):
+            return list(nlp.pipe(texts, batch_size=self.nlp_batch_size))
+
+    def _compose_findings(self, image_path, caption_text, ocr, polarity, combined_text, doc):
+        """Builds one post's findings from its precomputed OCR text, sentiment and spaCy doc."""
+        findings = []
+
+        # --- PHASE 1: VISUAL ANALYSIS (OCR) ---
+        if image_path:
+            status, payload = ocr
+
+            # Missing file: report only that (same as a single-post run)
+            if status == "missing":
+                return [payload]
+
+            if status == "error":
+                findings.append(payload)
+            else:
+                ocr_results = payload
                 image_text_full = " ".join(ocr_results)
-                combined_text += " " + image_text_full
-                
-                # A. Check for Visual Keyword Leaks
-                for word in self.sensitive_keywords:
-                    if word in image_text_full.lower():
-                        findings.append({
-                            "type": "Visual Data Leak",
-                            "data": f"Sensitive term '{word}' found inside image.",
-                            "risk_level": "CRITICAL"
-                        })
+
+                # A. Check for Visual Keyword Leaks (single automaton pass)
+                for hit in self.matcher.find_keywords(image_text_full, categories={"sensitive"}):
+                    findings.append({
+                        "type": "Visual Data Leak",
+                        "data": f"Sensitive term '{hit.keyword}' found inside image.",
+                        "risk_level": "CRITICAL"
+                    })
                 
                 # B. Check for PII in Image
                 for pii_name, pattern in self.pii_patterns.items():
@@ -113,29 +408,18 @@ class SocialPostAnalyzer:
                             "risk_level": "Info"
                         })
 
-            except AttributeError:
-                 findings.append({"type": "Error", "data": "Image failed to load. File may be corrupt or unsupported format.", "risk_level": "Low"})
-            except Exception as e:
-                findings.append({"type": "Error", "data": f"OCR Analysis Failed: {e}", "risk_level": "Low"})
-
         # --- PHASE 2: CAPTION ANALYSIS (NLP) ---
         if caption_text:
-            text_lower = caption_text.lower()
-            combined_text += " " + caption_text
-
-            # A. Intent & Behavioral Analysis
-            for category, phrases in self.context_triggers.items():
-                for phrase in phrases:
-                    if phrase in text_lower:
-                        findings.append({
-                            "type": f"Behavioral Risk ({category})",
-                            "data": f"High-risk phrase detected: '{phrase}'",
-                            "risk_level": "High" if category == "Insider Threat" else "Medium"
-                        })
+            # A. Intent & Behavioral Analysis (single automaton pass over the caption)
+            for hit in self.matcher.find_keywords(caption_text, categories=self.trigger_categories):
+                category = hit.category.split(":", 1)[1]
+                findings.append({
+                    "type": f"Behavioral Risk ({category})",
+                    "data": f"High-risk phrase detected: '{hit.keyword}'",
+                    "risk_level": "High" if category == "Insider Threat" else "Medium"
+                })
 
             # B. Sentiment Analysis
-            blob = TextBlob(caption_text)
-            polarity = blob.sentiment.polarity
             if polarity < -0.3: 
                 level = "Medium"
                 if polarity < -0.6: level = "High"
@@ -145,16 +429,14 @@ class SocialPostAnalyzer:
                     "risk_level": level
                 })
 
-            # C. Fuzzy Logic on Caption (Typos)
+            # C. Fuzzy Logic on Caption (Typos) - indexed, only plausible keywords are compared
             for word in caption_text.split():
-                for target in self.sensitive_keywords:
-                    ratio = fuzz.ratio(word.lower(), target)
-                    if ratio > 85 and ratio < 100:
-                        findings.append({
-                            "type": "Fuzzy Pattern Match",
-                            "data": f"Potential typo of sensitive word '{target}' found: '{word}'",
-                            "risk_level": "Medium"
-                        })
+                for target in self.fuzzy_index.matches(word.lower()):
+                    findings.append({
+                        "type": "Fuzzy Pattern Match",
+                        "data": f"Potential typo of sensitive word '{target}' found: '{word}'",
+                        "risk_level": "Medium"
+                    })
 
         # --- PHASE 3: ENVIRONMENTAL & ADVANCED INTEL (Combined Text) ---
         
@@ -193,15 +475,10 @@ class SocialPostAnalyzer:
                 })
 
         # B. Entity Extraction (Schools + Big Tech)
-        if nlp:
-            doc = nlp(combined_text)
-            
+        if doc is not None:
             for ent in doc.ents:
                 # Check for Education OR Corporate keywords
-                is_edu = any(k in ent.text.lower() for k in self.edu_keywords)
-                is_corp = any(k in ent.text.lower() for k in self.corp_keywords)
-
-                if ent.label_ == "ORG" and (is_edu or is_corp):
+                if ent.label_ == "ORG" and self.matcher.contains_any(ent.text, categories={"edu", "corp"}):
                     findings.append({
                         "type": "Organizational Intel", 
                         "data": f"Entity identified: {ent.text}", 
@@ -211,4 +488,4 @@ class SocialPostAnalyzer:
         if not findings:
              findings.append({"type": "Info", "data": "Social analysis clean. No obvious risks found.", "risk_level": "Low"})
 
-        return findings
\ No newline at end of file
+        return findings
@@ -1,69 +1,97 @@
 import exifread
+import mmap
 import os
+import struct
 import pillow_heif
+from modules.image_cache import ImageResultCache
 pillow_heif.register_heif_opener()
 
+# Bump when the extracted findings change, to invalidate cached metadata results
+VISUAL_INTEL_VERSION = "2"
+
+# The only tags we report (IFD0 ASCII tags + the pointer to the GPS IFD)
+IFD0_TAGS = {0x0110: "Image Model", 0x0131: "Image Software", 0x0132: "Image DateTime"}
+GPS_IFD_POINTER = 0x8825
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+def to_decimal_degrees(dms, ref=None):
+    """[degrees, minutes, seconds] + 'N'/'S'/'E'/'W' -> signed decimal degrees."""
+    degrees, minutes, seconds = (list(dms) + [0.0, 0.0, 0.0])[:3]
+    value = degrees + minutes / 60.0 + seconds / 3600.0
+    return -value if ref and ref.strip().upper() in ("S", "W") else value
+
 class VisualIntel:
     """
     Pillar 2: Visual Intelligence Module
     Extracts invisible metadata (EXIF) from raw photos to find location and device info.
     """
-    def __init__(self, image_path):
+    def __init__(self, image_path, use_cache=True):
         self.image_path = image_path
+        self.use_cache = use_cache
 
     def extract_metadata(self):
         """
         Extracts GPS, Device Model, and Timestamp info from the image file headers.
+        Results are cached by image content hash (see ImageResultCache).
         """
-        findings = []
-        
         # 1. Validation: Check if file exists
         if not os.path.exists(self.image_path):
             return [{"type": "Error", "data": f"Image file not found: {self.image_path}", "risk_level": "Info"}]
 
+        if self.use_cache:
+            cached = ImageResultCache.shared().get(self.image_path, "exif", VISUAL_INTEL_VERSION)
+            if cached is not None:
+                return cached
+
+        findings = self._parse_metadata()
+
+        # Only cache clean parses (a transient read error shouldn't stick)
+        if self.use_cache and not any(f["type"] == "Error" for f in findings):
+            ImageResultCache.shared().put(self.image_path, "exif", VISUAL_INTEL_VERSION, findings)
+        return findings
+
+    def _parse_metadata(self):
+        """Parses the EXIF tags into findings (uncached)."""
+        findings = []
+
         try:
-            with open(self.image_path, 'rb') as f:
-                tags = exifread.process_file(f)
+            tags = self._read_tags()
                 
-                # 2. GPS Coordinates (The "Holy Grail" of OSINT)
-                if 'GPS GPSLatitude' in tags and 'GPS GPSLongitude' in tags:
-                    lat = str(tags['GPS GPSLatitude'])
-                    lon = str(tags['GPS GPSLongitude'])
-                    
-                    # Basic conversion logic could be added here to make it decimal, 
-                    # but raw data is sufficient for proof of concept.
-                    findings.append({
-                        "type": "Geolocation",
-                        "data": f"Coordinates found: Lat {lat}, Lon {lon}",
-                        "risk_level": "CRITICAL"
-                    })
+            # 2. GPS Coordinates (The "Holy Grail" of OSINT), as decimal degrees
+            if 'GPS' in tags:
+                lat, lon = tags['GPS']
+                findings.append({
+                    "type": "Geolocation",
+                    "data": f"Coordinates found: Lat {lat:.6f}, Lon {lon:.6f}",
+                    "risk_level": "CRITICAL"
+                })
+            
+            # 3. Device Information (e.g., iPhone 13 Pro)
+            # Useful for tailoring phishing attacks (e.g., sending an iOS update link)
+            if 'Image Model' in tags:
+                findings.append({
+                    "type": "Device Intel",
+                    "data": f"Camera Model: {tags['Image Model']}",
+                    "risk_level": "Medium"
+                })
                 
-                # 3. Device Information (e.g., iPhone 13 Pro)
-                # Useful for tailoring phishing attacks (e.g., sending an iOS update link)
-                if 'Image Model' in tags:
-                    findings.append({
-                        "type": "Device Intel",
-                        "data": f"Camera Model: {str(tags['Image Model'])}",
-                        "risk_level": "Medium"
-                    })
-                    
-                # 4. Date & Time Original
-                # Helps establish a "Pattern of Life" (when was the user active?)
-                if 'Image DateTime' in tags:
-                    findings.append({
-                        "type": "Temporal Intel",
-                        "data": f"Photo taken on: {str(tags['Image DateTime'])}",
-                        "risk_level": "High"
-                    })
-
-                # 5. Software Used (e.g., Photoshop, Adobe Lightroom)
-                # Indicates if the image was edited/doctored
-                if 'Image Software' in tags:
-                     findings.append({
-                        "type": "Metadata Editing",
-                        "data": f"Software used: {str(tags['Image Software'])}",
-                        "risk_level": "Medium"
-                    })
+            # 4. Date & Time Original
+            # Helps establish a "Pattern of Life" (when was the user active?)
+            if 'Image DateTime' in tags:
+                findings.append({
+                    "type": "Temporal Intel",
+                    "data": f"Photo taken on: {tags['Image DateTime']}",
+                    "risk_level": "High"
+                })
+
+            # 5. Software Used (e.g., Photoshop, Adobe Lightroom)
+            # Indicates if the image was edited/doctored
+            if 'Image Software' in tags:
+                 findings.append({
+                    "type": "Metadata Editing",
+                    "data": f"Software used: {tags['Image Software']}",
+                    "risk_level": "Medium"
+                })
                     
         except Exception as e:
             findings.append({"type": "Error", "data": f"Metadata extraction failed: {str(e)}", "risk_level": "Low"})
@@ -72,4 +100,125 @@ class VisualIntel:
         if not findings:
              findings.append({"type": "Info", "data": "No EXIF metadata found (Clean Image).", "risk_level": "Low"})
 
-        return findings
\ No newline at end of file
+        return findings
+
+    def _read_tags(self):
+        """
+        Fast path: memory-maps the file and reads ONLY the EXIF block of JPEG/TIFF files,
+        parsing IFD0 + the GPS IFD and stopping as soon as the needed tags are in hand.
+        Other formats (HEIC, PNG, ...) or malformed headers fall back to exifread without
+        MakerNotes or thumbnails.
+        Returns {'Image Model', 'Image DateTime', 'Image Software', 'GPS': (lat, lon)} subset.
+        """
+        with open(self.image_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                try:
+                    if mm[:2] == b"\xff\xd8":
+                        block = self._find_jpeg_exif(mm)
+                        return self._parse_tiff(mm, *block) if block else {}
+                    if mm[:4] in (b"II*\x00", b"MM\x00*"):
+                        return self._parse_tiff(mm, 0, len(mm))
+                except (struct.error, ValueError, IndexError):
+                    pass # Malformed header - let exifread have a go
+
+                mm.seek(0)
+                return self._read_tags_exifread(mm)
+
+    def _find_jpeg_exif(self, mm):
+        """Walks JPEG marker segments up to Start-Of-Scan; returns the (start, end) of the EXIF TIFF block."""
+        pos = 2
+        size = len(mm)
+        while pos + 4 <= size:
+            if mm[pos] != 0xFF:
+                raise ValueError("Corrupt JPEG marker")
+            marker = mm[pos + 1]
+            if marker == 0xFF:  # Fill byte
+                pos += 1
+                continue
+            if marker in (0xD9, 0xDA):  # End of image / Start of scan: no EXIF in the header
+                return None
+            length = struct.unpack(">H", mm[pos + 2:pos + 4])[0]
+            if marker == 0xE1 and mm[pos + 4:pos + 10] == b"Exif\x00\x00":
+                return pos + 10, min(pos + 2 + length, size)
+            pos += 2 + length
+        return None
+
+    def _parse_tiff(self, buf, base, end):
+        """Minimal TIFF/EXIF reader: IFD0 (Model, Software, DateTime) and the GPS IFD only."""
+        order = buf[base:base + 2]
+        if order == b"II":
+            e = "<"
+        elif order == b"MM":
+            e = ">"
+        else:
+            raise ValueError("Not a TIFF header")
+        if struct.unpack(e + "H", buf[base + 2:base + 4])[0] != 42:
+            raise ValueError("Bad TIFF magic")
+
+        tags = {}
+        gps_offset = None
+        ifd0 = struct.unpack(e + "I", buf[base + 4:base + 8])[0]
+
+        for tag, typ, count, data_at in self._ifd_entries(buf, base, end, ifd0, e):
+            if tag in IFD0_TAGS and typ == 2:
+                tags[IFD0_TAGS[tag]] = self._ascii(buf, data_at, count)
+            elif tag == GPS_IFD_POINTER:
+                gps_offset = struct.unpack(e + "I", buf[data_at:data_at + 4])[0]
+            # Stop scanning IFD0 once everything we need has been seen
+            if gps_offset is not None and len(tags) == len(IFD0_TAGS):
+                break
+
+        if gps_offset:
+            gps = {}
+            for tag, typ, count, data_at in self._ifd_entries(buf, base, end, gps_offset, e):
+                if tag in (1, 3) and typ == 2:      # Latitude/LongitudeRef ('N'/'S', 'E'/'W')
+                    gps[tag] = self._ascii(buf, data_at, count)
+                elif tag in (2, 4) and typ == 5 and count == 3:    # Latitude/Longitude (3 RATIONALs)
+                    gps[tag] = [self._rational(buf, data_at + 8 * i, e) for i in range(3)]
+                if len(gps) == 4:
+                    break
+            if 2 in gps and 4 in gps:
+                tags['GPS'] = (to_decimal_degrees(gps[2], gps.get(1)), to_decimal_degrees(gps[4], gps.get(3)))
+
+        return tags
+
+    def _ifd_entries(self, buf, base, end, offset, e):
+        """Yields (tag, type, count, absolute data offset) for each 12-byte IFD entry."""
+        start = base + offset
+        if start + 2 > end:
+            return
+        count = struct.unpack(e + "H", buf[start:start + 2])[0]
+        for i in range(count):
+            entry = start + 2 + 12 * i
+            if entry + 12 > end:
+                return
+            tag, typ, n = struct.unpack(e + "HHI", buf[entry:entry + 8])
+            size = n * TIFF_TYPE_SIZES.get(typ, 1)
+            # Values of up to 4 bytes live inline; larger ones are at an offset from the TIFF header
+            data_at = entry + 8 if size <= 4 else base + struct.unpack(e + "I", buf[entry + 8:entry + 12])[0]
+            if data_at + size > end:
+                continue
+            yield tag, typ, n, data_at
+
+    def _ascii(self, buf, at, count):
+        return bytes(buf[at:at + count]).split(b"\x00", 1)[0].decode("utf-8", errors="replace").strip()
+
+    def _rational(self, buf, at, e):
+        num, den = struct.unpack(e + "II", buf[at:at + 8])
+        return num / den if den else 0.0
+
+    def _read_tags_exifread(self, fh):
+        """Fallback for formats the fast path doesn't handle (skips MakerNotes and thumbnails)."""
+        raw = exifread.process_file(fh, details=False, extract_thumbnail=False)
+        tags = {name: str(raw[name]) for name in IFD0_TAGS.values() if name in raw}
+
+        if 'GPS GPSLatitude' in raw and 'GPS GPSLongitude' in raw:
+            lat_ref = raw.get('GPS GPSLatitudeRef')
+            lon_ref = raw.get('GPS GPSLongitudeRef')
+            tags['GPS'] = (
+                to_decimal_degrees([float(v.num) / v.den if v.den else 0.0 for v in raw['GPS GPSLatitude'].values], str(lat_ref) if lat_ref else None),
+                to_decimal_degrees([float(v.num) / v.den if v.den else 0.0 for v in raw['GPS GPSLongitude'].values], str(lon_ref) if lon_ref else None),
+            )
+        return tags
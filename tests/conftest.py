@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+# Tests import the `modules` package from the repo root, and never touch the user's cache
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SHADOWSCAN_CACHE_DIR"] = tempfile.mkdtemp(prefix="shadowscan-tests-")
+
+class StandIn:
+    """Local HTTP stand-in for the GitHub API: serves `routes` (path -> body bytes or callable(query)) and logs paths."""
+    def __init__(self):
+        self.routes = {}
+        self.calls = []
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                standin.calls.append(self.path)
+                body = standin.routes.get(path)
+                if callable(body):
+                    body = body(query)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+@pytest.fixture
+def standin():
+    server = StandIn()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+@pytest.fixture
+def screenshot(tmp_path):
+    """Factory for dark-editor screenshots: title bar, sidebar, and `lines` of small text."""
+    def make(name, lines, size=(1920, 1080), font_size=14):
+        img = Image.new("RGB", size, (30, 30, 30))
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((0, 0, size[0], 40), fill=(50, 50, 60))
+        draw.rectangle((0, 40, 260, size[1]), fill=(40, 40, 45))
+        font = ImageFont.load_default(size=font_size)
+        for i, line in enumerate(lines):
+            draw.text((300, 80 + i * font_size * 1.6), line, fill=(220, 220, 220), font=font)
+        path = str(tmp_path / name)
+        img.save(path)
+        return path
+    return make
@@ -0,0 +1,24 @@
+from modules.batch_scanner import BatchScanner
+from modules.code_miner import CodeMiner
+from modules.repo_scanner import RepoScanner
+
+
+def _adapter_maxsize(batch):
+    return batch.client.session.get_adapter("https://api.github.com")._pool_maxsize
+
+
+def test_pool_covers_every_fetch_thread():
+    batch = BatchScanner(usernames=["alice"], repos=["owner/repo"], workers=4)
+    expected = 4 * max(RepoScanner.FETCH_WORKERS, CodeMiner.PAGE_WORKERS)
+    assert batch.pool_size() == expected
+    assert _adapter_maxsize(batch) == expected
+
+
+def test_pool_follows_configured_fetch_workers():
+    batch = BatchScanner(repos=["owner/repo"], workers=3, repo_options={"fetch_workers": 2})
+    assert batch.pool_size() == 3 * 2
+
+
+def test_user_only_sweep_sizes_for_page_threads():
+    batch = BatchScanner(usernames=["alice", "bob"], workers=2)
+    assert batch.pool_size() == 2 * CodeMiner.PAGE_WORKERS
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+from thefuzz import fuzz
+
+from modules.fuzzy_index import FuzzyKeywordIndex
+
+KEYWORDS = ["password", "passport", "confidential", "secret", "ssn", "salary", "credit card", "api key",
+            "private", "internal only", "token", "db", "x"]
+
+def mutate(rng, word):
+    """One to three random edits (insert / delete / replace / swap)."""
+    letters = "abcdeilnoprstwy "
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randint(0, len(word))
+        op = rng.choice("idrs")
+        if op == "i":
+            word = word[:pos] + rng.choice(letters) + word[pos:]
+        elif op == "d" and pos < len(word):
+            word = word[:pos] + word[pos + 1:]
+        elif op == "r" and pos < len(word):
+            word = word[:pos] + rng.choice(letters) + word[pos + 1:]
+        elif op == "s" and pos + 1 < len(word):
+            word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    return word
+
+def pairwise(word, low, high):
+    return [keyword for keyword in KEYWORDS if low < fuzz.ratio(word, keyword) < high]
+
+@pytest.mark.parametrize("low,high", [(85, 100), (70, 100), (60, 95)])
+def test_matches_equal_the_pairwise_loop(low, high):
+    rng = random.Random(low * 1000 + high)
+    index = FuzzyKeywordIndex(KEYWORDS, low=low, high=high)
+    words = [mutate(rng, rng.choice(KEYWORDS)) for _ in range(2000)] + KEYWORDS + ["", "a", "zzzzzzzz"]
+    for word in words:
+        assert index.matches(word) == pairwise(word, low, high), word
+
+def test_memoized_result_is_stable():
+    index = FuzzyKeywordIndex(KEYWORDS, memo_size=2)
+    first = index.matches("pasword")
+    for word in ("a", "b", "c", "pasword"):
+        index.matches(word)
+    assert index.matches("pasword") == first == ["password"]
@@ -0,0 +1,89 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from modules.repo_scanner import RepoScanner
+
+SECRET = "key = 'AKIA1234567890ABCDEF'\n"
+
+ROOT_RULES = """# comment
+*.tmp.py
+build/
+/rootonly.py
+!keep.tmp.py
+docs/**/gen.py
+a?c.py
+[bc]x.py
+**/cache
+logs/*
+!logs/keep.py
+\\#hash.py
+"""
+SUB_RULES = """!*.tmp.py
+deep/
+*.txt
+"""
+FILES = ["keep.tmp.py", "x.tmp.py", "build/a.py", "src/build/b.py", "build.py", "rootonly.py", "src/rootonly.py",
+         "docs/gen.py", "docs/x/y/gen.py", "abc.py", "abbc.py", "bx.py", "ax.py", "cache/c.py", "src/cache/d.py",
+         "logs/a.py", "logs/keep.py", "#hash.py", "sub/y.tmp.py", "sub/deep/z.py", "sub/deep.py", "sub/n.txt", "n.txt",
+         "local.py", "sub/local.py", "plain.py", "sub/plain.py"]
+
+def write(root, path, text):
+    full = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "w", encoding="utf-8") as f:
+        f.write(text)
+
+@pytest.fixture
+def checkout(tmp_path):
+    root = str(tmp_path / "checkout")
+    for path in FILES:
+        write(root, path, SECRET)
+    write(root, ".gitignore", ROOT_RULES)
+    write(root, "sub/.gitignore", SUB_RULES)
+    write(root, ".git/info/exclude", "/local.py\n")
+    return root
+
+def secret_paths(findings):
+    return sorted(f.location.rsplit(":", 1)[0] for f in findings if not isinstance(f, dict) and f.type == "Hardcoded Secret")
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_local_scan_visits_exactly_what_git_does_not_ignore(checkout):
+    subprocess.run(["git", "init", "-q", checkout], check=True)
+    listed = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=checkout,
+                            check=True, capture_output=True, text=True).stdout.split("\n")
+    expected = sorted(path for path in listed if path in FILES and (path.endswith(".py") or path.endswith(".txt")))
+
+    findings = RepoScanner(checkout, incremental=False).scan_local()
+    assert secret_paths(findings) == expected
+
+def test_ignore_rules_without_git(checkout):
+    findings = RepoScanner(checkout, incremental=False).scan_local()
+    found = set(secret_paths(findings))
+    assert {"keep.tmp.py", "build.py", "src/rootonly.py", "abbc.py", "ax.py",
+            "logs/keep.py", "sub/y.tmp.py", "sub/deep.py", "sub/local.py", "plain.py"} <= found
+    assert not found & {"x.tmp.py", "build/a.py", "src/build/b.py", "rootonly.py", "docs/gen.py", "docs/x/y/gen.py", "abc.py",
+                        "bx.py", "cache/c.py", "src/cache/d.py", "logs/a.py", "#hash.py", "sub/deep/z.py",
+                        "sub/n.txt", "local.py"}
+
+def test_local_scan_across_worker_processes(tmp_path):
+    root = str(tmp_path / "many")
+    paths = [f"pkg{i // 20}/mod{i}.py" for i in range(150)]
+    for path in paths:
+        write(root, path, "x = 1\n" * 50 + SECRET)
+    scanner = RepoScanner(root, incremental=False, local_workers=2)
+    scanner.local_pool_bytes, scanner.local_batch_bytes = 0, 8 * 1024  # force the pool on a small tree
+    findings = scanner.scan_local()
+    assert secret_paths(findings) == sorted(paths)
+    assert {f.location.rsplit(":", 1)[1] for f in findings} == {"51"}
+
+def test_small_checkout_is_scanned_inline(tmp_path, capsys):
+    root = str(tmp_path / "small")
+    paths = [f"pkg{i // 20}/mod{i}.py" for i in range(300)]
+    for path in paths:
+        write(root, path, "x = 1\n" * 50 + SECRET)
+    findings = RepoScanner(root, incremental=False, local_workers=8).scan_local()
+    assert secret_paths(findings) == sorted(paths)
+    assert "inline)" in capsys.readouterr().out
@@ -0,0 +1,22 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_ndjson(tmp_path, *args):
+    env = dict(os.environ, SHADOWSCAN_ACCEPT_TERMS="1", SHADOWSCAN_CACHE_DIR=str(tmp_path))
+    return subprocess.run([sys.executable, "main.py", "--ndjson", *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=300)
+
+
+def test_social_pillar_keeps_stdout_pure_ndjson(tmp_path):
+    # The social pillar runs in a spawned worker that shares fd 1 with the parent;
+    # its "[*] Initializing ..." banner must land on stderr, not in the event stream
+    result = run_ndjson(tmp_path, "-c", "I hate my boss, the prod db password is hunter2")
+    lines = [line for line in result.stdout.splitlines() if line.strip()]
+    events = [json.loads(line) for line in lines]
+    assert events and events[-1]["event"] == "summary"
+    assert "Initializing Social Intelligence Engine" in result.stderr
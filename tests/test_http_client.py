@@ -0,0 +1,58 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from modules.http_cache import HttpCache
+from modules.http_client import HttpClient
+from modules.rate_limiter import RateLimitScheduler
+
+class FakeSession:
+    """Stands in for requests.Session: serves one ETagged resource and records request headers."""
+    def __init__(self):
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = dict(headers or {})
+        self.sent.append(headers)
+        response = requests.Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict({"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "9999999999"})
+        if headers.get("If-None-Match") == '"v1"':
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = '"v1"'
+            response._content = f"view of {headers.get('Authorization')}".encode()
+        return response
+
+def make_client(tmp_path, tokens):
+    client = HttpClient(cache=HttpCache(cache_dir=str(tmp_path)), scheduler=RateLimitScheduler(tokens))
+    client.session = FakeSession()
+    return client
+
+def test_cache_entries_are_keyed_on_the_credential_actually_sent(tmp_path):
+    client = make_client(tmp_path, ["a", "b"])
+    url = "https://api.github.com/repos/o/r"
+    token_a, token_b = client.scheduler.pool
+
+    assert client.get(url, cached=True).text == "view of token a"
+
+    # Force rotation to the other credential: it must not revalidate (or see) a's cached view
+    token_a.remaining, token_a.reset_at = 5, 9999999999
+    token_b.remaining, token_b.reset_at = 4000, 9999999999
+    response = client.get(url, cached=True)
+    assert client.session.sent[-1]["Authorization"] == "token b"
+    assert "If-None-Match" not in client.session.sent[-1]
+    assert response.text == "view of token b"
+
+    # The same credential again revalidates its own entry and is served from disk
+    response = client.get(url, cached=True)
+    assert client.session.sent[-1]["If-None-Match"] == '"v1"'
+    assert response.from_cache and response.text == "view of token b"
+
+def test_unscheduled_hosts_still_revalidate(tmp_path):
+    client = make_client(tmp_path, [])
+    url = "https://example.com/feed"
+    client.get(url, cached=True)
+    response = client.get(url, cached=True)
+    assert client.session.sent[-1]["If-None-Match"] == '"v1"'
+    assert response.status_code == 200 and response.from_cache
@@ -0,0 +1,59 @@
+import pytest
+from PIL import Image
+
+from modules.image_dedup import BKTree, PerceptualIndex, dhash, fingerprint, hamming, same_picture
+from modules.social_analyzer import SocialPostAnalyzer
+
+SECRETS = ["DB_PASS=hunter2", "AWS_KEY=AKIA1234567890ABCDEF", "DB_HOST=prod-db.internal",
+           "SECRET_TOKEN=abcdef123456", "PORT=5432", "DEBUG=false"]
+MANIFEST = ["name: frontend", "version: 1.4.2", "private: true", "scripts:", "  build: vite build", "  test: vitest"]
+
+@pytest.fixture
+def shots(tmp_path, screenshot):
+    secrets = screenshot("secrets.png", SECRETS)
+    manifest = screenshot("manifest.png", MANIFEST)
+    edited = screenshot("edited.png", SECRETS[:3] + ["DB_USER=admin"] + SECRETS[4:])
+    recompressed = str(tmp_path / "secrets.jpg")
+    Image.open(secrets).save(recompressed, quality=60)
+    resized = str(tmp_path / "secrets_small.jpg")
+    Image.open(secrets).resize((1280, 720), Image.BICUBIC).save(resized, quality=80)
+    return {"secrets": secrets, "manifest": manifest, "edited": edited, "recompressed": recompressed, "resized": resized}
+
+def test_same_layout_screenshots_are_near_in_dhash_but_not_the_same_picture(shots):
+    secrets, manifest = fingerprint(shots["secrets"]), fingerprint(shots["manifest"])
+    assert hamming(secrets[0], manifest[0]) <= 12  # the dHash alone would merge them
+    assert not same_picture(secrets[1], manifest[1])
+    assert not same_picture(secrets[1], fingerprint(shots["edited"])[1])
+    assert same_picture(secrets[1], fingerprint(shots["recompressed"])[1])
+    assert same_picture(secrets[1], fingerprint(shots["resized"])[1])
+    assert dhash(shots["secrets"]) == secrets[0]
+
+def test_clustering_reuses_ocr_only_for_true_duplicates(shots):
+    analyzer = SocialPostAnalyzer(use_cache=False)
+    paths = [shots[name] for name in ("secrets", "manifest", "recompressed", "edited", "resized")]
+    outputs = [("none", None)] * len(paths)
+    representatives, members, _ = analyzer._cluster_duplicates(paths, list(range(len(paths))), outputs)
+    assert representatives == [0, 1, 3]
+    assert members == {0: [2, 4]}
+
+def test_cross_run_index_confirms_block_signature(shots, tmp_path):
+    index = PerceptualIndex(cache_dir=str(tmp_path))
+    bits, signature = fingerprint(shots["secrets"])
+    index.add(bits, "digest-secrets", signature)
+
+    manifest = fingerprint(shots["manifest"])
+    assert index.nearest(manifest[0], 12, manifest[1]) is None
+    copy = fingerprint(shots["recompressed"])
+    assert index.nearest(copy[0], 12, copy[1]) == "digest-secrets"
+
+    # Entries survive a reload from disk, signature included
+    reloaded = PerceptualIndex(cache_dir=str(tmp_path))
+    assert reloaded.nearest(copy[0], 12, copy[1]) == "digest-secrets"
+    assert reloaded.nearest(manifest[0], 12, manifest[1]) is None
+
+def test_bktree_within_returns_every_match_closest_first():
+    tree = BKTree()
+    for value, bits in enumerate([0b0000, 0b0001, 0b0011, 0b0111, 0b1111]):
+        tree.add(bits, value)
+    assert tree.within(0b0000, 2) == [(0, 0), (1, 1), (2, 2)]
+    assert tree.nearest(0b0110, 1) in {(1, 2), (1, 3)}
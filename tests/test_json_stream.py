@@ -0,0 +1,72 @@
+import json
+import random
+
+import pytest
+
+from modules.json_stream import iter_array_items
+
+DOC = {
+    "sha": "abc123",
+    "url": "https://example.invalid/tree",
+    "tree": [
+        {"path": "src/ünïcødé.py", "type": "blob", "sha": "1" * 40, "size": 12},
+        {"path": "dir \"quoted\" \\ name", "type": "tree", "sha": "2" * 40},
+        {"path": "nested", "extra": [1, 2.5, None, True, {"a": []}]},
+        "plain string, with ] and } inside",
+        42,
+    ],
+    "truncated": False,
+}
+
+def chunked(data, rng):
+    """Splits bytes at random points (also inside multi-byte UTF-8 sequences)."""
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(0, 7)
+        yield data[pos:pos + size]
+        pos += size
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("indent", [None, 2])
+def test_items_and_meta_survive_any_chunking(seed, indent):
+    data = json.dumps(DOC, indent=indent, ensure_ascii=False).encode()
+    meta = {}
+    items = list(iter_array_items(chunked(data, random.Random(seed)), "tree", meta))
+    assert items == DOC["tree"]
+    assert meta == {"sha": "abc123", "url": DOC["url"], "truncated": False}
+
+def test_members_after_the_array_are_read():
+    meta = {}
+    assert list(iter_array_items([b'{"tree": [], "truncated": true}'], "tree", meta)) == []
+    assert meta == {"truncated": True}
+
+def test_missing_key_and_empty_object():
+    assert list(iter_array_items([b'{"other": [1, 2]}'], "tree")) == []
+    assert list(iter_array_items([b"{}"], "tree")) == []
+
+def test_items_arrive_before_the_stream_ends():
+    def chunks():
+        yield b'{"tree": [{"n": 1}, '
+        raise OSError("connection reset")
+    items = iter_array_items(chunks(), "tree")
+    assert next(items) == {"n": 1}
+    with pytest.raises(OSError):
+        next(items)
+
+@pytest.mark.parametrize("chunks, items, meta", [
+    ([b'{"tree": [0.', b'5]}'], [0.5], {}),
+    ([b'{"tree": [1', b'2, -', b'3e', b'+2, 4E', b'-1]}'], [12, -300.0, 0.4], {}),
+    ([b'{"tree": [], "x": 1.', b'5}'], [], {"x": 1.5}),
+    ([b'{"tree": [7]', b', "size": 10', b'}'], [7], {"size": 10}),
+    ([b'{"tree": [1.25e', b'', b'3, true]}'], [1250.0, True], {}),
+])
+def test_numbers_split_at_a_chunk_edge(chunks, items, meta):
+    found = {}
+    assert list(iter_array_items(chunks, "tree", found)) == items
+    assert found == meta
+
+@pytest.mark.parametrize("data", [b'{"tree": [{"n": 1}, {"n"', b'{"tree": [1, 2', b'["tree"]', b'{"tree": [1 2]}',
+                                  b'{"tree": [1; 2]}', b'{"tree": [0.]}', b'{"tree": [] "x": 1}', b'{"tree": [1]; "x": 1}'])
+def test_truncated_or_malformed_json_raises(data):
+    with pytest.raises(ValueError):
+        list(iter_array_items([data], "tree"))
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from modules.keyword_matcher import KeywordMatcher
+
+KEYWORDS = ["password", "pass", "ass", "prod db", "db", "class of", "a", "ssw", "word"]
+
+def random_text(seed, length=2000):
+    rng = random.Random(seed)
+    pieces = KEYWORDS + ["PASSWORD", "Prod DB", "Ä", "ß", " ", "x", "\n"]
+    return "".join(rng.choice(pieces) for _ in range(length // 4))
+
+def substring_hits(text):
+    lowered = text.lower()
+    hits = set()
+    for keyword in KEYWORDS:
+        start = lowered.find(keyword)
+        while start != -1:
+            hits.add((keyword, start, start + len(keyword)))
+            start = lowered.find(keyword, start + 1)
+    return hits
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_all_matches_substring_search(seed):
+    # Lowercasing keeps every character of this alphabet at length 1, so offsets line up
+    text = random_text(seed)
+    matcher = KeywordMatcher((keyword, "k") for keyword in KEYWORDS)
+    assert {(hit.keyword, hit.start, hit.end) for hit in matcher.find_all(text)} == substring_hits(text)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_keywords_keeps_keyword_list_order(seed):
+    text = random_text(seed, length=40)
+    matcher = KeywordMatcher((keyword, "k") for keyword in KEYWORDS)
+    expected = [keyword for keyword in KEYWORDS if keyword in text.lower()]
+    assert [hit.keyword for hit in matcher.find_keywords(text)] == expected
+
+def test_offsets_index_the_original_text():
+    # "İ".lower() is two characters, so offsets into text.lower() would be one too far
+    matcher = KeywordMatcher([("password", "sensitive")])
+    text = "İpassword and İİ PASSWORD"
+    hits = matcher.find_all(text)
+    assert [(hit.start, hit.end) for hit in hits] == [(1, 9), (17, 25)]
+    assert all(text[hit.start:hit.end].lower() == "password" for hit in hits)
+
+def test_categories_filter():
+    matcher = KeywordMatcher([("db", "infra"), ("pass", "sensitive")])
+    assert [hit.keyword for hit in matcher.find_all("pass the db", categories={"infra"})] == ["db"]
+    assert matcher.contains_any("PASSWORD", categories={"sensitive"})
+    assert not matcher.contains_any("password", categories={"infra"})
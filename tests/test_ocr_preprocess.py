@@ -0,0 +1,58 @@
+import pytest
+from PIL import Image, ImageFilter
+
+from modules.ocr_preprocess import OCRPreprocessor
+from modules.social_analyzer import SocialPostAnalyzer
+
+ENV_LINES = ["DB_PASS=hunter2", "AWS_KEY=AKIA1234567890ABCDEF", "DB_HOST=prod-db.internal",
+             "SECRET_TOKEN=abcdef123456", "PORT=5432", "DEBUG=false", "REDIS_URL=redis://cache:6379", "LOG_LEVEL=info"]
+
+@pytest.mark.parametrize("lines,size,font_size", [
+    (6, (1920, 1080), 14),   # a few lines of editor text on a full-HD screenshot
+    (8, (1200, 900), 14),
+    (3, (2560, 1440), 11),   # small font on a high-resolution display
+    (1, (1920, 1080), 14),   # a single line
+    (4, (1170, 2532), 28),   # phone screenshot (tiled)
+])
+def test_gate_keeps_small_font_screenshots(screenshot, lines, size, font_size):
+    path = screenshot("shot.png", ENV_LINES[:lines], size, font_size)
+    preprocessor = OCRPreprocessor()
+    assert preprocessor.prepare(path)
+    assert preprocessor.counts["gated"] == 0
+
+def test_gate_drops_images_without_text(screenshot, tmp_path):
+    blank = str(tmp_path / "blank.png")
+    Image.new("RGB", (1920, 1080), (200, 200, 200)).save(blank)
+    gradient = str(tmp_path / "gradient.png")
+    Image.linear_gradient("L").resize((1600, 1200)).save(gradient)
+    blurred = str(tmp_path / "blurred.png")
+    Image.open(screenshot("shot.png", ENV_LINES)).filter(ImageFilter.GaussianBlur(6)).save(blurred)
+    layout = screenshot("layout.png", [])
+
+    preprocessor = OCRPreprocessor()
+    for path in (blank, gradient, blurred, layout):
+        assert preprocessor.prepare(path) == []
+    assert preprocessor.counts["gated"] == 4
+
+class FakeReader:
+    """Stands in for easyocr.Reader: every tile reads as the same text."""
+    def __init__(self):
+        self.calls = 0
+
+    def readtext(self, image, detail=0):
+        self.calls += 1
+        return ["DB_PASS=hunter2"]
+
+    def readtext_batched(self, images, detail=0, batch_size=1):
+        return [self.readtext(image) for image in images]
+
+def test_gated_verdicts_are_not_cached(screenshot, tmp_path):
+    blank = str(tmp_path / "blank.png")
+    Image.new("RGB", (800, 600), (255, 255, 255)).save(blank)
+    text = screenshot("shot.png", ENV_LINES[:2])
+
+    analyzer = SocialPostAnalyzer(use_cache=True)
+    analyzer._reader = FakeReader()
+    assert analyzer._ocr_many([blank, text]) == [("ok", []), ("ok", ["DB_PASS=hunter2"])]
+    assert analyzer._cache_get(blank) is None
+    assert analyzer._cache_get(text) == ["DB_PASS=hunter2"]
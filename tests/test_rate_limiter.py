@@ -0,0 +1,67 @@
+import pytest
+
+from modules import rate_limiter
+from modules.rate_limiter import RateLimitScheduler
+
+class Clock:
+    """Virtual time: sleep() advances the clock instead of blocking."""
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.slept = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+class Response:
+    def __init__(self, remaining, reset, status_code=200):
+        self.status_code = status_code
+        self.headers = {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)}
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "time", clock.time)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+def run_calls(scheduler, clock, calls, quota, window=3600.0, per_call=0.01):
+    reset = clock.now + window
+    remaining = quota
+    for _ in range(calls):
+        state = scheduler.acquire()
+        clock.now += per_call
+        remaining -= 1
+        scheduler.update(state, Response(remaining, reset))
+
+def test_healthy_quota_is_not_throttled(clock):
+    scheduler = RateLimitScheduler(["t1"])
+    run_calls(scheduler, clock, 300, quota=5000)
+    assert clock.slept == 0
+
+def test_low_quota_is_spread_over_the_window(clock):
+    scheduler = RateLimitScheduler(["t1"], pace_below=100)
+    run_calls(scheduler, clock, 60, quota=80, window=600.0)
+    # 80 requests left for 600 s: pacing kicks in, but the window is not exceeded
+    assert 0 < clock.slept < 600
+
+def test_exhausted_credential_queues_until_reset(clock):
+    scheduler = RateLimitScheduler(["t1"])
+    reset = clock.now + 120
+    state = scheduler.acquire()
+    scheduler.update(state, Response(0, reset))
+    scheduler.acquire()
+    assert clock.now >= reset
+
+def test_work_rotates_to_the_credential_with_most_quota(clock):
+    scheduler = RateLimitScheduler(["a", "b"])
+    reset = clock.now + 3600
+    first = scheduler.acquire()
+    scheduler.update(first, Response(10, reset))
+    second = scheduler.acquire()  # Unknown quota is probed first
+    assert second is not first
+    scheduler.update(second, Response(4000, reset))
+    assert scheduler.acquire() is second
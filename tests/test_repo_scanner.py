@@ -0,0 +1,239 @@
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from modules.blob_index import BlobIndex
+from modules.repo_state import RepoScanState
+from modules.repo_scanner import RepoScanner
+
+SECRET = b"AKIA1234567890ABCDEF\n"
+
+def git_sha(data):
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+class FakeRawClient:
+    """Serves raw file bodies by path and counts the fetches."""
+    def __init__(self, files):
+        self.files = files
+        self.fetches = 0
+
+    def get(self, url, **kwargs):
+        self.fetches += 1
+        return FakeResponse(self.files[url.rsplit("/", 1)[-1]])
+
+def make_scanner(tmp_path, files, max_file_bytes):
+    scanner = RepoScanner("owner/repo", client=FakeRawClient(files), incremental=False, max_file_bytes=max_file_bytes)
+    scanner.blob_index = BlobIndex(scanner.detector.version, cache_dir=str(tmp_path))
+    scanner._on_finding = None
+    return scanner
+
+BIG_FILES = {"big.py": b"x = 1\n" * 200 + SECRET, "small.py": SECRET}
+BIG_SHAS = {path: git_sha(data) for path, data in BIG_FILES.items()}
+BIG_SIZES = {path: len(data) for path, data in BIG_FILES.items()}
+
+def test_truncated_blob_is_indexed_with_its_cap(tmp_path):
+    capped = make_scanner(tmp_path, BIG_FILES, max_file_bytes=256)
+    findings, results, caps, unverified = capped._fetch_prioritized(list(BIG_FILES), "c0ffee", blob_shas=BIG_SHAS,
+                                                                    blob_sizes=BIG_SIZES, pinned=True)
+    assert caps == {"big.py": 256, "small.py": None} and not unverified
+    assert results["big.py"] == [] and len(results["small.py"]) == 1
+    assert capped.blob_index.get(BIG_SHAS["big.py"]) == ([], 256)
+
+    # Same cap: the truncated verdict is reused, nothing is fetched
+    again = make_scanner(tmp_path, BIG_FILES, max_file_bytes=256)
+    findings, results, caps, unverified = again._fetch_prioritized(list(BIG_FILES), "c0ffee", blob_shas=BIG_SHAS,
+                                                                   blob_sizes=BIG_SIZES, pinned=True)
+    assert again.client.fetches == 0 and caps["big.py"] == 256
+
+    # A larger cap refetches the truncated file and finds the secret
+    uncapped = make_scanner(tmp_path, BIG_FILES, max_file_bytes=0)
+    findings, results, caps, unverified = uncapped._fetch_prioritized(list(BIG_FILES), "c0ffee", blob_shas=BIG_SHAS,
+                                                                      blob_sizes=BIG_SIZES, pinned=True)
+    assert uncapped.client.fetches == 1 and caps["big.py"] is None
+    assert [f.signature for f in results["big.py"]] == ["AWS Access Key"]
+
+def test_truncated_blob_fetched_by_branch_is_not_indexed(tmp_path):
+    # A cut-off read can't be hashed, so only a fetch pinned to the listed commit vouches for it
+    capped = make_scanner(tmp_path, BIG_FILES, max_file_bytes=256)
+    findings, results, caps, unverified = capped._fetch_prioritized(list(BIG_FILES), "main", blob_shas=BIG_SHAS, blob_sizes=BIG_SIZES)
+    assert unverified == {"big.py"}
+    assert capped.blob_index.get(BIG_SHAS["big.py"]) is None
+    assert capped.blob_index.get(BIG_SHAS["small.py"]) is not None
+
+def test_file_exactly_at_the_cap_counts_as_whole(tmp_path):
+    scanner = make_scanner(tmp_path, {}, max_file_bytes=len(SECRET))
+    hits, cap, verified = scanner._scan_stream(iter([SECRET]), git_sha(SECRET), len(SECRET))
+    assert cap is None and verified and len(hits) == 1
+    hits, cap, verified = scanner._scan_stream(iter([SECRET, b"more"]))
+    assert cap == len(SECRET) and verified is None
+
+def test_binary_sniff_is_recorded_as_a_verdict(tmp_path):
+    scanner = make_scanner(tmp_path, {}, max_file_bytes=0)
+    assert scanner._scan_stream(iter([b"\x00\x01" + SECRET])) == ([], "binary", None)
+
+def test_content_that_does_not_hash_to_its_blob_is_not_indexed(tmp_path):
+    # The branch moved (or a CDN served a stale copy): the bytes belong to another blob
+    listed, served = b"token = None\n", SECRET
+    scanner = make_scanner(tmp_path, {"app.py": served}, max_file_bytes=0)
+    findings, results, caps, unverified = scanner._fetch_prioritized(["app.py"], "main", blob_shas={"app.py": git_sha(listed)},
+                                                                     blob_sizes={"app.py": len(listed)})
+    assert [f.signature for f in results["app.py"]] == ["AWS Access Key"]  # still reported for this scan
+    assert unverified == {"app.py"}
+    assert scanner.blob_index.get(git_sha(listed)) is None
+
+@pytest.mark.parametrize("pinned", [True, False])
+def test_unsized_blobs_are_only_indexed_when_fetched_at_the_listed_commit(tmp_path, pinned):
+    scanner = make_scanner(tmp_path, {"app.py": SECRET}, max_file_bytes=0)
+    findings, results, caps, unverified = scanner._fetch_prioritized(["app.py"], "c0ffee", blob_shas={"app.py": "sha-app"}, pinned=pinned)
+    assert (scanner.blob_index.get("sha-app") is not None) == pinned
+    assert unverified == (set() if pinned else {"app.py"})
+
+def make_tarball(files):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(f"owner-repo-abc123/{name}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+def standin_scanner(standin, **options):
+    scanner = RepoScanner("https://github.com/owner/repo", incremental=False, **options)
+    scanner.api_base = standin.base
+    scanner.raw_base = standin.base + "/raw"
+    return scanner
+
+def test_archive_scan_streams_every_member_in_one_request(standin):
+    standin.routes["/repos/owner/repo/tarball"] = make_tarball({
+        ".env": b'PASSWORD="supersecret1"\n',
+        "src/app.py": b"key = 'AKIA1234567890ABCDEF'\n",
+        "img.png": b"\x89PNG" + SECRET,
+        "backup/notes.txt": b"nothing here\n",
+    })
+    findings = standin_scanner(standin).scan_archive()
+
+    assert standin.calls == ["/repos/owner/repo/tarball"]
+    assert {(f.type, f.location) for f in findings} == {
+        ("Vulnerable File", ".env"),
+        ("Hardcoded Secret", ".env:1"),
+        ("Hardcoded Secret", "src/app.py:1"),
+        ("Exposed Directory", "backup/notes.txt"),
+    }
+
+def test_archive_scan_uses_the_requested_ref(standin):
+    standin.routes["/repos/owner/repo/tarball/v1.2"] = make_tarball({"a.py": SECRET})
+    findings = standin_scanner(standin).scan_archive(ref="v1.2")
+    assert [f.signature for f in findings] == ["AWS Access Key"]
+
+def test_archive_scan_reports_a_missing_repo(standin):
+    findings = standin_scanner(standin).scan_archive()
+    assert [f["type"] for f in findings] == ["Access Denied"]
+
+TREE_FILES = {f"pkg{d}/sub{e}/mod{i}.py": f"print({d}, {e}, {i})\n".encode() for d in range(4) for e in range(3) for i in range(3)}
+TREE_FILES.update({".env": b'PASSWORD="supersecret1"\n', "pkg2/sub1/settings.py": b'secret = "hunter2hunter2"\n'})
+
+HEAD = "c0ffee" * 6 + "c0ff"
+
+def serve_tree(standin, files, truncate_at=None):
+    """Serves repo metadata, git trees (recursive listing cut at `truncate_at` entries) and raw files."""
+    trees = {}
+
+    def register(prefix):
+        names = {}
+        for path in files:
+            if path.startswith(prefix):
+                head, _, rest = path[len(prefix):].partition("/")
+                names[head] = "tree" if rest else "blob"
+        entries = []
+        for name, kind in sorted(names.items()):
+            if kind == "tree":
+                entries.append({"path": name, "type": kind, "sha": register(prefix + name + "/")})
+            else:
+                data = files[prefix + name]
+                entries.append({"path": name, "type": kind, "sha": git_sha(data), "size": len(data)})
+        key = "tree-" + hashlib.sha1(prefix.encode()).hexdigest()
+        trees[key] = entries
+        return key
+
+    def flatten(key, prefix=""):
+        for entry in trees[key]:
+            yield {**entry, "path": prefix + entry["path"]}
+            if entry["type"] == "tree":
+                yield from flatten(entry["sha"], prefix + entry["path"] + "/")
+
+    def listing(key):
+        def body(query):
+            if "recursive" not in query:
+                return json.dumps({"sha": key, "tree": trees[key], "truncated": False}).encode()
+            entries = list(flatten(key))
+            truncated = truncate_at is not None and len(entries) > truncate_at
+            return json.dumps({"sha": key, "tree": entries[:truncate_at] if truncated else entries, "truncated": truncated}).encode()
+        return body
+
+    root = register("")
+    standin.routes["/repos/owner/repo"] = json.dumps({"default_branch": "trunk"}).encode()
+    standin.routes["/repos/owner/repo/branches/trunk"] = json.dumps({"commit": {"sha": HEAD, "commit": {"tree": {"sha": root}}}}).encode()
+    for key in trees:
+        standin.routes[f"/repos/owner/repo/git/trees/{key}"] = listing(key)
+    for path, data in files.items():
+        standin.routes[f"/raw/owner/repo/{HEAD}/{path}"] = data
+
+def content_view(findings):
+    return sorted(f.location for f in findings if f.type == "Hardcoded Secret")
+
+def test_truncated_tree_is_completed_by_walking_subtrees(standin):
+    serve_tree(standin, TREE_FILES)
+    full = standin_scanner(standin, max_fetches=0).scan_repo()
+    full_calls = [c for c in standin.calls if "/git/trees/" in c]
+
+    standin.calls.clear()
+    serve_tree(standin, TREE_FILES, truncate_at=10)
+    walked = standin_scanner(standin, max_fetches=0).scan_repo()
+    walk_calls = [c for c in standin.calls if "/git/trees/" in c]
+
+    assert len(full_calls) == 1
+    assert len(walk_calls) > 1  # the recursive listing, then one listing per directory
+    assert content_view(walked) == content_view(full) == [".env:1", "pkg2/sub1/settings.py:1"]
+    fetched = [c for c in standin.calls if c.startswith("/raw/")]
+    assert len(fetched) == len(set(fetched)) == len(TREE_FILES)  # no path scanned twice
+
+def test_malformed_tree_listing_is_reported(standin):
+    serve_tree(standin, TREE_FILES)
+    root_listing = [path for path in standin.routes if "/git/trees/" in path][-1]
+    standin.routes[root_listing] = b'{"sha": "x", "tree": [{"path": ".env", "type": "blob", "sha": "1"}, {"pa'
+    findings = standin_scanner(standin).scan_repo()
+    errors = [f["data"] for f in findings if isinstance(f, dict) and f["type"] == "Error"]
+    assert len(errors) == 1 and errors[0].startswith("File tree listing interrupted")
+    assert ".env:1" in content_view(f for f in findings if not isinstance(f, dict))
+
+def test_oversized_and_binary_files_still_complete_the_tree(standin, tmp_path):
+    files = {"package-lock.json": b'{"lockfileVersion": 3}\n' * 200, "logo.json": b"\x00PNG" + SECRET, ".env": SECRET}
+    serve_tree(standin, files)
+
+    def scan():
+        scanner = standin_scanner(standin, max_fetches=0, max_file_bytes=1024)
+        scanner.state = RepoScanState(cache_dir=str(tmp_path))
+        scanner.blob_index = BlobIndex(scanner.detector.version, cache_dir=str(tmp_path))
+        return scanner.scan_repo()
+
+    first = scan()
+    assert len([c for c in standin.calls if c.startswith("/raw/")]) == 3
+    standin.calls.clear()
+    second = scan()  # capped + binary verdicts count as covered: the unchanged tree short-circuits
+    assert not [c for c in standin.calls if c.startswith("/raw/") or "/git/trees/" in c]
+    assert content_view(second) == content_view(first) == [".env:1"]